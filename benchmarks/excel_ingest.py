@@ -0,0 +1,66 @@
+"""
+Excel 읽기 방식(pandas 기본 엔진 vs python-calamine 행 스트리밍 vs 변환 캐시) 속도 비교 벤치마크
+
+사용법:
+    python -m benchmarks.excel_ingest [Excel 파일 경로] [--repeat N]
+"""
+import argparse
+import io
+import logging
+import tempfile
+import time
+import pandas as pd
+from utils.data_loader import DataLoader
+
+logging.disable(logging.INFO)
+
+
+def _timed(func, repeat):
+    """함수를 repeat번 실행해 최소 소요 시간(초)과 마지막 결과 반환"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(file_path, repeat=1):
+    """
+    읽기 방식별 소요 시간 측정
+
+    Parameters:
+    file_path (str): 벤치마크할 Excel 파일 경로
+    repeat (int): 측정 반복 횟수 (최소값 사용)
+
+    Returns:
+    pandas.DataFrame: 방식별 측정 결과
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    cases = [('pandas_default', lambda: pd.read_excel(io.BytesIO(data)))]
+    if DataLoader.calamine_available():
+        cases.append(('calamine_rows', lambda: DataLoader._apply_excel_schema(DataLoader._read_excel_rows(data))))
+
+    rows = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, func in cases:
+            elapsed, df = _timed(func, repeat)
+            rows.append({'reader': name, 'rows': len(df), 'seconds': round(elapsed, 3)})
+
+        if DataLoader.arrow_available():
+            # 첫 호출에서 캐시를 만든 뒤 캐시 읽기 시간 측정
+            DataLoader.load_excel(data, cache_dir=cache_dir)
+            elapsed, df = _timed(lambda: DataLoader.load_excel(data, cache_dir=cache_dir), max(repeat, 3))
+            rows.append({'reader': 'columnar_cache', 'rows': len(df), 'seconds': round(elapsed, 3)})
+
+    return pd.DataFrame(rows).set_index('reader')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Excel 읽기 벤치마크")
+    parser.add_argument('file_path')
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    print(run(args.file_path, args.repeat).to_string())
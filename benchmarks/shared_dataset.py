@@ -0,0 +1,129 @@
+"""
+세션 수에 따른 메모리 사용량 부하 테스트 (세션별 복사본 vs 메모리 매핑 공유 데이터셋)
+
+공유 방식은 세션 수가 늘어도 익명 메모리가 필터 마스크 크기만큼만 증가해야 합니다.
+
+사용법:
+    python -m benchmarks.shared_dataset [CSV 파일 경로] [--sessions 1 5 20]
+"""
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.data_loader import DataLoader
+from utils.data_processor import AnimalDataProcessor
+from utils.shared_dataset import SharedDataset
+
+logging.disable(logging.INFO)
+
+
+def _memory_mb():
+    """
+    현재 프로세스의 RSS와 익명(anonymous) 메모리(MB) - Linux /proc 기준
+
+    메모리 매핑된 파일 페이지는 페이지 캐시로 프로세스 간에 공유되므로
+    세션별 비용은 파일에 기반하지 않은 익명 메모리로 비교합니다.
+    """
+    values = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in ('Rss', 'Anonymous'):
+                    values[name] = int(rest.split()[0]) / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, float('nan')
+    return values.get('Rss', float('nan')), values.get('Anonymous', float('nan'))
+
+
+def _session_workload(df, mask):
+    """세션 한 번의 화면 렌더링을 흉내 내는 집계 작업"""
+    view = df if mask is None else df[mask]
+    view['animal_type'].value_counts()
+    view.groupby('sido', observed=True).size()
+    return len(view)
+
+
+def _measure(args):
+    """
+    새 프로세스에서 n개 세션을 열고 세션이 보관하는 메모리와 렌더링 시간 측정
+
+    같은 프로세스에서 반복 측정하면 해제된 메모리가 재사용되어 증가량이 가려지므로
+    측정마다 별도 프로세스를 사용합니다.
+    """
+    mode, n_sessions, key, cache_dir = args
+    logging.disable(logging.INFO)
+    gc.collect()
+    rss_before, anon_before = _memory_mb()
+
+    if mode == 'copy':
+        # 기존 방식: 세션마다 전처리 결과 전체를 보관
+        from pyarrow import feather
+        path = SharedDataset._path(key, cache_dir)
+        sessions = [(feather.read_table(path, memory_map=False).to_pandas(), None) for _ in range(n_sessions)]
+    else:
+        # 공유 방식: 세션에는 데이터셋 키와 필터 마스크만 보관
+        sessions = [(SharedDataset.open(key, cache_dir), None) for _ in range(n_sessions)]
+    mask = np.random.default_rng(0).random(len(sessions[0][0])) < 0.9
+    sessions = [(df, mask.copy()) for df, _ in sessions]
+    gc.collect()
+    rss_after, anon_after = _memory_mb()
+
+    # 렌더링 중 임시 메모리는 제외하고 세션이 계속 보관하는 메모리만 비교
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(n_sessions, 8)) as executor:
+        list(executor.map(lambda state: _session_workload(*state), sessions))
+    elapsed = time.perf_counter() - start
+    return rss_after - rss_before, anon_after - anon_before, elapsed
+
+
+def run(file_path, session_counts=(1, 5, 20)):
+    """
+    세션 수별로 두 방식의 메모리 증가량과 렌더링 시간 비교
+
+    Parameters:
+    file_path (str): 부하 테스트에 사용할 CSV 파일 경로
+    session_counts (tuple): 측정할 동시 세션 수 목록
+
+    Returns:
+    pandas.DataFrame: 방식/세션 수별 측정 결과
+    """
+    string_storage = 'pyarrow' if DataLoader.arrow_available() else None
+    raw = DataLoader.load_from_file(file_path, string_storage=string_storage)
+    processed = AnimalDataProcessor(raw, string_storage=string_storage).preprocess_data()
+    del raw
+
+    rows = []
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as cache_dir:
+        key = SharedDataset.publish(processed, cache_dir=cache_dir)
+        for n_sessions in session_counts:
+            for mode in ('copy', 'shared'):
+                with context.Pool(1) as pool:
+                    rss, anonymous, elapsed = pool.apply(_measure, ((mode, n_sessions, key, cache_dir),))
+                rows.append({
+                    'mode': mode,
+                    'sessions': n_sessions,
+                    'rss_delta_mb': round(rss, 1),
+                    'anonymous_delta_mb': round(anonymous, 1),
+                    'per_session_mb': round(anonymous / n_sessions, 2),
+                    'render_s': round(elapsed, 3),
+                })
+        SharedDataset.close(key)
+
+    return pd.DataFrame(rows).set_index(['mode', 'sessions'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="공유 데이터셋 메모리 부하 테스트")
+    parser.add_argument('file_path', nargs='?', default=os.path.join('data', 'abandonment_public.csv'))
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 20])
+    args = parser.parse_args()
+    print(run(args.file_path, tuple(args.sessions)).to_string())
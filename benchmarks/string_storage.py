@@ -0,0 +1,85 @@
+"""
+문자열 저장 방식(object vs Arrow 기반 string[pyarrow]) 메모리/속도 비교 벤치마크
+
+사용법:
+    python -m benchmarks.string_storage [CSV 파일 경로] [--repeat N]
+"""
+import argparse
+import logging
+import time
+import pandas as pd
+from utils.data_loader import DataLoader
+from utils.data_processor import AnimalDataProcessor
+from page_modules.data_table import search_rows
+
+logging.disable(logging.INFO)
+
+
+def _timed(func, repeat):
+    """함수를 repeat번 실행해 최소 소요 시간(초)과 마지막 결과 반환"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _memory_mb(df, columns=None):
+    """컬럼 메모리 사용량(MB, deep)"""
+    columns = [c for c in (columns or df.columns) if c in df.columns]
+    return df[columns].memory_usage(deep=True, index=False).sum() / 1024 ** 2
+
+
+def run(file_path, repeat=3, search_term='보호'):
+    """
+    두 저장 방식으로 로드/전처리/검색을 수행하고 결과표 반환
+
+    Parameters:
+    file_path (str): 벤치마크할 CSV 파일 경로
+    repeat (int): 측정 반복 횟수 (최소값 사용)
+    search_term (str): 데이터 테이블 검색에 사용할 검색어
+
+    Returns:
+    pandas.DataFrame: 저장 방식별 측정 결과
+    """
+    raw = DataLoader.load_from_file(file_path)
+    rows = []
+    for storage in ['object', 'pyarrow']:
+        if storage == 'pyarrow' and not DataLoader.arrow_available():
+            continue
+
+        df = raw.copy()
+        for col in DataLoader.TEXT_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype(object)
+        string_storage = None if storage == 'object' else storage
+        df = DataLoader.apply_string_storage(df, string_storage)
+
+        preprocess_time, processed = _timed(
+            lambda: AnimalDataProcessor(df, string_storage=string_storage).preprocess_data(), repeat
+        )
+        search_time, _ = _timed(lambda: search_rows(processed, search_term), repeat)
+        contains_time, _ = _timed(
+            lambda: processed['happen_place'].str.contains(search_term, regex=False), repeat
+        ) if 'happen_place' in processed.columns else (float('nan'), None)
+
+        rows.append({
+            'storage': storage,
+            'rows': len(processed),
+            'text_columns_mb': round(_memory_mb(df, DataLoader.TEXT_COLUMNS), 2),
+            'processed_mb': round(_memory_mb(processed), 2),
+            'preprocess_s': round(preprocess_time, 3),
+            'table_search_s': round(search_time, 4),
+            'place_contains_s': round(contains_time, 4),
+        })
+    return pd.DataFrame(rows).set_index('storage')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="문자열 저장 방식 벤치마크")
+    parser.add_argument('file_path', nargs='?', default='data/abandonment_public.csv')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--search', default='보호')
+    args = parser.parse_args()
+    print(run(args.file_path, args.repeat, args.search).to_string())
@@ -1,7 +1,15 @@
 import streamlit as st
 import os
+import uuid
 from utils.data_loader import DataLoader
 from utils.data_processor import AnimalDataProcessor
+from utils.shared_dataset import SharedDataset
+from utils.preprocess_jobs import PreprocessJobManager
+from utils.dataset_catalog import DatasetCatalog, UNKNOWN_PARTITION
+from utils.chart_data import ChartData
+from utils.fallback_classifier import FallbackClassifier
+from utils.stratified_sample import StratifiedSample
+from utils.sketches import DatasetSketch
 
 # 페이지 모듈 import
 from page_modules.main_dashboard import show_main_dashboard
@@ -11,6 +19,7 @@ from page_modules.time_pattern import show_time_pattern
 from page_modules.survival_factors import show_survival_factors
 from page_modules.shelter_analysis import show_shelter_analysis
 from page_modules.data_table import show_data_table
+from page_modules.sql_query import show_sql_query
 
 # 페이지 설정
 st.set_page_config(
@@ -20,26 +29,54 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 문자열 컬럼 저장 방식 (pyarrow가 있으면 Arrow 기반 문자열 사용)
+STRING_STORAGE = 'pyarrow' if DataLoader.arrow_available() else None
+
+# 키워드로 분류되지 않은 장소/색상의 학습 모델 보조 분류 (scikit-learn 필요, ANIMAL_ML_FALLBACK=1일 때만 켬)
+ML_FALLBACK = FallbackClassifier.available() and os.environ.get('ANIMAL_ML_FALLBACK', '0') == '1'
+
+# 이번 실행에서 차트로 전송하는 데이터 크기 집계 초기화
+ChartData.reset_payload()
+
 # 세션 상태 관리
-if 'processed_data' not in st.session_state:
-    st.session_state.processed_data = None
+# 전처리된 데이터는 모든 세션이 공유하고 세션에는 데이터셋 키만 저장
+if 'dataset_key' not in st.session_state:
+    st.session_state.dataset_key = None
+    st.session_state.dataset_name = None
+# 공유 데이터셋 정리 시 이 세션이 쓰는 데이터셋을 알리는 식별자
+if 'session_token' not in st.session_state:
+    st.session_state.session_token = uuid.uuid4().hex
+
+@st.cache_resource(show_spinner=False)
+def _publish_file_dataset(file_path, modified_time):
+    """파일을 읽어 전처리한 뒤 공유 데이터셋으로 등록 (파일이 바뀌지 않으면 프로세스당 한 번)"""
+    df = DataLoader.load_from_file(file_path, string_storage=STRING_STORAGE)
+    if df is None:
+        return None
+    processor = AnimalDataProcessor(df, string_storage=STRING_STORAGE, ml_fallback=ML_FALLBACK)
+    key = SharedDataset.publish(processor.preprocess_data())
+    # 큰 데이터셋은 근사 모드용 층화 표본과 상위 값/고유값 요약도 함께 준비
+    StratifiedSample.publish(key)
+    DatasetSketch.prepare(key)
+    return key
 
 # data 폴더에서 CSV 파일 불러오기
 def load_data_from_file(file_name):
     try: 
         # data 폴더 내의 파일 경로 생성
         file_path = os.path.join('data', file_name)
+        if not os.path.exists(file_path):
+            return False
         
-        # DataLoader를 사용해 파일 로드
-        df = DataLoader.load_from_file(file_path)
-        
-        if df is not None:
-            # 데이터 전처리
-            processor = AnimalDataProcessor(df)  
-            processed_df = processor.preprocess_data()
-            
-            # 세션 상태에 저장
-            st.session_state.processed_data = processed_df
+        # 공유 데이터셋 키를 세션 상태에 저장
+        key = _publish_file_dataset(file_path, os.path.getmtime(file_path))
+        if key is not None and SharedDataset.open(key) is None:
+            # 쓰는 세션이 없는 동안 정리된 데이터셋은 다시 등록
+            _publish_file_dataset.clear()
+            key = _publish_file_dataset(file_path, os.path.getmtime(file_path))
+        if key is not None:
+            st.session_state.dataset_key = key
+            st.session_state.dataset_name = file_name
             return True
             
         return False
@@ -50,8 +87,13 @@ def load_data_from_file(file_name):
 # 기본 데이터 파일 로드
 default_file = 'abandonment_public.csv'  # 파일명만 지정
 
+# 오래 쉬는 동안 데이터셋이 정리되었으면 기본 데이터를 다시 로드
+if st.session_state.dataset_key is not None and SharedDataset.open(st.session_state.dataset_key) is None:
+    st.session_state.dataset_key = None
+    st.session_state.dataset_name = None
+
 # 앱 시작시 기본 데이터 로드 시도
-if st.session_state.processed_data is None:
+if st.session_state.dataset_key is None:
     if load_data_from_file(default_file):
         st.sidebar.success(f"{default_file} 데이터가 로드되었습니다.")
     else:
@@ -61,32 +103,144 @@ if st.session_state.processed_data is None:
 st.sidebar.title("유기동물 데이터 분석")
 menu = st.sidebar.radio(
     "메뉴 선택",
-    ["메인 대시보드", "동물 특성 분석", "지역 및 발견 장소 분석", "시간 패턴 분석", "생존 요인 분석", "보호소 분석", "데이터 테이블"]
+    ["메인 대시보드", "동물 특성 분석", "지역 및 발견 장소 분석", "시간 패턴 분석", "생존 요인 분석", "보호소 분석", "데이터 테이블", "SQL 질의"]
 )
 
 # 파일 업로드 옵션
-uploaded_file = st.sidebar.file_uploader("CSV 파일 업로드", type=['csv'])
+uploaded_file = st.sidebar.file_uploader("CSV/Excel 파일 업로드", type=['csv', 'xls', 'xlsx'])
+
+# 업로드 진행 상황을 주기적으로 갱신 (st.fragment가 없는 버전은 다음 상호작용 때 갱신)
+_poll_job = st.fragment(run_every=1.0) if hasattr(st, 'fragment') else (lambda func: func)
+
+@_poll_job
+def show_upload_job(job_id):
+    """백그라운드 전처리 작업의 단계별 진행 상황과 취소 버튼 표시"""
+    job = PreprocessJobManager.get(job_id)
+    if job is None:
+        return
+    if job.finished:
+        # 완료/실패 상태는 앱 전체를 다시 실행해 반영
+        st.rerun()
+
+    st.progress(job.progress, text=f"{job.file_name} 처리 중 ({job.step + 1}/{job.total_steps}): {job.stage}")
+    if st.button("처리 취소", key=f"cancel_{job_id}"):
+        job.cancel()
+        st.session_state.dismissed_upload = job.digest
+        st.rerun()
 
 if uploaded_file is not None:
     try:
-        # 업로드된 파일 로드
-        df = DataLoader.load_from_uploaded_file(uploaded_file)
-        
-        if df is not None:
-            # 데이터 전처리
-            processor = AnimalDataProcessor(df)
-            processed_df = processor.preprocess_data()
+        # 전처리는 백그라운드 작업으로 실행하고 그동안 기존 데이터를 계속 사용
+        data = uploaded_file.getvalue()
+        digest = PreprocessJobManager.content_digest(data, STRING_STORAGE, ML_FALLBACK)
+        if digest != st.session_state.get('dismissed_upload'):
+            job = PreprocessJobManager.submit(uploaded_file.name, data, digest, string_storage=STRING_STORAGE,
+                                             ml_fallback=ML_FALLBACK)
             
-            # 세션 상태에 저장
-            st.session_state.processed_data = processed_df
-            st.sidebar.success(f"{uploaded_file.name} 데이터가 성공적으로 처리되었습니다.")
-        else:
-            st.sidebar.error("데이터를 로드할 수 없습니다.")
+            if job.status == job.DONE:
+                if st.session_state.get('applied_upload_job') != job.job_id:
+                    # 공유 데이터셋 키만 세션 상태에 저장
+                    st.session_state.dataset_key = job.dataset_key
+                    st.session_state.dataset_name = job.file_name
+                    st.session_state.applied_upload_job = job.job_id
+                st.sidebar.success(f"{uploaded_file.name} 데이터가 성공적으로 처리되었습니다.")
+                if job.stage_errors:
+                    st.sidebar.warning("일부 처리를 건너뛰었습니다: " + ", ".join(label for label, _ in job.stage_errors))
+            elif job.status == job.FAILED:
+                st.session_state.dismissed_upload = digest
+                st.sidebar.error(f"데이터 처리 중 오류 발생: {job.error}")
+            elif job.status == job.CANCELLED:
+                st.session_state.dismissed_upload = digest
+                st.sidebar.info(f"{uploaded_file.name} 처리가 취소되었습니다.")
+            else:
+                with st.sidebar:
+                    show_upload_job(job.job_id)
     except Exception as e:
         st.sidebar.error(f"데이터 처리 중 오류 발생: {e}")
+else:
+    # 파일을 내리면 취소/실패 기록을 지워 같은 파일도 다시 처리할 수 있게 함
+    st.session_state.pop('dismissed_upload', None)
+
+# 데이터 카탈로그 (여러 파일을 연/월/시도 파티션으로 모아 분석)
+active_key = st.session_state.dataset_key
+catalog = DatasetCatalog()
+with st.sidebar.expander("데이터 카탈로그"):
+    if active_key and st.button("현재 데이터를 카탈로그에 추가"):
+        added = catalog.register(SharedDataset.open(active_key), st.session_state.dataset_name or active_key)
+        if added:
+            st.success(f"파티션 {added}개를 등록했습니다.")
+        else:
+            st.info("이미 등록된 데이터이거나 등록할 수 없는 데이터입니다.")
+
+    partitions = catalog.partitions()
+    if not partitions.empty:
+        st.caption(f"등록 파일 {len(catalog.sources())}개, 파티션 {len(partitions):,}개")
+        if st.checkbox("카탈로그 데이터 분석", value=False):
+            # 연도/시도 값이 없는 파티션은 '미상'으로 선택
+            known_years = sorted(partitions['year'].dropna().astype(int).unique())
+            year_options = known_years + ([UNKNOWN_PARTITION] if partitions['year'].isna().any() else [])
+            sido_options = sorted(partitions['sido'].dropna().unique())
+            if partitions['sido'].isna().any() and UNKNOWN_PARTITION not in sido_options:
+                sido_options.append(UNKNOWN_PARTITION)
+            # 기본은 가장 최근 연도만 (전체를 합친 사본을 바로 만들지 않음)
+            selected_years = st.multiselect("연도", year_options, default=known_years[-1:] or year_options)
+            selected_sidos = st.multiselect("시도", sido_options, default=sido_options)
+
+            # 선택하지 않은 연도/시도의 파티션은 읽지 않음
+            pruned = catalog.prune(years=selected_years, sidos=selected_sidos)
+            st.caption(f"선택 파티션 {len(pruned):,}/{len(partitions):,}개, {int(pruned['rows'].sum()):,}행")
+            # 이전 선택으로 만든 합본은 이 세션이 더 이상 쓰지 않으므로 정리 대상이 되도록 기록을 갱신
+            SharedDataset.retain(st.session_state.session_token, st.session_state.dataset_key)
+            active_key = catalog.load_shared(pruned)
+
+# 공유 데이터셋 가져오기 (읽기 전용, 세션별로는 필터 마스크만 유지)
+shared_df = SharedDataset.open(active_key) if active_key else None
+row_mask = None
+
+# 중복 의심 기록 제외 옵션
+if shared_df is not None and 'is_duplicate' in shared_df.columns:
+    duplicate_count = int(shared_df['is_duplicate'].sum())
+    exclude_duplicates = st.sidebar.checkbox(
+        f"중복 의심 기록 제외 ({duplicate_count:,}건)", value=False,
+        help="재공고·보호소 이송 등으로 같은 개체가 여러 번 등록된 것으로 보이는 기록을 제외합니다."
+    )
+    if exclude_duplicates:
+        row_mask = ~shared_df['is_duplicate'].to_numpy(dtype=bool)
+
+# 근사 모드 (큰 데이터셋은 층화 표본으로 빠르게 계산)
+approximate = False
+if StratifiedSample.eligible(shared_df):
+    approximate = st.sidebar.checkbox(
+        "근사 모드", value=False,
+        help="시도·동물 종류·연도별 층화 표본으로 계산합니다. 건수는 전체 규모로 추정해 신뢰구간과 함께 표시하고, "
+             "정확한 값은 백그라운드에서 계산되는 대로 바꿔 표시합니다."
+    )
 
 # 필터링된 데이터 가져오기
-filtered_df = st.session_state.processed_data
+filtered_df = None
+if approximate:
+    filtered_df = StratifiedSample.view(active_key, exclude_duplicates=row_mask is not None)
+if filtered_df is None and shared_df is not None:
+    approximate = False
+    filtered_df = SharedDataset.view(active_key, row_mask)
+
+# 이 세션이 쓰는 데이터셋(근사 모드 표본 포함)은 다른 세션이 새 데이터를 올려도 닫거나 지우지 않음
+SharedDataset.retain(st.session_state.session_token, st.session_state.dataset_key, active_key,
+                     filtered_df.attrs.get('dataset_key') if filtered_df is not None else None)
+
+@_poll_job
+def show_exact_progress():
+    """근사 모드에서 정확한 건수 계산이 끝나면 페이지를 다시 그림"""
+    if not StratifiedSample.pending():
+        st.rerun()
+    st.caption("정확한 값 계산 중...")
+
+# 근사 모드의 표본 건수를 전체 규모 추정치로 바꿔 표시하는 페이지 (그 외 페이지는 전체 데이터로 계산)
+APPROXIMATE_PAGES = ("메인 대시보드", "시간 패턴 분석")
+if approximate and menu not in APPROXIMATE_PAGES:
+    approximate = False
+    filtered_df = SharedDataset.view(active_key, row_mask)
+    st.info("이 페이지는 근사 모드를 지원하지 않아 전체 데이터로 계산합니다.")
 
 # 페이지 라우팅
 if filtered_df is not None:
@@ -104,5 +258,19 @@ if filtered_df is not None:
         show_shelter_analysis(filtered_df)
     elif menu == "데이터 테이블":
         show_data_table(filtered_df)
+    elif menu == "SQL 질의":
+        show_sql_query(filtered_df, active_key)
+    
+    if approximate:
+        st.sidebar.caption(f"근사 모드: 전체 {len(shared_df):,}행 중 표본 {len(filtered_df):,}행으로 계산합니다. "
+                           "건수는 전체 규모로 추정한 값입니다.")
+        if StratifiedSample.pending():
+            with st.sidebar:
+                show_exact_progress()
+    
+    # 페이지별 차트 전송량 표시
+    chart_count, payload_bytes = ChartData.payload_summary()
+    if chart_count:
+        st.sidebar.caption(f"차트 데이터 전송량: {payload_bytes / 1024:,.1f} KB (차트 {chart_count}개)")
 else:
     st.warning("데이터가 로드되지 않았습니다. 사이드바에서 파일을 업로드하거나 기본 데이터가 로드될 때까지 기다려주세요.")
\ No newline at end of file
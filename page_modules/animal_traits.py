@@ -1,5 +1,7 @@
 import streamlit as st
 import plotly.express as px
+from utils.chart_data import ChartData
+from utils.sketches import DatasetSketch
 
 def show_animal_traits(filtered_df):
     """동물 특성 분석 페이지를 표시합니다."""
@@ -12,21 +14,29 @@ def show_animal_traits(filtered_df):
         animal_types = ['전체'] + sorted(filtered_df['animal_type'].unique().tolist())
         selected_type = st.selectbox("동물 종류 선택", animal_types)
         
-        # 선택된 동물 유형으로 필터링
-        if selected_type == '전체':
-            type_filtered_df = filtered_df
-        else:
-            type_filtered_df = filtered_df[filtered_df['animal_type'] == selected_type]
-        
-        # 상위 10개 품종 표시
-        breed_counts = type_filtered_df['breed'].value_counts().head(10).reset_index()
+        # 선택된 동물 유형의 상위 10개 품종 (표기 변형을 모은 표준 품종명 기준,
+        # 큰 데이터는 미리 만든 요약으로 추정, 해당 없는 품종 제외)
+        breed_col = 'breed_canonical' if 'breed_canonical' in filtered_df.columns else 'breed'
+        where = None if selected_type == '전체' else ('animal_type', selected_type)
+        breed_counts = DatasetSketch.top_k(filtered_df, breed_col, 10, where=where).reset_index()
         breed_counts.columns = ['breed', 'count']
         
         fig = px.bar(breed_counts, x='breed', y='count', 
                     title=f"상위 10개 {selected_type} 품종",
                     color='breed',
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
+        
+        # 품종 그룹 (믹스 여부 -> 크기) 분포
+        if 'breed_lineage' in filtered_df.columns and 'breed_size' in filtered_df.columns:
+            type_df = filtered_df if selected_type == '전체' else filtered_df[filtered_df['animal_type'] == selected_type]
+            group_counts = type_df.groupby(['breed_lineage', 'breed_size'], observed=True).size().reset_index(name='count')
+            group_counts = group_counts[group_counts['count'] > 0]
+            
+            fig = px.sunburst(group_counts, path=['breed_lineage', 'breed_size'], values='count',
+                             title=f"{selected_type} 품종 그룹 분포 (믹스 여부 / 크기)",
+                             color_discrete_sequence=px.colors.qualitative.Pastel)
+            ChartData.show(fig)
     
     # 색상 분석
     st.header("색상 분석")
@@ -35,35 +45,38 @@ def show_animal_traits(filtered_df):
         
         with col1:
             # 색상 타입 분포
-            color_type_counts = filtered_df['color_type'].value_counts().reset_index()
+            color_type_counts = ChartData.top_n(filtered_df['color_type'].value_counts()).reset_index()
             color_type_counts.columns = ['color_type', 'count']
             
             fig = px.pie(color_type_counts, values='count', names='color_type', 
                         title="색상 타입 분포",
                         color_discrete_sequence=px.colors.qualitative.Pastel)
-            st.plotly_chart(fig, use_container_width=True)
+            ChartData.show(fig)
         
         with col2:
             # 색상 카테고리 상위 분포
-            color_cat_counts = filtered_df['color_cat'].value_counts().head(8).reset_index()
+            color_cat_counts = ChartData.top_n(filtered_df['color_cat'].value_counts(), 8).reset_index()
             color_cat_counts.columns = ['color_cat', 'count']
             
             fig = px.bar(color_cat_counts, x='color_cat', y='count', 
                         title="상위 색상 카테고리",
                         color='color_cat',
                         color_discrete_sequence=px.colors.qualitative.Pastel)
-            st.plotly_chart(fig, use_container_width=True)
+            ChartData.show(fig)
+        
+        if 'color_cat_inferred' in filtered_df.columns and filtered_df['color_cat_inferred'].any():
+            st.caption(f"색상 키워드가 없어 학습 모델로 추정한 기록: {int(filtered_df['color_cat_inferred'].sum()):,}건")
     
     # 성별 및 중성화 분석
     st.header("성별 및 중성화 분석")
     if 'animal_status' in filtered_df.columns:
-        status_counts = filtered_df['animal_status'].value_counts().reset_index()
+        status_counts = ChartData.top_n(filtered_df['animal_status'].value_counts()).reset_index()
         status_counts.columns = ['status', 'count']
         
         fig = px.pie(status_counts, values='count', names='status', 
                     title="성별 및 중성화 상태",
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
     
     # 체중 분석
     st.header("체중 분석")
@@ -78,11 +91,15 @@ def show_animal_traits(filtered_df):
             type_weight_df = weight_df[weight_df['animal_type'] == selected_type]
             
             if not type_weight_df.empty:
-                fig = px.histogram(type_weight_df, x='weight', 
-                                  title=f"{selected_type} 체중 분포",
-                                  color_discrete_sequence=px.colors.qualitative.Pastel,
-                                  nbins=20)
-                st.plotly_chart(fig, use_container_width=True)
+                # 행 단위 값 대신 미리 구간 집계한 결과만 차트로 전달
+                weight_bins = ChartData.histogram(type_weight_df['weight'], bins=20)
+                fig = px.bar(weight_bins, x='bin_center', y='count',
+                            title=f"{selected_type} 체중 분포",
+                            hover_data={'bin_left': ':.2f', 'bin_right': ':.2f'},
+                            color_discrete_sequence=px.colors.qualitative.Pastel)
+                fig.update_traces(width=(weight_bins['bin_right'] - weight_bins['bin_left']).to_numpy())
+                fig.update_layout(bargap=0, xaxis_title="weight", yaxis_title="count")
+                ChartData.show(fig)
                 
                 # 체중 통계량
                 stats = type_weight_df['weight'].describe()
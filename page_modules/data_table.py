@@ -1,6 +1,46 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import io
+from utils.rule_set import RuleSet
+from utils.utils import BitmaskUtils
+from utils.data_quality import DataQualityValidator
+
+def mask_labels(df):
+    """비트마스크 컬럼명 -> 비트 순서대로의 표시용 라벨 (데이터에 기록된 순서 우선, 없으면 현재 규칙)"""
+    defaults = {**RuleSet.current().mask_labels, 'quality_mask': DataQualityValidator.DISPLAY_LABELS}
+    return {column: BitmaskUtils.labels_of(df, column, labels) for column, labels in defaults.items()}
+
+def decode_masks(df):
+    """비트마스크 컬럼(place_mask, facility_mask, quality_mask)을 표시용 라벨 문자열로 변환합니다."""
+    labels = mask_labels(df)
+    columns = [col for col in df.columns if col in labels]
+    if not columns:
+        return df
+    return df.assign(**{col: BitmaskUtils.decode(df[col], labels[col]) for col in columns})
+
+def search_rows(df, search_term):
+    """
+    모든 컬럼에서 검색어(대소문자 무시, 일반 문자열)를 포함하는 행의 마스크를 반환합니다.
+    
+    문자열 컬럼은 그대로(Arrow 기반이면 Arrow 연산으로), 그 외 컬럼은 문자열로 변환해 검색합니다.
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    labels = mask_labels(df)
+    for col in df.columns:
+        values = df[col]
+        if col in labels:
+            # 비트마스크는 표시되는 라벨 문자열에서 검색
+            values = BitmaskUtils.decode(values, labels[col])
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # 범주형은 범주값에서만 검색한 뒤 코드로 확장
+            matched = values.cat.categories.astype(str).str.contains(search_term, case=False, regex=False)
+            mask |= np.asarray(matched, dtype=bool)[values.cat.codes.to_numpy()] & (values.cat.codes.to_numpy() >= 0)
+            continue
+        if not pd.api.types.is_string_dtype(values):
+            values = values.astype(str)
+        mask |= values.str.contains(search_term, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+    return mask
 
 def show_data_table(filtered_df):
     """데이터 테이블 페이지를 표시합니다."""
@@ -13,20 +53,15 @@ def show_data_table(filtered_df):
     # 검색 필터
     search_term = st.text_input("검색어 입력 (모든 컬럼에서 검색)")
     
-    # 검색어로 필터링
+    # 검색어로 필터링 (컬럼 단위 벡터 연산)
     if search_term:
-        filtered_data = filtered_df[
-            filtered_df.astype(str).apply(
-                lambda row: row.str.contains(search_term, case=False).any(), 
-                axis=1
-            )
-        ]
+        filtered_data = filtered_df[search_rows(filtered_df, search_term)]
     else:
         filtered_data = filtered_df
     
     # 컬럼 선택하여 표시
     if selected_columns:
-        st.dataframe(filtered_data[selected_columns], height=600)
+        st.dataframe(decode_masks(filtered_data[selected_columns]), height=600)
     else:
         st.warning("표시할 컬럼을 하나 이상 선택하세요.")
     
@@ -35,18 +70,43 @@ def show_data_table(filtered_df):
     st.write(f"총 행 수: {len(filtered_df)}")
     
     # 숫자형 컬럼 통계
-    numeric_cols = filtered_df.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols = [col for col in filtered_df.select_dtypes(include=['number']).columns
+                    if col not in mask_labels(filtered_df)]
     if numeric_cols:
         st.subheader("숫자형 컬럼 통계")
         st.dataframe(filtered_df[numeric_cols].describe())
     
+    # 데이터 품질 검사 결과 (전처리 시 원본 값 기준으로 기록된 quality_mask)
+    if 'quality_mask' in filtered_df.columns:
+        st.header("데이터 품질")
+        summary = DataQualityValidator.summary(filtered_df['quality_mask'])
+        st.write(f"문제가 있는 행: {int((filtered_df['quality_mask'] != 0).sum()):,}개")
+        st.dataframe(
+            summary.assign(ratio=summary['ratio'] * 100).rename(columns={
+                'description': '검사 항목', 'column': '컬럼', 'count': '건수', 'ratio': '비율(%)'
+            })[['검사 항목', '컬럼', '건수', '비율(%)']],
+            hide_index=True, use_container_width=True
+        )
+        
+        # 검사 항목별 문제 행 확인
+        issues = summary[summary['count'] > 0]
+        if not issues.empty:
+            choice = st.selectbox(
+                "문제 행 보기", issues.index,
+                format_func=lambda i: f"{issues.loc[i, 'column']} {issues.loc[i, 'description']} ({issues.loc[i, 'count']:,}건)"
+            )
+            positions = DataQualityValidator.rows(filtered_df['quality_mask'], issues.loc[choice, 'check'])
+            st.dataframe(decode_masks(filtered_df.iloc[positions[:1000]]), height=300)
+            if len(positions) > 1000:
+                st.caption(f"처음 1,000행만 표시합니다. (전체 {len(positions):,}행)")
+    
     # 데이터 내보내기 옵션
     st.header("데이터 내보내기")
     
     col1, col2 = st.columns(2)
     with col1:
         if st.button("CSV로 내보내기"):
-            csv = filtered_data[selected_columns].to_csv(index=False)
+            csv = decode_masks(filtered_data[selected_columns]).to_csv(index=False)
             st.download_button(
                 label="CSV 다운로드",
                 data=csv,
@@ -59,7 +119,7 @@ def show_data_table(filtered_df):
             # 메모리에 Excel 파일 생성
             output = io.BytesIO()
             with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                filtered_data[selected_columns].to_excel(writer, index=False, sheet_name="Data")
+                decode_masks(filtered_data[selected_columns]).to_excel(writer, index=False, sheet_name="Data")
             excel_data = output.getvalue()
             
             st.download_button(
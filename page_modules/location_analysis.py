@@ -1,6 +1,9 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils.chart_data import ChartData
+from utils.rule_set import RuleSet
+from utils.utils import BitmaskUtils
 
 def show_location_analysis(filtered_df):
     """지역 및 발견 장소 분석 페이지를 표시합니다."""
@@ -17,17 +20,17 @@ def show_location_analysis(filtered_df):
                     title="시도별 유기동물 발생 건수",
                     color='sido',
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
         
         # 권역별 발생 건수
         if 'region' in filtered_df.columns:
-            region_counts = filtered_df['region'].value_counts().reset_index()
+            region_counts = ChartData.top_n(filtered_df['region'].value_counts()).reset_index()
             region_counts.columns = ['region', 'count']
             
             fig = px.pie(region_counts, values='count', names='region', 
                         title="권역별 유기동물 발생 비율",
                         color_discrete_sequence=px.colors.qualitative.Pastel)
-            st.plotly_chart(fig, use_container_width=True)
+            ChartData.show(fig)
     
     # 발견 장소 유형 분석
     st.header("발견 장소 유형 분석")
@@ -39,28 +42,49 @@ def show_location_analysis(filtered_df):
                     title="장소 유형별 발생 건수",
                     color='place_type',
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
+        
+        if 'place_type_inferred' in filtered_df.columns and filtered_df['place_type_inferred'].any():
+            st.caption(f"장소 키워드가 없어 학습 모델로 추정한 기록: {int(filtered_df['place_type_inferred'].sum()):,}건")
     
     # 시설 특성별 분석
     st.header("시설 특성별 분석")
-    if 'facility_types' in filtered_df.columns:
-        # 시설 특성을 개별 항목으로 분리하여 빈도 계산
-        facility_list = []
-        for facilities in filtered_df['facility_types']:
-            for facility in facilities.split(', '):
-                facility_list.append(facility)
+    if 'facility_mask' in filtered_df.columns:
+        # 데이터를 분류할 때의 라벨 순서로 해석 (이후 규칙이 바뀌어도 비트 의미가 유지됨)
+        facility_names = BitmaskUtils.labels_of(filtered_df, 'facility_mask', RuleSet.current().facility_names)
         
-        facility_counts = pd.Series(facility_list).value_counts().reset_index()
+        # 시설 특성별 빈도 (비트마스크 고유값 단위로 계산)
+        facility_counts = BitmaskUtils.counts(filtered_df['facility_mask'], facility_names)
+        facility_counts = facility_counts[facility_counts > 0].head(10).reset_index()
         facility_counts.columns = ['facility', 'count']
         
-        # 상위 10개 시설만 표시
-        facility_counts = facility_counts.head(10)
-        
         fig = px.bar(facility_counts, x='facility', y='count', 
                     title="상위 10개 시설 특성",
                     color='facility',
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
+        
+        # 시설 특성 동시 출현 (기타 제외)
+        co_occurrence = BitmaskUtils.co_occurrence(filtered_df['facility_mask'], facility_names)
+        observed = [name for name in facility_names if name != '기타' and co_occurrence.loc[name, name] > 0]
+        if len(observed) > 1:
+            fig = px.imshow(co_occurrence.loc[observed, observed], text_auto=True,
+                            title="시설 특성 동시 출현 건수",
+                            color_continuous_scale='Blues')
+            ChartData.show(fig)
+        
+        # 선택한 시설 특성이 포함된 발견 장소
+        selected_facilities = st.multiselect("시설 특성 필터", [name for name in facility_names if name != '기타'])
+        if selected_facilities:
+            match_all = st.checkbox("선택한 특성을 모두 포함", value=False)
+            matched = filtered_df[BitmaskUtils.contains(
+                filtered_df['facility_mask'], selected_facilities, facility_names, match_all=match_all
+            )]
+            st.write(f"일치하는 기록: {len(matched):,}건")
+            if not matched.empty and 'happen_place' in matched.columns:
+                place_counts = matched['happen_place'].value_counts().head(10).reset_index()
+                place_counts.columns = ['발견 장소', '건수']
+                st.dataframe(place_counts, hide_index=True)
     
     # 지역별 동물 유형 분포
     st.header("지역별 동물 유형 분포")
@@ -69,10 +93,12 @@ def show_location_analysis(filtered_df):
         top_sidos = filtered_df['sido'].value_counts().head(5).index.tolist()
         
         # 시도별, 동물 유형별 집계
-        cross_tab = pd.crosstab(
-            filtered_df[filtered_df['sido'].isin(top_sidos)]['sido'], 
-            filtered_df[filtered_df['sido'].isin(top_sidos)]['animal_type']
-        ).reset_index()
+        cross_tab = (
+            filtered_df[filtered_df['sido'].isin(top_sidos)]
+            .groupby(['sido', 'animal_type'], observed=True).size()
+            .unstack(fill_value=0)
+            .reset_index()
+        )
         
         # Melt 데이터프레임으로 변환
         melted_df = pd.melt(cross_tab, id_vars=['sido'], var_name='animal_type', value_name='count')
@@ -80,4 +106,4 @@ def show_location_analysis(filtered_df):
         fig = px.bar(melted_df, x='sido', y='count', color='animal_type',
                      title="상위 5개 시도별 동물 유형 분포",
                      color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        ChartData.show(fig)
\ No newline at end of file
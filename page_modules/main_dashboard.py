@@ -1,5 +1,8 @@
 import streamlit as st
 import plotly.express as px
+import pandas as pd
+from utils.chart_data import ChartData
+from utils.stratified_sample import StratifiedSample
 
 def show_main_dashboard(filtered_df):
     """메인 대시보드 페이지를 표시합니다."""
@@ -9,59 +12,70 @@ def show_main_dashboard(filtered_df):
     # 카드 형태의 주요 통계 정보
     col1, col2, col3, col4 = st.columns(4)
     
+    # 근사 모드에서는 표본으로 추정한 전체 건수
+    approximate = StratifiedSample.is_sample(filtered_df)
+    total_count = filtered_df['sample_weight'].sum() if approximate else len(filtered_df)
     with col1:
-        st.metric("총 유기동물 수", f"{len(filtered_df):,}마리")
+        st.metric("총 유기동물 수", f"{'약 ' if approximate else ''}{total_count:,.0f}마리")
     
     if 'process_state' in filtered_df.columns:
-        status_counts = filtered_df['process_state'].value_counts()
+        status_counts = StratifiedSample.counts(filtered_df, 'process_state').set_index('process_state')['count']
         
         with col2:
             adopted_count = status_counts.get('입양', 0) + status_counts.get('종료(입양)', 0)
-            st.metric("입양된 동물", f"{adopted_count:,}마리")
+            st.metric("입양된 동물", f"{adopted_count:,.0f}마리")
         
         with col3:
             protecting_count = status_counts.get('보호중', 0)
-            st.metric("보호중인 동물", f"{protecting_count:,}마리")
+            st.metric("보호중인 동물", f"{protecting_count:,.0f}마리")
         
         with col4:
             death_count = status_counts.get('자연사', 0) + status_counts.get('종료(자연사)', 0) + status_counts.get('안락사', 0) + status_counts.get('종료(안락사)', 0)
-            st.metric("사망한 동물", f"{death_count:,}마리")
+            st.metric("사망한 동물", f"{death_count:,.0f}마리")
     
     st.markdown("---")
     
     # 동물 종류별 분포
     if 'animal_type' in filtered_df.columns:
         st.subheader("동물 종류별 분포")
-        animal_type_counts = filtered_df['animal_type'].value_counts().reset_index()
+        animal_type_counts = StratifiedSample.counts(filtered_df, 'animal_type').set_index('animal_type')['count']
+        animal_type_counts = ChartData.top_n(animal_type_counts).reset_index()
         animal_type_counts.columns = ['animal_type', 'count']
         
         fig = px.pie(animal_type_counts, values='count', names='animal_type', 
                      title="동물 종류별 분포",
                      color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
     
     # 상태별 분포
     if 'process_state' in filtered_df.columns:
         st.subheader("동물 상태별 분포")
-        status_counts = filtered_df['process_state'].value_counts().reset_index()
-        status_counts.columns = ['status', 'count']
+        status_counts = StratifiedSample.counts(filtered_df, 'process_state').rename(columns={'process_state': 'status'})
+        status_counts = status_counts.sort_values('count', ascending=False, kind='stable')
+        if len(status_counts) > 11:
+            # 상위 10개 외에는 '그 외'로 합침 (합친 범주의 신뢰구간은 표시하지 않음)
+            status_counts = ChartData.top_n(status_counts.set_index('status')['count'], 10).reset_index()
+            status_counts.columns = ['status', 'count']
         
         fig = px.bar(status_counts, x='status', y='count', 
                     title="상태별 유기동물 수",
                     color='status',
-                    color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+                    color_discrete_sequence=px.colors.qualitative.Pastel,
+                    **(StratifiedSample.error_bars(status_counts) if 'upper' in status_counts.columns else {}))
+        ChartData.show(fig)
     
     # 시간에 따른 유기동물 추이
-    if 'notice_date' in filtered_df.columns:
+    if isinstance(filtered_df.index, pd.DatetimeIndex):
         st.subheader("시간에 따른 유기동물 발생 추이")
         
-        # 월별 집계
-        filtered_df['year_month'] = filtered_df['notice_date'].dt.strftime('%Y-%m')
-        monthly_counts = filtered_df.groupby('year_month').size().reset_index(name='count')
+        # 월별 집계 (정렬된 날짜 인덱스 기준 resample)
+        monthly_counts = StratifiedSample.counts(filtered_df, 'year_month', freq='M')
+        
+        # 기간이 길어져도 차트로 보내는 점 수는 제한
+        monthly_counts = ChartData.downsample(monthly_counts, 'year_month', 'count', max_points=500)
         
         fig = px.line(monthly_counts, x='year_month', y='count', 
                      title="월별 유기동물 발생 추이",
-                     markers=True)
+                     markers=True, **StratifiedSample.error_bars(monthly_counts))
         fig.update_layout(xaxis_title="년월", yaxis_title="유기동물 수")
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        ChartData.show(fig)
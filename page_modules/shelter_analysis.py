@@ -1,30 +1,40 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils.occupancy import OccupancyAnalyzer
+from utils.chart_data import ChartData
+from utils.sketches import DatasetSketch
 
 def show_shelter_analysis(filtered_df):
     """보호소 분석 페이지를 표시합니다."""
     st.title("보호소 분석")
     
+    # 등록 보호소와 연결된 표준 보호소명이 있으면 사용 (표기가 다른 같은 보호소를 합쳐 집계)
+    shelter_col = 'shelter_name' if 'shelter_name' in filtered_df.columns else 'care_nm'
+    if 'shelter_id' in filtered_df.columns and len(filtered_df):
+        matched = filtered_df['shelter_id'].notna()
+        st.caption(f"보호소 등록 정보와 연결된 기록: {matched.mean() * 100:.1f}% "
+                   f"(등록 보호소 {filtered_df.loc[matched, 'shelter_id'].nunique():,}곳)")
+    
     # 보호소별 유기동물 수
     st.header("보호소별 유기동물 수")
-    if 'care_nm' in filtered_df.columns:
-        # 상위 10개 보호소
-        shelter_counts = filtered_df['care_nm'].value_counts().head(10).reset_index()
+    if shelter_col in filtered_df.columns:
+        # 상위 10개 보호소 (큰 데이터는 미리 만든 요약으로 추정)
+        shelter_counts = DatasetSketch.top_k(filtered_df, shelter_col, 10).reset_index()
         shelter_counts.columns = ['shelter', 'count']
         
         fig = px.bar(shelter_counts, x='shelter', y='count',
                      title="상위 10개 보호소 유기동물 수",
                      color='shelter',
                      color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
         
         # 보호소별 입양률
         if 'process_state' in filtered_df.columns:
             st.header("보호소별 입양률 (상위 10개)")
             
             # 보호소별 총 동물 수와 입양 동물 수 계산
-            shelter_adoption = filtered_df.groupby('care_nm').apply(
+            shelter_adoption = filtered_df.groupby(shelter_col).apply(
                 lambda x: pd.Series({
                     'total': len(x),
                     'adopted': len(x[x['process_state'] == '입양'])
@@ -41,20 +51,20 @@ def show_shelter_analysis(filtered_df):
             # 입양률 기준 상위 10개 보호소
             top_shelters = significant_shelters.sort_values('adoption_rate', ascending=False).head(10)
             
-            fig = px.bar(top_shelters, x='care_nm', y='adoption_rate',
+            fig = px.bar(top_shelters, x=shelter_col, y='adoption_rate',
                         title=f"보호소별 입양률 (최소 {min_animals}마리 이상 보호)",
-                        color='care_nm',
+                        color=shelter_col,
                         color_discrete_sequence=px.colors.qualitative.Pastel)
             fig.update_layout(xaxis_title="보호소", yaxis_title="입양률 (%)")
-            st.plotly_chart(fig, use_container_width=True)
+            ChartData.show(fig)
     else:
         st.warning("보호소 정보가 데이터에 없습니다.")
     
     # 지역별 보호소 분포
     st.header("지역별 보호소 분포")
-    if 'care_nm' in filtered_df.columns and 'sido' in filtered_df.columns:
-        # 시도별 보호소 수 계산
-        sido_shelter_counts = filtered_df.groupby('sido')['care_nm'].nunique().reset_index()
+    if shelter_col in filtered_df.columns and 'sido' in filtered_df.columns:
+        # 시도별 보호소 수 계산 (큰 데이터는 HyperLogLog 추정치)
+        sido_shelter_counts = DatasetSketch.distinct(filtered_df, shelter_col, 'sido').reset_index()
         sido_shelter_counts.columns = ['sido', 'shelter_count']
         
         # 시도별 보호소당 평균 동물 수 계산
@@ -69,13 +79,50 @@ def show_shelter_analysis(filtered_df):
                     title="지역별 보호소 수",
                     color='sido',
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
         
         # 보호소당 평균 동물 수 그래프
         fig = px.bar(sido_analysis, x='sido', y='animals_per_shelter',
                     title="지역별 보호소당 평균 동물 수",
                     color='sido',
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
+    else:
+        st.warning("보호소 또는 지역 정보가 데이터에 없습니다.")
+    
+    # 보호소별 일별 보호 두수
+    st.header("보호소별 일별 보호 두수")
+    if shelter_col in filtered_df.columns and 'happen_dt' in filtered_df.columns:
+        occupancy = OccupancyAnalyzer.daily_occupancy(filtered_df, shelter_column=shelter_col)
+        
+        if not occupancy.empty:
+            peaks = OccupancyAnalyzer.peak_occupancy(occupancy)
+            
+            # 보호소 및 기간 선택 (기본: 최대 보호 두수 상위 5개 보호소, 전체 기간)
+            selected_shelters = st.multiselect(
+                "보호소 선택", peaks['shelter'].tolist(), default=peaks['shelter'].head(5).tolist()
+            )
+            min_date, max_date = occupancy.index.min().date(), occupancy.index.max().date()
+            date_range = st.date_input("기간 선택", value=(min_date, max_date),
+                                       min_value=min_date, max_value=max_date)
+            start, end = (date_range[0], date_range[-1]) if isinstance(date_range, (list, tuple)) and date_range else (None, None)
+            
+            if selected_shelters:
+                series = OccupancyAnalyzer.shelter_series(occupancy, selected_shelters, start, end)
+                series = ChartData.downsample(series, 'date', 'occupancy', max_points=1000, group='shelter')
+                fig = px.line(series, x='date', y='occupancy', color='shelter',
+                             title="보호소별 일별 보호 두수",
+                             color_discrete_sequence=px.colors.qualitative.Pastel)
+                fig.update_layout(xaxis_title="날짜", yaxis_title="보호 두수")
+                fig.update_xaxes(rangeslider_visible=True)
+                ChartData.show(fig)
+            
+            # 보호소별 최대 보호 두수
+            peak_table = peaks.head(10).rename(columns={
+                'shelter': '보호소', 'peak': '최대 보호 두수', 'peak_date': '최대일', 'mean': '평균 보호 두수'
+            })
+            st.dataframe(peak_table.set_index('보호소'))
+        else:
+            st.warning("일별 보호 두수를 계산할 수 있는 데이터가 없습니다.")
     else:
-        st.warning("보호소 또는 지역 정보가 데이터에 없습니다.")
\ No newline at end of file
+        st.warning("보호소 또는 날짜 정보가 데이터에 없습니다.")
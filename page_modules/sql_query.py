@@ -0,0 +1,108 @@
+import streamlit as st
+import plotly.express as px
+import pandas as pd
+from utils.query_engine import QueryEngine, QueryError
+from utils.chart_data import ChartData
+
+# 예시 질의 (이름 -> SQL)
+EXAMPLE_QUERIES = {
+    "시도별 동물 종류 건수": """SELECT sido, animal_type, count(*) AS count
+FROM animals
+WHERE happen_year = $year
+GROUP BY ALL
+ORDER BY count DESC""",
+    "월별 보호 결과": """SELECT date_trunc('month', happen_dt) AS month, outcome, count(*) AS count
+FROM animals
+GROUP BY ALL
+ORDER BY month""",
+    "보호소별 평균 보호 기간": """SELECT care_nm, count(*) AS count, avg(stay_days) AS avg_stay_days
+FROM animals
+WHERE NOT stay_censored
+GROUP BY care_nm
+HAVING count(*) >= $min_count
+ORDER BY avg_stay_days DESC""",
+    "품종별 입양률": """SELECT breed, count(*) AS count,
+       avg(CASE WHEN outcome = '입양됨' THEN 1 ELSE 0 END) * 100 AS adoption_rate
+FROM animals
+WHERE animal_type = $animal_type
+GROUP BY breed
+ORDER BY count DESC""",
+}
+
+def _parse_parameter(text):
+    """파라미터 입력값을 정수/실수/문자열로 변환"""
+    text = text.strip()
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            continue
+    return text
+
+def show_sql_query(filtered_df, dataset_key):
+    """SQL 질의 페이지를 표시합니다."""
+    st.title("SQL 질의")
+
+    if not QueryEngine.available():
+        st.warning("SQL 질의를 사용하려면 duckdb 패키지가 필요합니다. (pip install duckdb)")
+        return
+    if not dataset_key:
+        st.warning("질의할 데이터셋이 없습니다.")
+        return
+
+    st.caption("처리된 전체 데이터가 `animals` 테이블로 제공됩니다. "
+               "중복 의심 기록 제외 옵션은 적용되지 않으므로 필요하면 `WHERE NOT is_duplicate`를 사용하세요. "
+               "`$이름` 형식으로 파라미터를 사용할 수 있습니다.")
+
+    with st.expander("컬럼 목록"):
+        try:
+            st.dataframe(QueryEngine.columns(dataset_key), use_container_width=True, hide_index=True)
+        except QueryError as e:
+            st.error(f"컬럼 정보를 가져올 수 없습니다: {e}")
+
+    # 예시 질의 선택
+    example = st.selectbox("예시 질의", ["직접 입력"] + list(EXAMPLE_QUERIES.keys()))
+    default_sql = EXAMPLE_QUERIES.get(example, "SELECT * FROM animals LIMIT 100")
+    sql = st.text_area("SQL", value=default_sql, height=180, key=f"sql_{example}")
+
+    # 파라미터 입력
+    params = {}
+    names = QueryEngine.parameters(sql)
+    if names:
+        defaults = {'year': str(int(filtered_df['happen_year'].max())) if 'happen_year' in filtered_df.columns
+                    and filtered_df['happen_year'].notna().any() else '',
+                    'min_count': '20', 'animal_type': '개'}
+        cols = st.columns(min(len(names), 4))
+        for i, name in enumerate(names):
+            with cols[i % len(cols)]:
+                params[name] = _parse_parameter(st.text_input(f"${name}", value=defaults.get(name, ''), key=f"param_{name}"))
+
+    if not st.button("실행", type="primary") and not st.session_state.get('sql_has_run'):
+        return
+    st.session_state.sql_has_run = True
+
+    try:
+        result, truncated, elapsed, cached = QueryEngine.execute(dataset_key, sql, params)
+    except QueryError as e:
+        st.error(f"질의 실행 중 오류 발생: {e}")
+        return
+
+    st.write(f"결과 {len(result):,}행 · {elapsed * 1000:.0f}ms" + (" (캐시)" if cached else ""))
+    if truncated:
+        st.info(f"결과가 많아 처음 {QueryEngine.MAX_ROWS:,}행만 표시합니다.")
+    st.dataframe(result, use_container_width=True)
+
+    # 결과가 (범주, 숫자) 형태면 간단한 차트 제공
+    numeric_columns = result.select_dtypes('number').columns.tolist()
+    other_columns = [c for c in result.columns if c not in numeric_columns]
+    if 0 < len(result) <= 500 and numeric_columns and other_columns:
+        x, y = other_columns[0], numeric_columns[-1]
+        color = other_columns[1] if len(other_columns) > 1 else None
+        if pd.api.types.is_datetime64_any_dtype(result[x]):
+            fig = px.line(result, x=x, y=y, color=color, markers=True)
+        else:
+            fig = px.bar(result, x=x, y=y, color=color)
+        ChartData.show(fig)
+
+    st.download_button("결과 CSV 다운로드", result.to_csv(index=False).encode('utf-8-sig'),
+                       file_name="query_result.csv", mime="text/csv")
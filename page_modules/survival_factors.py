@@ -1,105 +1,163 @@
 import streamlit as st
 import plotly.express as px
-import pandas as pd
+from utils.outcome import OutcomeAnalyzer
+from utils.length_of_stay import LengthOfStayAnalyzer
+from utils.chart_data import ChartData
+
+# 분석할 요인: (컬럼명, 표시명, 제목, 추가 조건)
+SURVIVAL_FACTORS = [
+    ('sex_cd', '성별', "성별에 따른 결과", None),
+    ('neuter_yn', '중성화', "중성화 여부에 따른 결과", None),
+    ('animal_type', '동물 종류', "동물 종류에 따른 결과", None),
+    ('weight_band', '체중(개)', "체중에 따른 결과 (개)", {'animal_type': '개'}),
+]
+
+# 보호 기간 분석 그룹 기준 및 사건 정의
+STAY_GROUP_OPTIONS = {
+    '전체': None,
+    '동물 종류': 'animal_type',
+    '권역': 'region',
+    '보호소': 'care_nm',
+    '나이 구간': 'age_band',
+    '체중 구간': 'weight_band',
+}
+STAY_EVENT_OPTIONS = {
+    '보호 종료 전체': None,
+    '입양': ['입양됨'],
+    '반환': ['반환됨'],
+    '사망': ['사망'],
+}
+MAX_STAY_GROUPS = 8
 
 def show_survival_factors(filtered_df):
     """생존 요인 분석 페이지를 표시합니다."""
     st.title("생존 요인 분석")
-    
+
+    outcome_tab, stay_tab = st.tabs(["결과 요인 분석", "보호 기간 분석"])
+    with outcome_tab:
+        _show_outcome_factors(filtered_df)
+    with stay_tab:
+        _show_length_of_stay(filtered_df)
+
+def _show_outcome_factors(filtered_df):
+    """보호 결과와 요인(성별, 중성화, 종류, 체중) 간 관계를 표시합니다."""
     # 필요한 열이 있는지 확인
     if 'process_state' in filtered_df.columns:
-        # 상태 분류
-        outcome_categories = {
-            '보호중': '보호중',
-            '입양': '입양됨',
-            '반환': '반환됨',
-            '자연사': '사망',
-            '안락사': '사망',
-            '방사': '기타',
-            '기증': '기타',
-            '기타': '기타'
-        }
-        
-        # 상태 매핑
-        filtered_df['outcome'] = filtered_df['process_state'].map(
-            lambda x: outcome_categories.get(x, '기타')
-        )
-        
+        # 전처리 단계에서 결과 분류가 없었던 경우에만 필요한 컬럼으로 계산 (원본은 수정하지 않음)
+        df = filtered_df
+        if 'outcome' not in df.columns or ('weight_band' not in df.columns and 'weight' in df.columns):
+            columns = [c for c in ['process_state', 'sex_cd', 'neuter_yn', 'animal_type', 'weight'] if c in df.columns]
+            df = OutcomeAnalyzer.assign_outcome(filtered_df[columns].copy())
+            if 'weight' in df.columns:
+                df = OutcomeAnalyzer.assign_weight_band(df)
+
         # 결과별 카운트
-        outcome_counts = filtered_df['outcome'].value_counts().reset_index()
+        outcome_counts = df['outcome'].value_counts()
+        outcome_counts = outcome_counts[outcome_counts > 0].reset_index()
         outcome_counts.columns = ['outcome', 'count']
-        
+
         # 전체 결과 파이 차트
         st.header("유기동물 최종 상태 분포")
-        fig = px.pie(outcome_counts, values='count', names='outcome', 
+        fig = px.pie(outcome_counts, values='count', names='outcome',
                     title="유기동물 최종 상태 분포",
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 성별에 따른 결과
-        st.header("성별에 따른 결과")
-        if 'sex_cd' in filtered_df.columns:
-            sex_outcome = pd.crosstab(filtered_df['sex_cd'], filtered_df['outcome']).reset_index()
-            sex_outcome_melted = pd.melt(sex_outcome, id_vars=['sex_cd'], 
-                                        value_vars=outcome_counts['outcome'].tolist(),
-                                        var_name='outcome', value_name='count')
-            
-            fig = px.bar(sex_outcome_melted, x='sex_cd', y='count', color='outcome',
-                        title="성별에 따른 결과 분포",
-                        color_discrete_sequence=px.colors.qualitative.Pastel)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # 중성화 여부에 따른 결과
-        st.header("중성화 여부에 따른 결과")
-        if 'neuter_yn' in filtered_df.columns:
-            neuter_outcome = pd.crosstab(filtered_df['neuter_yn'], filtered_df['outcome']).reset_index()
-            neuter_outcome_melted = pd.melt(neuter_outcome, id_vars=['neuter_yn'], 
-                                           value_vars=outcome_counts['outcome'].tolist(),
-                                           var_name='outcome', value_name='count')
-            
-            fig = px.bar(neuter_outcome_melted, x='neuter_yn', y='count', color='outcome',
-                        title="중성화 여부에 따른 결과 분포",
-                        color_discrete_sequence=px.colors.qualitative.Pastel)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # 동물 종류에 따른 결과
-        st.header("동물 종류에 따른 결과")
-        if 'animal_type' in filtered_df.columns:
-            type_outcome = pd.crosstab(filtered_df['animal_type'], filtered_df['outcome']).reset_index()
-            type_outcome_melted = pd.melt(type_outcome, id_vars=['animal_type'], 
-                                         value_vars=outcome_counts['outcome'].tolist(),
-                                         var_name='outcome', value_name='count')
-            
-            fig = px.bar(type_outcome_melted, x='animal_type', y='count', color='outcome',
-                        title="동물 종류에 따른 결과 분포",
+        ChartData.show(fig)
+
+        # 모든 요인 × 결과 분할표를 한 번에 계산
+        factors = [factor for factor, _, _, _ in SURVIVAL_FACTORS]
+        conditions = {factor: cond for factor, _, _, cond in SURVIVAL_FACTORS if cond}
+        labels = {factor: label for factor, label, _, _ in SURVIVAL_FACTORS}
+        table = OutcomeAnalyzer.contingency_tables(df, factors, conditions)
+        rates = OutcomeAnalyzer.outcome_rates(table)
+        tests = OutcomeAnalyzer.chi_square_tests(table).set_index('factor')
+
+        for factor, label, title, _ in SURVIVAL_FACTORS:
+            st.header(title)
+            factor_table = table[table['factor'] == factor]
+
+            if factor_table.empty or factor_table['count'].sum() == 0:
+                st.warning(f"{title} 분석에 필요한 데이터가 없습니다.")
+                continue
+
+            fig = px.bar(factor_table, x='level', y='count', color='outcome',
+                        title=title.replace('결과', '결과 분포', 1),
+                        category_orders={'outcome': OutcomeAnalyzer.OUTCOME_ORDER},
                         color_discrete_sequence=px.colors.qualitative.Pastel)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # 체중에 따른 결과 (개만)
-        st.header("체중에 따른 결과 (개)")
-        if 'weight' in filtered_df.columns and 'animal_type' in filtered_df.columns:
-            # 개만 필터링
-            dogs_df = filtered_df[(filtered_df['animal_type'] == '개') & (filtered_df['weight'].notna())]
-            
-            if not dogs_df.empty:
-                # 체중 구간 생성
-                dogs_df['weight_range'] = pd.cut(
-                    dogs_df['weight'], 
-                    bins=[0, 5, 10, 15, 20, 25, 30, 100],
-                    labels=['0-5kg', '5-10kg', '10-15kg', '15-20kg', '20-25kg', '25-30kg', '30kg+']
+            fig.update_layout(xaxis_title=label)
+            ChartData.show(fig)
+
+            if factor in tests.index:
+                test = tests.loc[factor]
+                st.caption(
+                    f"카이제곱 독립성 검정: χ²={test['chi2']:.1f}, 자유도={int(test['dof'])}, "
+                    f"p={test['p_value']:.4f}, Cramér's V={test['cramers_v']:.3f}"
                 )
-                
-                # 체중 구간별 결과 분포
-                weight_outcome = pd.crosstab(dogs_df['weight_range'], dogs_df['outcome']).reset_index()
-                weight_outcome_melted = pd.melt(weight_outcome, id_vars=['weight_range'], 
-                                              value_vars=outcome_counts['outcome'].tolist(),
-                                              var_name='outcome', value_name='count')
-                
-                fig = px.bar(weight_outcome_melted, x='weight_range', y='count', color='outcome',
-                            title="체중에 따른 결과 분포 (개)",
-                            color_discrete_sequence=px.colors.qualitative.Pastel)
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.warning("개의 체중 데이터가 없습니다.")
+
+        # 요인 수준별 입양률 (95% 신뢰구간)
+        st.header("요인별 입양률 (95% 신뢰구간)")
+        adoption = rates[(rates['outcome'] == '입양됨') & (rates['total'] > 0)].copy()
+        if not adoption.empty:
+            adoption['factor'] = adoption['factor'].map(labels)
+            adoption['label'] = adoption['factor'] + ': ' + adoption['level']
+            adoption['error_plus'] = (adoption['ci_high'] - adoption['rate']) * 100
+            adoption['error_minus'] = (adoption['rate'] - adoption['ci_low']) * 100
+            adoption['rate_pct'] = adoption['rate'] * 100
+
+            fig = px.bar(adoption, x='label', y='rate_pct', color='factor',
+                        error_y='error_plus', error_y_minus='error_minus',
+                        title="요인 수준별 입양률",
+                        color_discrete_sequence=px.colors.qualitative.Pastel)
+            fig.update_layout(xaxis_title="요인 수준", yaxis_title="입양률 (%)")
+            ChartData.show(fig)
     else:
-        st.warning("동물 상태 정보가 데이터에 없습니다.")
\ No newline at end of file
+        st.warning("동물 상태 정보가 데이터에 없습니다.")
+
+def _show_length_of_stay(filtered_df):
+    """입소부터 결과까지의 보호 기간을 Kaplan-Meier 곡선으로 표시합니다."""
+    st.header("보호 기간 생존 분석 (Kaplan-Meier)")
+
+    if 'stay_days' not in filtered_df.columns or 'stay_censored' not in filtered_df.columns:
+        st.warning("보호 기간 정보가 데이터에 없습니다.")
+        return
+
+    st.caption("보호중인 동물은 데이터 기준일에 중도절단된 것으로 처리합니다. "
+               "실제 처리일이 없으면 공고 종료일을 결과일로 사용합니다.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        group_options = [k for k, v in STAY_GROUP_OPTIONS.items() if v is None or v in filtered_df.columns]
+        group_label = st.selectbox("그룹 기준", group_options, key="stay_group")
+    with col2:
+        event_label = st.selectbox("사건 정의", list(STAY_EVENT_OPTIONS.keys()), key="stay_event")
+
+    group_column = STAY_GROUP_OPTIONS[group_label]
+    if group_column == 'care_nm' and 'shelter_name' in filtered_df.columns:
+        # 등록 보호소와 연결된 표준 보호소명으로 집계
+        group_column = 'shelter_name'
+    df = filtered_df[filtered_df['stay_days'].notna()]
+
+    # 그룹이 많으면 규모 상위 그룹만 표시
+    groups = None
+    if group_column:
+        top_groups = df[group_column].value_counts().head(MAX_STAY_GROUPS)
+        top_groups = top_groups[top_groups > 0].index
+        df = df[df[group_column].isin(top_groups)]
+        groups = df[group_column].astype(str)
+
+    if df.empty:
+        st.warning("보호 기간을 계산할 수 있는 데이터가 없습니다.")
+        return
+
+    events = LengthOfStayAnalyzer.event_flags(df, STAY_EVENT_OPTIONS[event_label])
+    curves = LengthOfStayAnalyzer.kaplan_meier(df['stay_days'], events, groups)
+
+    fig = px.line(curves, x='time', y='survival', color='group', line_shape='hv',
+                 title=f"{group_label}별 보호 지속 확률 ({event_label} 기준)",
+                 color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_layout(xaxis_title="보호 기간 (일)", yaxis_title="보호 지속 확률", yaxis_range=[0, 1.05])
+    ChartData.show(fig)
+
+    # 그룹별 중앙 보호 기간
+    medians = LengthOfStayAnalyzer.median_survival(curves)
+    medians.columns = ['그룹', '중앙 보호 기간(일)', '동물 수']
+    st.dataframe(medians.set_index('그룹'))
@@ -1,6 +1,11 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+import plotly.graph_objects as go
+from utils.forecast import IntakeForecaster
+from utils.chart_data import ChartData
+from utils.stratified_sample import StratifiedSample
+from utils.spike_detector import SpikeDetector
 
 def show_time_pattern(filtered_df):
     """시간 패턴 분석 페이지를 표시합니다."""
@@ -16,13 +21,14 @@ def show_time_pattern(filtered_df):
     
     if year_column:
         # 전처리된 연도 컬럼 사용
-        yearly_counts = filtered_df.groupby(year_column).size().reset_index(name='count')
+        # (근사 모드에서는 표본으로 추정한 건수와 신뢰구간)
+        yearly_counts = StratifiedSample.counts(filtered_df, year_column)
         
         fig = px.line(yearly_counts, x=year_column, y='count', 
                      title="연도별 유기동물 발생 추이",
-                     markers=True)
+                     markers=True, **StratifiedSample.error_bars(yearly_counts))
         fig.update_layout(xaxis_title="연도", yaxis_title="유기동물 수")
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
     
     # 월별 패턴
     st.header("월별 유기동물 발생 패턴")
@@ -40,11 +46,11 @@ def show_time_pattern(filtered_df):
     if month_column:
         if month_name_column and month_name_column in filtered_df.columns:
             # 전처리된 월 이름 컬럼 사용
-            monthly_counts = filtered_df.groupby([month_column, month_name_column]).size().reset_index(name='count')
+            monthly_counts = StratifiedSample.counts(filtered_df, [month_column, month_name_column])
             x_col = month_name_column
         else:
             # 월 이름 추가
-            monthly_counts = filtered_df.groupby(month_column).size().reset_index(name='count')
+            monthly_counts = StratifiedSample.counts(filtered_df, month_column)
             month_names = ['1월', '2월', '3월', '4월', '5월', '6월', '7월', '8월', '9월', '10월', '11월', '12월']
             monthly_counts['month_name'] = monthly_counts[month_column].apply(lambda x: month_names[x-1])
             x_col = 'month_name'
@@ -52,9 +58,10 @@ def show_time_pattern(filtered_df):
         fig = px.bar(monthly_counts, x=x_col, y='count', 
                     title="월별 유기동물 발생 패턴",
                     color=x_col,
-                    color_discrete_sequence=px.colors.qualitative.Pastel)
+                    color_discrete_sequence=px.colors.qualitative.Pastel,
+                    **StratifiedSample.error_bars(monthly_counts))
         fig.update_layout(xaxis_title="월", yaxis_title="유기동물 수")
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
     
     # 요일별 패턴
     st.header("요일별 유기동물 발생 패턴")
@@ -72,11 +79,11 @@ def show_time_pattern(filtered_df):
     if weekday_column:
         if weekday_name_column and weekday_name_column in filtered_df.columns:
             # 전처리된 요일 이름 컬럼 사용
-            weekday_counts = filtered_df.groupby([weekday_column, weekday_name_column]).size().reset_index(name='count')
+            weekday_counts = StratifiedSample.counts(filtered_df, [weekday_column, weekday_name_column])
             x_col = weekday_name_column
         else:
             # 요일 이름 추가
-            weekday_counts = filtered_df.groupby(weekday_column).size().reset_index(name='count')
+            weekday_counts = StratifiedSample.counts(filtered_df, weekday_column)
             weekday_names = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
             weekday_counts['weekday_name'] = weekday_counts[weekday_column].apply(lambda x: weekday_names[x])
             x_col = 'weekday_name'
@@ -84,9 +91,10 @@ def show_time_pattern(filtered_df):
         fig = px.bar(weekday_counts, x=x_col, y='count', 
                     title="요일별 유기동물 발생 패턴",
                     color=x_col,
-                    color_discrete_sequence=px.colors.qualitative.Pastel)
+                    color_discrete_sequence=px.colors.qualitative.Pastel,
+                    **StratifiedSample.error_bars(weekday_counts))
         fig.update_layout(xaxis_title="요일", yaxis_title="유기동물 수")
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
     
     # 계절별 패턴
     st.header("계절별 유기동물 발생 패턴")
@@ -98,7 +106,7 @@ def show_time_pattern(filtered_df):
 
     if season_column:
         # 전처리된 계절 컬럼 사용
-        season_counts = filtered_df.groupby(season_column).size().reset_index(name='count')
+        season_counts = StratifiedSample.counts(filtered_df, season_column)
         
         # 계절 순서 정렬
         season_order = ['봄', '여름', '가을', '겨울']
@@ -109,16 +117,13 @@ def show_time_pattern(filtered_df):
                     title="계절별 유기동물 발생 비율",
                     color=season_column,
                     color_discrete_sequence=px.colors.qualitative.Pastel)
-        st.plotly_chart(fig, use_container_width=True)
+        ChartData.show(fig)
     
     # 월별 동물 유형 분포
     st.header("월별 동물 유형 분포")
     if month_column and 'animal_type' in filtered_df.columns:
-        # 월별, 동물 유형별 집계
-        month_animal_counts = pd.crosstab(filtered_df[month_column], filtered_df['animal_type']).reset_index()
-        
-        # Melt 데이터프레임으로 변환
-        melted_df = pd.melt(month_animal_counts, id_vars=[month_column], var_name='animal_type', value_name='count')
+        # 월별, 동물 유형별 집계 (근사 모드면 전체 건수 추정치)
+        melted_df = StratifiedSample.counts(filtered_df, [month_column, 'animal_type'])
         
         # 월 이름 추가
         if not 'month_name' in melted_df.columns:
@@ -129,4 +134,108 @@ def show_time_pattern(filtered_df):
                      title="월별 동물 유형 분포",
                      color_discrete_sequence=px.colors.qualitative.Pastel)
         fig.update_layout(xaxis_title="월", yaxis_title="유기동물 수")
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        ChartData.show(fig)
+    
+    # 발생 건수 예측
+    st.header("유기동물 발생 예측")
+    if 'happen_dt' in filtered_df.columns:
+        shelter_col = 'shelter_name' if 'shelter_name' in filtered_df.columns else 'care_nm'
+        group_options = {'전체': None, '시도': 'sido', '동물 종류': 'animal_type', '보호소': shelter_col}
+        group_options = {k: v for k, v in group_options.items() if v is None or v in filtered_df.columns}
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            group_label = st.selectbox("예측 단위", list(group_options.keys()), key="forecast_group")
+        with col2:
+            horizon = st.slider("예측 기간 (개월)", min_value=3, max_value=24, value=12, key="forecast_horizon")
+        
+        # 선택한 단위의 모든 그룹을 한 번에 적합 (집계가 바뀐 계열만 재적합)
+        forecast_df = IntakeForecaster.forecast(filtered_df, group_options[group_label], horizon=horizon)
+        
+        if not forecast_df.empty:
+            groups = forecast_df['group'].unique().tolist()
+            selected_group = st.selectbox("대상 선택", groups, key="forecast_target") if len(groups) > 1 else groups[0]
+            series = forecast_df[forecast_df['group'] == selected_group]
+            actual = series[series['kind'] == '실측']
+            predicted = series[series['kind'] == '예측']
+            
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=actual['date'], y=actual['count'], mode='lines+markers', name='실측'))
+            if not predicted.empty:
+                fig.add_trace(go.Scatter(
+                    x=pd.concat([predicted['date'], predicted['date'][::-1]]),
+                    y=pd.concat([predicted['upper'], predicted['lower'][::-1]]),
+                    fill='toself', line=dict(width=0), opacity=0.3, name='90% 예측구간'
+                ))
+                fig.add_trace(go.Scatter(x=predicted['date'], y=predicted['count'], mode='lines+markers',
+                                         line=dict(dash='dash'), name=f"예측 ({predicted['model'].iloc[0]})"))
+            else:
+                st.info("선택한 대상은 예측 모델을 적합할 수 없어 실측치만 표시합니다.")
+            fig.update_layout(title=f"{selected_group} 월별 유기동물 발생 예측",
+                              xaxis_title="년월", yaxis_title="유기동물 수")
+            ChartData.show(fig)
+        else:
+            st.warning("예측에 필요한 기간의 데이터가 부족합니다.")
+    
+    # 지역 × 동물 종류별 급증 탐지
+    st.header("지역별 급증 탐지")
+    if StratifiedSample.is_sample(filtered_df):
+        st.info("급증 탐지는 일별 건수가 필요해 근사 모드에서는 표시하지 않습니다.")
+    elif 'happen_dt' in filtered_df.columns and all(c in filtered_df.columns for c in SpikeDetector.GROUP_COLUMNS):
+        col1, col2 = st.columns(2)
+        with col1:
+            threshold = st.slider("탐지 기준 (로버스트 z 점수)", min_value=3.0, max_value=10.0,
+                                  value=SpikeDetector.THRESHOLD, step=0.5, key="spike_threshold")
+        with col2:
+            min_count = st.slider("최소 일별 건수", min_value=2, max_value=50,
+                                  value=SpikeDetector.MIN_COUNT, key="spike_min_count")
+        
+        # 모든 시군구 × 동물 종류 계열을 한 번에 점수화 (같은 데이터는 캐시)
+        spikes = SpikeDetector.detect(filtered_df, threshold=threshold, min_count=min_count)
+        scores = SpikeDetector.score(filtered_df)
+        
+        if scores is None:
+            st.warning("급증 탐지에 필요한 데이터가 없습니다.")
+        elif spikes.empty:
+            st.success(f"계열 {len(scores['series']):,}개에서 기준을 넘는 급증이 없습니다.")
+        else:
+            st.write(f"계열 {len(scores['series']):,}개 중 {spikes['series_id'].nunique():,}개 계열에서 "
+                     f"급증 {len(spikes):,}건이 탐지되었습니다. "
+                     f"(기대 건수: 직전 {SpikeDetector.WINDOW}일 중앙값 × 요일 계수)")
+            top_spikes = spikes.head(100)
+            st.dataframe(
+                top_spikes.drop(columns='series_id').rename(columns={
+                    'sido': '시도', 'sigungu': '시군구', 'animal_type': '동물 종류', 'date': '날짜',
+                    'count': '건수', 'expected': '기대 건수', 'z_score': '점수'
+                }),
+                hide_index=True, use_container_width=True
+            )
+            if len(spikes) > len(top_spikes):
+                st.caption(f"점수 상위 {len(top_spikes)}건만 표시합니다.")
+            
+            # 선택한 급증 전후의 일별 건수
+            choice = st.selectbox(
+                "급증 상세 보기", top_spikes.index,
+                format_func=lambda i: (f"{top_spikes.loc[i, 'sido']} {top_spikes.loc[i, 'sigungu']} "
+                                       f"{top_spikes.loc[i, 'animal_type']} {top_spikes.loc[i, 'date']:%Y-%m-%d} "
+                                       f"({top_spikes.loc[i, 'count']}건)"),
+                key="spike_choice"
+            )
+            spike = top_spikes.loc[choice]
+            series = SpikeDetector.series_frame(scores, spike['series_id'])
+            series = series[series['date'].between(spike['date'] - pd.Timedelta(days=90),
+                                                   spike['date'] + pd.Timedelta(days=30))]
+            flagged = spikes[spikes['series_id'] == spike['series_id']]
+            flagged = flagged[flagged['date'].isin(series['date'])]
+            
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=series['date'], y=series['count'], mode='lines', name='일별 건수'))
+            fig.add_trace(go.Scatter(x=series['date'], y=series['expected'], mode='lines',
+                                     line=dict(dash='dash'), name='기대 건수'))
+            fig.add_trace(go.Scatter(x=flagged['date'], y=flagged['count'], mode='markers',
+                                     marker=dict(size=10, color='red'), name='급증'))
+            fig.update_layout(title=f"{spike['sido']} {spike['sigungu']} {spike['animal_type']} 일별 발생 건수",
+                              xaxis_title="날짜", yaxis_title="유기동물 수")
+            ChartData.show(fig)
+    else:
+        st.warning("급증 탐지에 필요한 컬럼(발생일, 시도, 시군구, 동물 종류)이 없습니다.")
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from utils.breed_canonicalizer import BreedCanonicalizer
+
+
+@pytest.fixture(scope='module')
+def canonicalizer():
+    return BreedCanonicalizer()
+
+
+@pytest.mark.parametrize('kind_cd, not_expected', [
+    ('[개] 플랫코티드 리트리버', '래브라도 리트리버'),
+    ('[개] 웰시 테리어', '웰시 코기'),
+    ('[개] 코카푸', '코카 스파니엘'),
+    ('[고양이] 도메스틱 롱헤어', '코리안숏헤어'),
+])
+def test_names_that_only_contain_an_alias_are_not_merged(canonicalizer, kind_cd, not_expected):
+    canonical, _, lineage = canonicalizer.resolve(kind_cd)
+    assert canonical != not_expected
+    assert lineage == '미상'
+
+
+@pytest.mark.parametrize('kind_cd, expected', [
+    ('[개] 토이 푸들', '푸들'),
+    ('[개] 웰시 코기 펨브로크', '웰시 코기'),
+    ('[개] 미니어처 닥스훈트', '닥스훈트'),
+    ('[개] 골든', '골든 리트리버'),
+    ('[고양이] 한국 고양이', '코리안숏헤어'),
+])
+def test_variants_anchored_at_the_start_still_match(canonicalizer, kind_cd, expected):
+    assert canonicalizer.resolve(kind_cd)[0] == expected
+
+
+def test_standard_poodle_has_its_own_size(canonicalizer):
+    assert canonicalizer.resolve('[개] 스탠다드 푸들') == ('스탠다드 푸들', '대형', '품종')
+    assert canonicalizer.resolve('[개] 푸들')[1] == '소형'
+
+
+@pytest.mark.parametrize('kind_cd, size', [('[개] 진도 믹스', '중형'), ('[개] 말티즈-푸들', '소형')])
+def test_mixes_keep_the_base_breed_size(canonicalizer, kind_cd, size):
+    assert canonicalizer.resolve(kind_cd) == ('믹스견', size, '믹스')
+
+
+def test_canonicalize_matches_resolve(canonicalizer):
+    kind_cd = pd.Series(['[개] 토이 푸들', '[개] 코카푸', None, '[개] 토이 푸들'])
+    groups = canonicalizer.canonicalize(kind_cd)
+    assert groups['breed_canonical'].tolist()[:2] == ['푸들', '코카푸']
+    assert pd.isna(groups['breed_canonical'].iloc[2])
+    assert groups['breed_lineage'].tolist() == ['품종', '미상', '미상', '품종']
@@ -0,0 +1,14 @@
+import pandas as pd
+from utils.chart_data import ChartData
+
+
+def test_top_n_keeps_real_other_category_separate():
+    counts = pd.Series({'개': 50, '고양이': 30, '기타': 10, '토끼': 3, '햄스터': 2, '거북': 1})
+    top = ChartData.top_n(counts, n=3)
+    assert top.to_dict() == {'개': 50, '고양이': 30, '기타': 10, ChartData.OTHER_LABEL: 6}
+    assert ChartData.OTHER_LABEL != '기타'
+
+
+def test_top_n_leaves_small_series_untouched():
+    counts = pd.Series({'개': 5, '고양이': 3, '기타': 0})
+    assert ChartData.top_n(counts, n=2).to_dict() == {'개': 5, '고양이': 3}
@@ -0,0 +1,67 @@
+import io
+import datetime
+import pandas as pd
+import pytest
+from utils.data_loader import DataLoader
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+def _workbook():
+    """날짜 셀, 날짜+시각 셀, 숫자/문자 날짜가 섞인 통합 문서"""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['desertion_no', 'happen_dt', 'notice_sdt', 'notice_edt', 'kind_cd'])
+    sheet.append([448567202300001, datetime.date(2023, 1, 5), datetime.datetime(2023, 1, 6, 9, 30), 20230120, '[개] 말티즈'])
+    sheet.append([448567202300002, '20230107', datetime.date(2023, 1, 8), None, '[개] 믹스견'])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('calamine', [True, False])
+def test_excel_date_cells_become_yyyymmdd(tmp_path, monkeypatch, calamine):
+    if calamine and not DataLoader.calamine_available():
+        pytest.skip('python-calamine 없음')
+    monkeypatch.setattr(DataLoader, 'calamine_available', staticmethod(lambda: calamine))
+
+    df = DataLoader.load_excel(_workbook(), cache_dir=str(tmp_path))
+    assert df['happen_dt'].tolist() == ['20230105', '20230107']
+    assert df['notice_sdt'].tolist() == ['20230106', '20230108']
+    assert df['notice_edt'].iloc[0] == '20230120' and pd.isna(df['notice_edt'].iloc[1])
+    assert df['desertion_no'].tolist() == ['448567202300001', '448567202300002']
+    assert pd.to_datetime(df['happen_dt'], format='%Y%m%d').notna().all()
+
+    # 캐시에서 다시 읽어도 같은 값
+    assert DataLoader.load_excel(_workbook(), cache_dir=str(tmp_path))['happen_dt'].tolist() == ['20230105', '20230107']
+
+
+def test_calamine_reader_builds_columns_with_missing_cells():
+    if not DataLoader.calamine_available():
+        pytest.skip('python-calamine 없음')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['kind_cd', 'age', 'special_mark'])
+    sheet.append(['[개] 말티즈', None, '온순함'])
+    sheet.append(['[고양이] 코리안숏헤어', '2020(년생)', None])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    df = DataLoader._read_excel_rows(buffer.getvalue())
+    assert df.columns.tolist() == ['kind_cd', 'age', 'special_mark']
+    assert df['kind_cd'].tolist() == ['[개] 말티즈', '[고양이] 코리안숏헤어']
+    assert df['age'].isna().tolist() == [True, False]
+    assert df['special_mark'].isna().tolist() == [False, True]
+
+
+def test_excel_cache_files_are_pruned(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    monkeypatch.setattr(DataLoader, 'MAX_EXCEL_CACHE_FILES', 2)
+    for index in range(4):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['desertion_no'])
+        workbook.active.append([index])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        DataLoader.load_excel(buffer.getvalue(), cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob('excel_*.arrow'))) == 2
@@ -0,0 +1,62 @@
+import os
+from collections import OrderedDict
+import pandas as pd
+import pytest
+import utils.shared_dataset as shared_dataset
+from utils.data_loader import DataLoader
+from utils.dataset_catalog import DatasetCatalog, UNKNOWN_PARTITION
+from utils.shared_dataset import SharedDataset
+from utils.utils import ResultCache
+
+pytestmark = pytest.mark.skipif(not DataLoader.arrow_available(), reason='pyarrow 없음')
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_dataset, 'DEFAULT_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(SharedDataset, '_frames', OrderedDict())
+    monkeypatch.setattr(SharedDataset, '_tables', OrderedDict())
+    monkeypatch.setattr(SharedDataset, '_leases', {})
+    monkeypatch.setattr(DatasetCatalog, '_dataset_keys', ResultCache(max_entries=16))
+    catalog = DatasetCatalog(str(tmp_path / 'catalog'))
+    df = pd.DataFrame({
+        'happen_dt': pd.to_datetime(['2022-03-01', '2023-05-02', '2023-06-03', None]),
+        'happen_year': [2022, 2023, 2023, None],
+        'happen_month': [3, 5, 6, None],
+        'sido': ['서울특별시', '서울특별시', None, '부산광역시'],
+        'kind_cd': ['[개] 믹스견'] * 4,
+    })
+    assert catalog.register(df, 'test.csv') > 0
+    return catalog
+
+
+def test_unknown_partitions_can_be_selected(catalog):
+    assert catalog.prune(years=[UNKNOWN_PARTITION])['rows'].sum() == 1
+    assert catalog.prune(years=[2023, UNKNOWN_PARTITION])['rows'].sum() == 3
+    assert catalog.prune(sidos=[UNKNOWN_PARTITION])['rows'].sum() == 1
+    assert catalog.prune(years=[2023], sidos=['서울특별시'])['rows'].sum() == 1
+
+
+def test_unknown_option_also_matches_literal_unknown_values(catalog):
+    df = pd.DataFrame({
+        'happen_dt': pd.to_datetime(['2024-01-01']),
+        'happen_year': [2024], 'happen_month': [1], 'sido': [UNKNOWN_PARTITION], 'kind_cd': ['[고양이] 한국 고양이'],
+    })
+    catalog.register(df, 'other.csv')
+    assert catalog.prune(sidos=[UNKNOWN_PARTITION])['rows'].sum() == 2
+
+
+def test_superseded_unions_are_discarded(catalog):
+    first = catalog.load_shared(catalog.prune(years=[2023]))
+    assert catalog.load_shared(catalog.prune(years=[2023])) == first
+    second = catalog.load_shared(catalog.prune(years=[2022, 2023]))
+    assert second != first
+    assert first not in SharedDataset._frames
+    assert not os.path.exists(SharedDataset._path(first, shared_dataset.DEFAULT_CACHE_DIR))
+
+
+def test_unions_used_by_other_sessions_are_kept(catalog):
+    first = catalog.load_shared(catalog.prune(years=[2023]))
+    SharedDataset.retain('other-session', first)
+    catalog.load_shared(catalog.prune(years=[2022]))
+    assert os.path.exists(SharedDataset._path(first, shared_dataset.DEFAULT_CACHE_DIR))
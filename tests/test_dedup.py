@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from utils.dedup import DuplicateDetector
+
+
+def _pairs(detector, df):
+    """후보 쌍 전체를 (왼쪽, 오른쪽) 목록으로"""
+    return sorted((int(l), int(r)) for left, right in detector._candidate_pairs(detector._encode_features(df))
+                  for l, r in zip(left, right))
+
+
+def _records(first_day, gap):
+    """발생일만 gap일 다른 같은 개체 기록 두 건"""
+    happen = pd.to_datetime(['2023-01-01', '2023-01-01']) + pd.to_timedelta([first_day, first_day + gap], unit='D')
+    return pd.DataFrame({
+        'happen_dt': happen,
+        'notice_sdt': happen,
+        'sigungu': ['강남구', '강남구'],
+        'animal_type': ['개', '개'],
+        'kind_cd': ['[개] 말티즈', '[개] 말티즈'],
+        'color_cd': ['흰색', '흰색'],
+        'sex_cd': ['M', 'M'],
+        'weight': [3.0, 3.0],
+        'happen_place': ['역삼동', '역삼동'],
+        'care_nm': ['강남구 동물보호센터', '강남구 동물보호센터'],
+    })
+
+
+def test_every_gap_within_window_is_compared():
+    detector = DuplicateDetector(window_days=7)
+    for gap in range(detector.window_days + 1):
+        for first_day in range(14):
+            assert _pairs(detector, _records(first_day, gap)) == [(0, 1)], (gap, first_day)
+
+
+def test_gap_beyond_window_is_not_compared():
+    detector = DuplicateDetector(window_days=7)
+    for first_day in range(14):
+        assert _pairs(detector, _records(first_day, 8)) == []
+
+
+def test_renotices_are_grouped_at_window_edge():
+    detector = DuplicateDetector(window_days=7)
+    for first_day in range(14):
+        result = detector.find_duplicates(_records(first_day, 7))
+        assert (result['dup_group'] == 0).all()
+        assert result['is_duplicate'].tolist() == [True, False]
+
+
+def test_large_blocks_are_split_by_kind_across_buckets():
+    detector = DuplicateDetector(window_days=7, max_block_size=1)
+    # 블록이 max_block_size보다 커서 품종으로 나뉘면 같은 품종 쌍만 비교
+    df = pd.concat([_records(6, 5), _records(6, 5)], ignore_index=True)
+    df.loc[2:, 'kind_cd'] = '[개] 푸들'
+    assert _pairs(detector, df) == [(0, 1), (2, 3)]
+
+
+def test_chunked_pairs_match_brute_force():
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({
+        'happen_dt': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 60, n), unit='D'),
+        'sigungu': rng.choice(['강남구', '수원시'], n),
+        'animal_type': rng.choice(['개', '고양이'], n),
+        'kind_cd': rng.choice(['[개] 말티즈', '[개] 푸들'], n),
+    })
+    detector = DuplicateDetector(window_days=7)
+    days = (df['happen_dt'] - df['happen_dt'].min()).dt.days.to_numpy()
+    same_block = (df['sigungu'].to_numpy()[:, None] == df['sigungu'].to_numpy()) & \
+                 (df['animal_type'].to_numpy()[:, None] == df['animal_type'].to_numpy())
+    expected = [(i, j) for i, j in zip(*np.nonzero(np.triu(same_block & (np.abs(days[:, None] - days) <= 7), 1)))]
+    features = detector._encode_features(df)
+    for chunk_pairs in (1, 50, None):
+        pairs = sorted((min(int(l), int(r)), max(int(l), int(r)))
+                       for left, right in detector._candidate_pairs(features, chunk_pairs) for l, r in zip(left, right))
+        assert pairs == sorted((int(i), int(j)) for i, j in expected)
+
+
+def test_blocks_missing_from_the_last_bucket_are_handled():
+    # 마지막 블록(서초구)이 마지막 구간에 없어도 블록별 최대 건수를 계산할 수 있어야 함
+    df = pd.concat([_records(30, 1), _records(0, 1)], ignore_index=True)
+    df.loc[2:, 'sigungu'] = '서초구'
+    assert _pairs(DuplicateDetector(window_days=7), df) == [(0, 1), (2, 3)]
+
+
+def test_look_alikes_found_at_different_places_are_not_grouped():
+    # 품종/색상/성별/체중/발생일/보호소가 모두 같아도 발견 장소가 다르면 다른 개체
+    df = _records(0, 0)
+    df['happen_place'] = ['역삼동 123', '논현동 45']
+    result = DuplicateDetector(window_days=7).find_duplicates(df)
+    assert not result['is_duplicate'].any()
+    assert (result['dup_group'] == -1).all()
+
+
+def test_same_place_with_spacing_differences_is_grouped():
+    df = _records(0, 1)
+    df['happen_place'] = ['역삼동 123 앞', '역삼동123앞.']
+    result = DuplicateDetector(window_days=7).find_duplicates(df)
+    assert result['is_duplicate'].sum() == 1
+    assert (result['dup_group'] == 0).all()
+
+
+def test_missing_places_are_not_grouped():
+    df = _records(0, 0)
+    df['happen_place'] = [None, '-']
+    assert not DuplicateDetector(window_days=7).find_duplicates(df)['is_duplicate'].any()
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_processor import AnimalDataProcessor
+from utils.fallback_classifier import FallbackClassifier
+from utils.utils import BitmaskUtils, ResultCache
+
+pytestmark = pytest.mark.skipif(not FallbackClassifier.available(), reason='scikit-learn 없음')
+
+
+def _training_data(places):
+    texts = np.array([f"{place} {i}번지" for place in places for i in range(40)], dtype=object)
+    labels = np.array([place for place in places for _ in range(40)], dtype=object)
+    return texts, labels, np.ones(len(texts), dtype=np.int64)
+
+
+def test_models_are_cached_per_training_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(FallbackClassifier, '_models', ResultCache(max_entries=4))
+    first = FallbackClassifier._model('place_type', 'v1', *_training_data(['공원', '도로']), '기타', str(tmp_path))
+    again = FallbackClassifier._model('place_type', 'v1', *_training_data(['공원', '도로']), '기타', str(tmp_path))
+    other = FallbackClassifier._model('place_type', 'v1', *_training_data(['학교', '시장']), '기타', str(tmp_path))
+
+    assert first is again
+    assert other is not first
+    assert set(other['classifier'].classes_) == {'학교', '시장'}
+    assert len(list(tmp_path.glob('*.joblib'))) == 2
+
+
+def test_inferred_place_types_are_reflected_in_place_mask(monkeypatch):
+    def fill(texts, labels, target, unmatched_label, rules_version, model_dir=None):
+        inferred = pd.Series((labels == unmatched_label).to_numpy(), index=labels.index)
+        return labels.where(~inferred, '공원'), inferred
+    monkeypatch.setattr(FallbackClassifier, 'fill', staticmethod(fill))
+
+    processor = AnimalDataProcessor(pd.DataFrame({'happen_place': ['아파트 주차장', '알 수 없는 곳']}), ml_fallback=True)
+    processor._process_location_information()
+    df = processor.df
+    labels = BitmaskUtils.labels_of(df, 'place_mask')
+
+    assert df['place_type'].tolist()[1] == '공원'
+    assert BitmaskUtils.decode(df['place_mask'], labels).tolist()[1] == '공원'
+    assert df['place_mask'].dtype == np.dtype(BitmaskUtils.dtype_for(len(labels)))
+    # 키워드로 분류된 행은 그대로
+    assert not df['place_type_inferred'].iloc[0]
+    assert '공원' not in BitmaskUtils.decode(df['place_mask'], labels).iloc[0]
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+import utils.forecast as forecast_module
+from utils.forecast import IntakeForecaster
+
+
+def _frame(weights=None):
+    dates = pd.to_datetime(['2023-01-05', '2023-01-20', '2023-03-02'])
+    df = pd.DataFrame({'happen_dt': dates, 'animal_type': ['개', '고양이', '개']})
+    if weights is not None:
+        df['sample_weight'] = weights
+    return df
+
+
+def test_monthly_counts_fill_empty_months():
+    counts = IntakeForecaster.monthly_counts(_frame())
+    assert counts['전체'].tolist() == [2, 0, 1]
+
+
+def test_monthly_counts_scale_samples_by_weight():
+    counts = IntakeForecaster.monthly_counts(_frame([10.0, 5.0, 10.0]), 'animal_type')
+    assert counts.loc['2023-01-01'].tolist() == [10.0, 5.0]
+    assert counts['개'].tolist() == [10.0, 0.0, 10.0]
+
+
+def test_incomplete_trailing_month_is_left_out_of_the_fit():
+    # 3월은 2일까지만 모인 달
+    counts = IntakeForecaster.monthly_counts(_frame(), complete_only=True)
+    assert counts.index.tolist() == [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-02-01')]
+    df = pd.DataFrame({'happen_dt': pd.to_datetime(['2023-01-05', '2023-03-31'])})
+    assert len(IntakeForecaster.monthly_counts(df, complete_only=True)) == 3
+
+
+def test_forecast_starts_at_the_incomplete_month():
+    pytest.importorskip('statsmodels')
+    dates = pd.date_range('2022-01-01', '2023-06-10', freq='D')
+    forecast = IntakeForecaster.forecast(pd.DataFrame({'happen_dt': dates}), horizon=3)
+    actual = forecast[forecast['kind'] == '실측']
+    predicted = forecast[forecast['kind'] == '예측']
+    assert actual['date'].max() == pd.Timestamp('2023-05-01')
+    assert predicted['date'].min() == pd.Timestamp('2023-06-01')
+
+
+def test_process_pool_uses_spawn(monkeypatch):
+    contexts = []
+
+    class _RecordingPool:
+        def __init__(self, max_workers, mp_context=None):
+            contexts.append(mp_context.get_start_method())
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, func, tasks, chunksize=1):
+            return [(task[0], None, None, None, None) for task in tasks]
+
+    monkeypatch.setattr(forecast_module, 'ProcessPoolExecutor', _RecordingPool)
+    tasks = [(index, [1.0] * 12, 3, 0.9) for index in range(IntakeForecaster.PARALLEL_THRESHOLD)]
+    IntakeForecaster._run_tasks(tasks, workers=2)
+    assert contexts == ['spawn']
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+from utils.length_of_stay import LengthOfStayAnalyzer
+
+
+@pytest.mark.parametrize('age_text, expected', [
+    ('2023(60일)미만(년생)', '1세 미만'),
+    ('2023(년생)', '1세 미만'),
+    ('2022(년생)', '1-3세'),
+    ('2021(년생)', '1-3세'),
+    ('2020(년생)', '3-7세'),
+    ('2017(년생)', '3-7세'),
+    ('2016(년생)', '7세 이상'),
+    ('2010(년생)', '7세 이상'),
+])
+def test_age_bands_include_their_lower_bound(age_text, expected):
+    df = pd.DataFrame({'age': [age_text], 'happen_year': [2023]})
+    assert LengthOfStayAnalyzer.assign_age_band(df)['age_band'].iloc[0] == expected
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+from utils.data_loader import DataLoader
+from utils.data_processor import AnimalDataProcessor
+from utils.dataset_catalog import DatasetCatalog
+from utils.rule_set import DEFAULT_RULES, RuleSet
+from utils.shared_dataset import SharedDataset
+from utils.utils import BitmaskUtils
+from page_modules.data_table import decode_masks
+
+
+def _classified():
+    df = pd.DataFrame({'happen_place': ['아파트 주차장', '공원 앞 도로', None]})
+    processor = AnimalDataProcessor(df)
+    return processor.classify_locations_in_dataframe(processor.df, 'happen_place')
+
+
+def _reorder_rules(monkeypatch):
+    """장소/시설 라벨 순서를 뒤집은 규칙으로 교체"""
+    reordered = RuleSet({
+        'place_type_mapping': dict(reversed(DEFAULT_RULES['place_type_mapping'].items())),
+        'facility_type_mapping': dict(reversed(DEFAULT_RULES['facility_type_mapping'].items())),
+    })
+    monkeypatch.setattr(RuleSet, 'current', classmethod(lambda cls, file_path=None: reordered))
+
+
+def test_classification_records_the_label_order():
+    df = _classified()
+    rules = RuleSet.current()
+    assert BitmaskUtils.labels_of(df, 'place_mask') == rules.place_types
+    assert BitmaskUtils.labels_of(df, 'facility_mask') == rules.facility_names
+
+
+def test_masks_decode_with_the_recorded_order_after_rules_change(monkeypatch):
+    df = _classified()
+    before = decode_masks(df)
+    assert before['facility_mask'].iloc[0] == '주거시설'
+
+    _reorder_rules(monkeypatch)
+    assert decode_masks(df).equals(before)
+    assert decode_masks(df[['place_mask', 'facility_mask']]).equals(before[['place_mask', 'facility_mask']])
+
+
+@pytest.mark.skipif(not DataLoader.arrow_available(), reason='pyarrow 없음')
+def test_label_order_survives_the_shared_dataset_file(tmp_path):
+    df = _classified()
+    key = SharedDataset.publish(df, cache_dir=str(tmp_path))
+    SharedDataset.close(key)
+    frame = SharedDataset.open(key, str(tmp_path))
+    assert frame.attrs[BitmaskUtils.LABELS_ATTR] == df.attrs[BitmaskUtils.LABELS_ATTR]
+
+
+def test_remap_moves_bits_to_the_target_order():
+    masks = pd.Series([0b01, 0b10, 0b11, 0])
+    remapped = BitmaskUtils.remap(masks, ['a', 'b'], ['c', 'b', 'a'])
+    assert remapped.tolist() == [0b100, 0b010, 0b110, 0]
+
+
+@pytest.mark.skipif(not DataLoader.arrow_available(), reason='pyarrow 없음')
+def test_catalog_aligns_partitions_classified_with_different_rules():
+    import pyarrow as pa
+
+    first = pd.DataFrame({'facility_mask': pd.Series([0b01, 0b10], dtype='uint8')})
+    BitmaskUtils.record_labels(first, 'facility_mask', ['주차장', '공원'])
+    second = pd.DataFrame({'facility_mask': pd.Series([0b01, 0b100], dtype='uint8')})
+    BitmaskUtils.record_labels(second, 'facility_mask', ['공원', '학교', '주차장'])
+
+    tables, labels = DatasetCatalog._align_masks([pa.Table.from_pandas(first), pa.Table.from_pandas(second)])
+    assert labels == {'facility_mask': ['주차장', '공원', '학교']}
+    masks = pa.concat_tables(tables)['facility_mask'].to_pylist()
+    decoded = BitmaskUtils.decode(pd.Series(masks), labels['facility_mask']).tolist()
+    assert decoded == ['주차장', '공원', '공원', '주차장']
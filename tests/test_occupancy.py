@@ -0,0 +1,27 @@
+import pandas as pd
+from utils.occupancy import OccupancyAnalyzer
+
+
+def _frame(notice_edt):
+    return pd.DataFrame({
+        'care_nm': ['가 보호소', '가 보호소', '나 보호소'],
+        'happen_dt': pd.to_datetime(['2023-01-01', '2023-01-03', '2023-01-05']),
+        'notice_edt': pd.to_datetime(notice_edt),
+        'process_state': ['종료(입양)', '종료(입양)', '보호중'],
+    })
+
+
+def test_daily_occupancy_counts_overlapping_stays():
+    occupancy = OccupancyAnalyzer.daily_occupancy(_frame(['2023-01-04', '2023-01-05', '2023-01-06']))
+    assert occupancy.index[0] == pd.Timestamp('2023-01-01') and len(occupancy) == 5
+    assert occupancy['가 보호소'].tolist() == [1, 1, 2, 2, 1]
+    assert occupancy['나 보호소'].tolist() == [0, 0, 0, 0, 1]
+
+
+def test_bad_end_year_does_not_blow_up_the_date_range():
+    # 2023 -> 2203 입력 오류: 날짜 범위가 수만 일로 늘어나지 않고 해당 기록만 제외
+    occupancy = OccupancyAnalyzer.daily_occupancy(_frame(['2203-01-04', '2023-01-05', '2023-01-06']))
+    assert occupancy.index.tolist() == list(pd.date_range('2023-01-03', '2023-01-05'))
+    assert occupancy['가 보호소'].tolist() == [1, 1, 1]
+    # 보호중 동물은 기준일이 잘못 늘어나도 입소일 범위의 마지막 날까지만 셈
+    assert occupancy['나 보호소'].tolist() == [0, 0, 1]
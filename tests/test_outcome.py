@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from utils.outcome import OutcomeAnalyzer
+
+
+def _frame():
+    return pd.DataFrame({
+        'weight_band': pd.Categorical(['0-5kg', None, '5-10kg', None, '0-5kg'], categories=['0-5kg', '5-10kg']),
+        'age_band': pd.Categorical(['1세 미만', '1-3세', None, '1-3세', '1세 미만']),
+        'sex_cd': pd.Series(['수컷', np.nan, '암컷', '수컷', None], dtype=object),
+        'animal_type': ['개', '개', '개', '고양이', '개'],
+        'outcome': pd.Categorical(['입양', '폐사', '입양', '입양', None]),
+    })
+
+
+def test_missing_factor_levels_are_excluded():
+    table = OutcomeAnalyzer.contingency_tables(_frame(), ['weight_band', 'age_band', 'sex_cd'],
+                                               {'weight_band': {'animal_type': '개'}})
+    assert not table['level'].isin(['nan', 'None', '<NA>']).any()
+    assert not table['outcome'].isin(['nan', 'None', '<NA>']).any()
+
+
+def test_counts_match_crosstab():
+    df = _frame()
+    table = OutcomeAnalyzer.contingency_tables(df, ['age_band', 'sex_cd'])
+    for factor in ['age_band', 'sex_cd']:
+        expected = pd.crosstab(df[factor], df['outcome']).stack()
+        got = table[table['factor'] == factor].set_index(['level', 'outcome'])['count']
+        assert got.sum() == expected.sum()
+        for (level, outcome), count in expected.items():
+            assert got.loc[(str(level), str(outcome))] == count
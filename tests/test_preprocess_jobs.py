@@ -0,0 +1,39 @@
+from utils.preprocess_jobs import PreprocessJob, PreprocessJobManager
+from utils.utils import ResultCache
+
+
+class _RecordingExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, func, *args):
+        self.calls.append(args)
+
+
+def _done_job(monkeypatch, dataset_key):
+    executor = _RecordingExecutor()
+    monkeypatch.setattr(PreprocessJobManager, '_executor', executor)
+    monkeypatch.setattr(PreprocessJobManager, '_jobs', {})
+    monkeypatch.setattr(PreprocessJobManager, '_jobs_by_digest', {})
+    monkeypatch.setattr(PreprocessJobManager, '_results', ResultCache(max_entries=4))
+    job = PreprocessJob('upload.csv', 'digest')
+    job.status, job.dataset_key = PreprocessJob.DONE, dataset_key
+    PreprocessJobManager._jobs[job.job_id] = job
+    PreprocessJobManager._jobs_by_digest['digest'] = job.job_id
+    return job, executor
+
+
+def test_done_job_is_reused_while_its_dataset_exists(monkeypatch):
+    job, executor = _done_job(monkeypatch, 'present')
+    monkeypatch.setattr('utils.preprocess_jobs.SharedDataset.open', staticmethod(lambda key, cache_dir=None: object()))
+    assert PreprocessJobManager.submit('upload.csv', b'data', 'digest') is job
+    assert executor.calls == []
+
+
+def test_done_job_is_resubmitted_when_its_dataset_was_pruned(monkeypatch):
+    job, executor = _done_job(monkeypatch, 'pruned')
+    monkeypatch.setattr('utils.preprocess_jobs.SharedDataset.open', staticmethod(lambda key, cache_dir=None: None))
+    resubmitted = PreprocessJobManager.submit('upload.csv', b'data', 'digest')
+    assert resubmitted is not job
+    assert resubmitted.status != PreprocessJob.DONE
+    assert len(executor.calls) == 1
@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+from utils.query_engine import QueryEngine, QueryError
+from utils.shared_dataset import SharedDataset
+
+
+def test_dollar_signs_in_literals_and_comments_are_not_parameters():
+    sql = """
+        SELECT * FROM animals -- 필터: $ignored
+        WHERE care_nm = 'a$year' AND "col$name" = $sido /* $also_ignored */
+          AND special_mark <> 'it''s $quoted' AND happen_year = $year
+    """
+    assert QueryEngine.parameters(sql) == ['sido', 'year']
+
+
+def test_semicolon_and_comment_markers_inside_literals_are_allowed():
+    pytest.importorskip('duckdb')
+    key = SharedDataset.publish(pd.DataFrame({'care_nm': ['a$year', 'b;--', 'c']}))
+    result, _, _, _ = QueryEngine.execute(key, "SELECT care_nm FROM animals WHERE care_nm IN ('a$year', 'b;--')")
+    assert sorted(result['care_nm']) == ['a$year', 'b;--']
+    with pytest.raises(QueryError):
+        QueryEngine.execute(key, "SELECT 1; SELECT ';'")
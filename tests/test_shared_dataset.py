@@ -0,0 +1,51 @@
+import os
+from collections import OrderedDict
+import pandas as pd
+import pytest
+from utils.data_loader import DataLoader
+from utils.shared_dataset import SharedDataset
+
+pytestmark = pytest.mark.skipif(not DataLoader.arrow_available(), reason='pyarrow 없음')
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(SharedDataset, '_frames', OrderedDict())
+    monkeypatch.setattr(SharedDataset, '_tables', OrderedDict())
+    monkeypatch.setattr(SharedDataset, '_leases', {})
+    monkeypatch.setattr(SharedDataset, 'MAX_OPEN', 2)
+    monkeypatch.setattr(SharedDataset, 'MAX_FILES', 2)
+
+
+def _publish(value, cache_dir):
+    return SharedDataset.publish(pd.DataFrame({'value': [value] * 3}), cache_dir=str(cache_dir))
+
+
+def test_open_datasets_are_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(SharedDataset, 'MAX_FILES', 8)
+    keys = [_publish(value, tmp_path) for value in range(6)]
+    assert list(SharedDataset._frames) == keys[-2:]
+    assert len(SharedDataset._tables) <= 2
+    # 닫힌 데이터셋도 파일이 남아 있으면 다시 열 수 있음
+    assert SharedDataset.open(keys[-3], str(tmp_path))['value'].iloc[0] == 3
+
+
+def test_datasets_used_by_live_sessions_stay_open_and_on_disk(tmp_path):
+    first = _publish(0, tmp_path)
+    SharedDataset.retain('session-a', first)
+    for value in range(1, 6):
+        _publish(value, tmp_path)
+    assert first in SharedDataset._frames
+    assert os.path.exists(SharedDataset._path(first, str(tmp_path)))
+    assert len(os.listdir(tmp_path)) == SharedDataset.MAX_FILES + 1
+
+
+def test_expired_sessions_no_longer_hold_datasets(tmp_path, monkeypatch):
+    first = _publish(0, tmp_path)
+    SharedDataset.retain('session-a', first)
+    monkeypatch.setattr(SharedDataset, 'LEASE_SECONDS', -1)
+    for value in range(1, 6):
+        _publish(value, tmp_path)
+    assert first not in SharedDataset._frames
+    assert not os.path.exists(SharedDataset._path(first, str(tmp_path)))
+    assert SharedDataset._leases == {}
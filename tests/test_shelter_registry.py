@@ -0,0 +1,47 @@
+import os
+import pandas as pd
+import pytest
+from utils.shelter_registry import ShelterRegistry, DEFAULT_REGISTRY_PATH
+
+
+@pytest.fixture(scope='module')
+def registry():
+    return ShelterRegistry(pd.DataFrame({
+        'id': [1, 2, 3, 4, 5],
+        'care_nm': ['다나동물병원', '청조동물병원', '창원유기동물보호소', '강남동물병원', '행복한동물병원'],
+        'care_addr': ['강원도 춘천시 1', '부산광역시 중구 1', '경상남도 창원시 1', '서울특별시 강남구 1', '서울특별시 마포구 1'],
+    }))
+
+
+@pytest.mark.parametrize('name', ['행복동물병원', '미소동물병원', '튼튼동물병원', '우리동물병원'])
+@pytest.mark.parametrize('sido', ['강원도', '부산광역시', None])
+def test_hospitals_sharing_only_the_generic_suffix_do_not_match(registry, name, sido):
+    assert registry.resolve(name, sido) is None
+
+
+def test_short_core_names_need_more_than_one_shared_gram(registry):
+    # 행복 / 행복한 은 bigram 하나만 공유
+    assert registry.resolve('행복동물병원', '서울특별시') is None
+
+
+def test_shelter_and_hospital_with_same_core_are_not_merged(registry):
+    assert registry.resolve('강남구 동물보호센터', '서울특별시') is None
+    assert registry.resolve('강남 동물병원', '서울특별시') == 4
+
+
+@pytest.mark.parametrize('name', ['창원시유기동물보호소', '창원시 유기동물 보호센타', '(사)창원 유기동물보호소'])
+def test_spelling_variants_still_match(registry, name):
+    assert registry.resolve(name, '경상남도') == 3
+
+
+def test_similar_names_match_within_the_same_facility_kind(registry):
+    assert registry.resolve('다나종합동물병원', '강원도') == 1
+    assert registry.resolve('청조 동물메디컬센터', None) == 2
+
+
+@pytest.mark.skipif(not os.path.exists(DEFAULT_REGISTRY_PATH), reason='등록 정보 파일 없음')
+def test_unregistered_hospitals_do_not_match_the_real_registry():
+    registry = ShelterRegistry(pd.read_csv(DEFAULT_REGISTRY_PATH, dtype={'care_tel': str}))
+    for name in ['행복동물병원', '미소동물병원', '튼튼동물병원']:
+        for sido in ['강원도', '부산광역시']:
+            assert registry.resolve(name, sido) is None, (name, sido)
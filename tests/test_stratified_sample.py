@@ -0,0 +1,30 @@
+import pandas as pd
+from utils.stratified_sample import StratifiedSample
+
+
+def _frame():
+    """1월과 4월에만 기록이 있는 데이터 (2, 3월은 0건)"""
+    dates = pd.to_datetime(['2023-01-03'] * 30 + ['2023-04-10'] * 10 + [None] * 2)
+    return pd.DataFrame({'sido': ['서울특별시'] * 42}, index=pd.DatetimeIndex(dates, name='happen_dt_index'))
+
+
+def test_exact_monthly_counts_include_empty_months():
+    counts = StratifiedSample.counts(_frame(), 'year_month', freq='M')
+    assert counts['year_month'].dt.strftime('%Y-%m').tolist() == ['2023-01', '2023-02', '2023-03', '2023-04']
+    assert counts['count'].tolist() == [30, 0, 0, 10]
+    assert (counts['lower'] == counts['count']).all()
+
+
+def test_estimated_monthly_counts_include_empty_months():
+    sample = StratifiedSample.build(_frame(), target_rows=20, seed=0)
+    assert StratifiedSample.is_sample(sample)
+    counts = StratifiedSample.estimate(sample, ['year_month'], freq='M')
+    assert counts['year_month'].dt.strftime('%Y-%m').tolist() == ['2023-01', '2023-02', '2023-03', '2023-04']
+    assert counts['count'].iloc[1:3].tolist() == [0, 0]
+    assert (counts['count'].iloc[[0, 3]] > 0).all()
+
+
+def test_counts_without_dates_are_empty():
+    df = pd.DataFrame({'sido': ['서울특별시']}, index=pd.DatetimeIndex([None]))
+    counts = StratifiedSample.counts(df, 'year_month', freq='M')
+    assert counts.empty
@@ -0,0 +1,371 @@
+"""
+전처리된 공유 데이터셋의 집계를 JSON/Arrow로 제공하는 로컬 HTTP 서비스
+
+사용법:
+    python -m utils.aggregate_api [--file data/abandonment_public.csv | --dataset-key KEY] [--port 8502]
+
+예:
+    curl 'http://127.0.0.1:8502/api/sido_counts?year=2023&animal_type=개'
+    curl 'http://127.0.0.1:8502/api/adoption_rates?by=sido&min_count=20&format=arrow' -o rates.arrow
+"""
+import io
+import os
+import json
+import hashlib
+import logging
+import argparse
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import pandas as pd
+from utils.utils import DateUtils, ResultCache
+from utils.data_loader import DataLoader
+from utils.data_processor import AnimalDataProcessor
+from utils.shared_dataset import SharedDataset
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AggregateRequestError(Exception):
+    """잘못된 집계 요청 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class AggregateAPI:
+    """
+    공유 데이터셋(SharedDataset) 하나에 대한 집계 요청을 처리하는 클래스
+
+    응답은 (데이터셋 키, 엔드포인트, 정규화한 파라미터, 형식)으로 정해지므로 이 값의 해시를
+    ETag로 사용해 조건부 요청(If-None-Match)은 집계 없이 304로 응답하고, 같은 요청이 동시에
+    들어오면 한 번만 계산해 결과를 나눠 씁니다.
+    """
+
+    # 엔드포인트 -> 설명
+    ENDPOINTS = {
+        'sido_counts': '시도별 발생 건수',
+        'animal_type_counts': '동물 종류별 발생 건수',
+        'outcome_counts': '보호 결과별 건수',
+        'adoption_rates': '그룹별 입양률 (by, min_count)',
+        'monthly_trend': '월별 발생 건수 (by)',
+    }
+
+    # 필터 파라미터 (여러 값은 쉼표로 구분)
+    LIST_FILTERS = {'year': 'happen_year', 'sido': 'sido', 'animal_type': 'animal_type'}
+    PARAMETERS = {*LIST_FILTERS, 'start', 'end', 'exclude_duplicates', 'by', 'min_count', 'format'}
+
+    # 그룹 기준으로 허용하는 컬럼
+    GROUP_COLUMNS = ['sido', 'region', 'animal_type', 'shelter_name', 'care_nm', 'breed', 'breed_canonical',
+                     'breed_size', 'breed_lineage', 'happen_year']
+
+    FORMATS = {
+        'json': 'application/json; charset=utf-8',
+        'arrow': 'application/vnd.apache.arrow.stream',
+    }
+
+    # ETag -> (본문, Content-Type), ETag -> 계산 중인 Future
+    _cache = ResultCache(max_entries=256)
+    _inflight = {}
+    _lock = threading.Lock()
+
+    def __init__(self, dataset_key, cache_dir=None):
+        """
+        초기화 함수
+
+        Parameters:
+        dataset_key (str): 집계할 공유 데이터셋 키
+        cache_dir (str): 데이터셋 파일 저장 디렉토리
+        """
+        self.dataset_key = dataset_key
+        self.cache_dir = cache_dir
+        if SharedDataset.open(dataset_key, cache_dir) is None:
+            raise ValueError(f"공유 데이터셋을 찾을 수 없습니다: {dataset_key}")
+
+    def handle(self, path, query='', if_none_match=None):
+        """
+        GET 요청 처리
+
+        Parameters:
+        path (str): 요청 경로 (/api/<엔드포인트>)
+        query (str): 쿼리 문자열
+        if_none_match (str): If-None-Match 헤더 값
+
+        Returns:
+        tuple: (상태 코드, 헤더 dict, 본문 bytes)
+        """
+        try:
+            if path.rstrip('/') in ('', '/api'):
+                body = json.dumps({'dataset': self.dataset_key, 'endpoints': self.ENDPOINTS},
+                                  ensure_ascii=False).encode('utf-8')
+                return 200, {'Content-Type': self.FORMATS['json']}, body
+
+            endpoint = path.rstrip('/').rsplit('/', 1)[-1]
+            if not path.startswith('/api/') or endpoint not in self.ENDPOINTS:
+                raise AggregateRequestError(404, f"알 수 없는 엔드포인트: {path}")
+            params = self.parse_params(query)
+
+            etag = self.etag(endpoint, params)
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+                return 304, headers, b''
+
+            body, content_type = self._coalesce(etag, lambda: self.render(endpoint, params))
+            headers['Content-Type'] = content_type
+            return 200, headers, body
+        except AggregateRequestError as e:
+            body = json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+            return e.status, {'Content-Type': self.FORMATS['json']}, body
+
+    def parse_params(self, query):
+        """
+        쿼리 문자열을 검증하고 정규화 (목록 값은 정렬, 기본값 채움)
+
+        Returns:
+        dict: 정규화된 파라미터
+        """
+        raw = parse_qs(query, keep_blank_values=False)
+        unknown = set(raw) - self.PARAMETERS
+        if unknown:
+            raise AggregateRequestError(400, f"알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+
+        def single(name, default=None):
+            return raw[name][-1] if name in raw else default
+
+        params = {}
+        for name in self.LIST_FILTERS:
+            if name in raw:
+                values = sorted({v.strip() for value in raw[name] for v in value.split(',') if v.strip()})
+                if name == 'year':
+                    try:
+                        values = sorted(int(v) for v in values)
+                    except ValueError:
+                        raise AggregateRequestError(400, "year는 정수여야 합니다.")
+                params[name] = values
+
+        for name in ('start', 'end'):
+            if name in raw:
+                try:
+                    params[name] = pd.Timestamp(single(name)).date().isoformat()
+                except ValueError:
+                    raise AggregateRequestError(400, f"{name}는 날짜(YYYY-MM-DD)여야 합니다.")
+
+        params['exclude_duplicates'] = single('exclude_duplicates', '0').lower() in ('1', 'true', 'yes')
+        params['by'] = single('by')
+        if params['by'] is not None and params['by'] not in self.GROUP_COLUMNS:
+            raise AggregateRequestError(400, f"by는 다음 중 하나여야 합니다: {', '.join(self.GROUP_COLUMNS)}")
+        try:
+            params['min_count'] = int(single('min_count', '1'))
+        except ValueError:
+            raise AggregateRequestError(400, "min_count는 정수여야 합니다.")
+        params['format'] = single('format', 'json')
+        if params['format'] not in self.FORMATS:
+            raise AggregateRequestError(400, "format은 json 또는 arrow여야 합니다.")
+        if params['format'] == 'arrow' and not DataLoader.arrow_available():
+            raise AggregateRequestError(400, "arrow 형식을 사용하려면 pyarrow가 필요합니다.")
+        return params
+
+    def etag(self, endpoint, params):
+        """데이터셋 키(내용 지문)와 요청으로 정해지는 ETag"""
+        text = json.dumps([self.dataset_key, endpoint, params], sort_keys=True, ensure_ascii=False)
+        return '"' + hashlib.sha1(text.encode('utf-8')).hexdigest()[:24] + '"'
+
+    def render(self, endpoint, params):
+        """집계를 계산해 요청한 형식으로 직렬화"""
+        df = self.filter_frame(SharedDataset.open(self.dataset_key, self.cache_dir), params)
+        result = self.aggregate(df, endpoint, params)
+
+        if params['format'] == 'arrow':
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(result, preserve_index=False)
+            sink = io.BytesIO()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue(), self.FORMATS['arrow']
+
+        payload = {
+            'dataset': self.dataset_key,
+            'endpoint': endpoint,
+            'params': {k: v for k, v in params.items() if k != 'format'},
+            'rows': len(df),
+            'data': json.loads(result.to_json(orient='records', date_format='iso', force_ascii=False)),
+        }
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8'), self.FORMATS['json']
+
+    @staticmethod
+    def filter_frame(df, params):
+        """
+        필터 파라미터 적용 (날짜 구간은 정렬된 날짜 인덱스에서 이진 탐색)
+
+        Parameters:
+        df (pandas.DataFrame): 공유 데이터프레임
+        params (dict): parse_params 결과
+
+        Returns:
+        pandas.DataFrame: 필터링된 데이터프레임
+        """
+        if params.get('start') or params.get('end'):
+            df = DateUtils.slice_date_range(df, params.get('start'), params.get('end'))
+
+        mask = pd.Series(True, index=df.index)
+        for name, column in AggregateAPI.LIST_FILTERS.items():
+            if params.get(name) and column in df.columns:
+                mask &= df[column].isin(params[name])
+        if params.get('exclude_duplicates') and 'is_duplicate' in df.columns:
+            mask &= ~df['is_duplicate'].astype(bool)
+        return df if mask.all() else df[mask.to_numpy()]
+
+    @staticmethod
+    def aggregate(df, endpoint, params):
+        """
+        엔드포인트별 집계 (페이지와 같은 기준)
+
+        Parameters:
+        df (pandas.DataFrame): 필터링된 데이터프레임
+        endpoint (str): ENDPOINTS 중 하나
+        params (dict): parse_params 결과
+
+        Returns:
+        pandas.DataFrame: 집계 결과
+        """
+        def counts(column):
+            if column not in df.columns:
+                raise AggregateRequestError(400, f"데이터에 {column} 컬럼이 없습니다.")
+            result = df[column].value_counts().rename_axis(column).reset_index(name='count')
+            result[column] = result[column].astype(str)
+            return result
+
+        if endpoint == 'sido_counts':
+            return counts('sido')
+        if endpoint == 'animal_type_counts':
+            return counts('animal_type')
+        if endpoint == 'outcome_counts':
+            return counts('outcome')
+
+        group = params.get('by')
+        if group is not None and group not in df.columns:
+            raise AggregateRequestError(400, f"데이터에 {group} 컬럼이 없습니다.")
+
+        if endpoint == 'adoption_rates':
+            if 'outcome' not in df.columns:
+                raise AggregateRequestError(400, "데이터에 outcome 컬럼이 없습니다.")
+            group = group or 'sido'
+            adopted = (df['outcome'] == '입양됨').to_numpy()
+            result = (
+                pd.DataFrame({group: df[group].astype(object).to_numpy(), 'adopted': adopted})
+                .groupby(group, dropna=True)['adopted'].agg(total='size', adopted='sum')
+                .reset_index()
+            )
+            result = result[result['total'] >= params.get('min_count', 1)]
+            result['adoption_rate'] = result['adopted'] / result['total'] * 100
+            result[group] = result[group].astype(str)
+            return result.sort_values('adoption_rate', ascending=False).reset_index(drop=True)
+
+        if endpoint == 'monthly_trend':
+            if not isinstance(df.index, pd.DatetimeIndex):
+                raise AggregateRequestError(400, "날짜 인덱스가 없어 월별 집계를 할 수 없습니다.")
+            month = df.index.to_period('M').to_timestamp()
+            keys = [month.rename('month')] + ([df[group].astype(str).to_numpy()] if group else [])
+            result = df.groupby(keys, observed=True).size().reset_index(name='count')
+            if group:
+                result = result.rename(columns={result.columns[1]: group})
+            return result
+
+        raise AggregateRequestError(404, f"알 수 없는 엔드포인트: {endpoint}")
+
+    @staticmethod
+    def _coalesce(key, compute):
+        """같은 키의 동시 요청은 한 번만 계산하고, 결과는 캐시에 보관"""
+        with AggregateAPI._lock:
+            cached = AggregateAPI._cache.get(key)
+            if cached is not None:
+                return cached
+            future = AggregateAPI._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = AggregateAPI._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = compute()
+            AggregateAPI._cache.put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with AggregateAPI._lock:
+                AggregateAPI._inflight.pop(key, None)
+
+
+def make_server(api, host='127.0.0.1', port=8502):
+    """
+    AggregateAPI를 제공하는 스레드 HTTP 서버 생성
+
+    Parameters:
+    api (AggregateAPI): 요청을 처리할 객체
+    host (str): 바인딩 주소 (기본: 로컬만)
+    port (int): 포트 (0이면 임의 포트)
+
+    Returns:
+    ThreadingHTTPServer: serve_forever()로 실행할 서버
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                status, headers, body = api.handle(url.path, url.query, self.headers.get('If-None-Match'))
+            except Exception as e:
+                logger.error(f"집계 요청 처리 중 오류 발생: {self.path}: {e}")
+                status, headers = 500, {'Content-Type': AggregateAPI.FORMATS['json']}
+                body = json.dumps({'error': '서버 오류'}).encode('utf-8')
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.info("%s - %s" % (self.address_string(), format % args))
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def publish_file(file_path, cache_dir=None):
+    """파일을 읽어 전처리한 뒤 공유 데이터셋으로 등록하고 키 반환"""
+    string_storage = 'pyarrow' if DataLoader.arrow_available() else None
+    df = DataLoader.load_from_file(file_path, string_storage=string_storage)
+    if df is None:
+        raise ValueError(f"데이터를 로드할 수 없습니다: {file_path}")
+    processed = AnimalDataProcessor(df, string_storage=string_storage).preprocess_data()
+    return SharedDataset.publish(processed, cache_dir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="유기동물 데이터 집계 API 서버")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--file', default=os.path.join('data', 'abandonment_public.csv'),
+                        help="전처리할 데이터 파일 (기본: data/abandonment_public.csv)")
+    source.add_argument('--dataset-key', help="이미 저장된 공유 데이터셋 키 (대시보드와 같은 캐시 디렉토리)")
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+
+    key = args.dataset_key or publish_file(args.file, args.cache_dir)
+    server = make_server(AggregateAPI(key, args.cache_dir), args.host, args.port)
+    logger.info(f"집계 API 서버 시작: http://{args.host}:{server.server_port}/api (dataset={key})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,230 @@
+import re
+import logging
+import threading
+import unicodedata
+import numpy as np
+import pandas as pd
+from utils.utils import TextUtils
+from utils.rule_set import RuleSet
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class BreedCanonicalizer:
+    """
+    품종 표기(kind_cd)를 규칙의 품종 사전으로 표준 품종명과 품종 그룹(크기, 믹스 여부)으로 바꾸는 클래스
+
+    '믹스견', '믹스', '잡종'이나 '시추'/'시츄', '한국 고양이'/'코리안숏헤어'처럼 같은 품종의 다른 표기를
+    하나의 표준 품종명으로 모읍니다. 표기 변형은 정규화한 뒤 문자 트라이에 넣고, 품종명의 첫 글자부터
+    단어 경계에서 끝나는 가장 긴 일치를 찾습니다 ('플랫코티드 리트리버', '코카푸'는 다른 품종으로 모으지 않음).
+    고유 kind_cd 값마다 한 번만 찾고 결과를 기억합니다.
+    """
+
+    NON_WORD_PATTERN = re.compile(r'[^0-9a-z가-힣]')
+    NON_WORD_RUN_PATTERN = re.compile(r'[^0-9a-z가-힣]+')
+
+    # 트라이 노드에서 일치한 (표준 품종명, 전체 일치만 허용 여부)를 담는 키 (문자 키와 겹치지 않음)
+    TERMINAL = None
+
+    # 품종 그룹 범주 (category 순서)
+    SIZE_CATEGORIES = ['소형', '중형', '대형', '해당없음', '미상']
+    LINEAGE_CATEGORIES = ['품종', '믹스', '미상']
+
+    _current = None
+    _lock = threading.Lock()
+
+    def __init__(self, rules=None):
+        """
+        초기화 함수
+
+        Parameters:
+        rules (RuleSet): 품종 사전을 가진 규칙 객체 (기본: 현재 공유 규칙)
+        """
+        self.rules = rules or RuleSet.current()
+
+        self.trie = {}
+        exact_aliases = {self.normalize(alias) for alias in self.rules.breed_exact_aliases}
+        for canonical, aliases in self.rules.breed_aliases.items():
+            for alias in [canonical] + list(aliases):
+                key = self.normalize(alias)
+                self._insert(key, canonical, key in exact_aliases)
+
+        self.sizes = {name: size for size, names in self.rules.breed_sizes.items() for name in names}
+        self.mixed_keywords = tuple(self.normalize(keyword) for keyword in self.rules.mixed_breed_keywords)
+        self.mixed_names = self.rules.mixed_breed_names
+
+        # kind_cd -> (표준 품종명, 크기, 믹스 여부)
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def current(cls):
+        """
+        공유 품종 변환 객체 반환 (규칙이 바뀌었으면 새로 만듦)
+
+        Returns:
+        BreedCanonicalizer: 현재 규칙 기준 변환 객체
+        """
+        rules = RuleSet.current()
+        if cls._current is not None and cls._current.rules is rules:
+            return cls._current
+        with cls._lock:
+            if cls._current is None or cls._current.rules is not rules:
+                cls._current = cls(rules)
+        return cls._current
+
+    @staticmethod
+    def normalize(text):
+        """품종명 정규화 (유니코드 정규화, 공백/기호 제거, 소문자)"""
+        if pd.isna(text):
+            return ''
+        text = unicodedata.normalize('NFKC', str(text)).lower()
+        return BreedCanonicalizer.NON_WORD_PATTERN.sub('', text)
+
+    @staticmethod
+    def tokens(text):
+        """품종명을 단어 경계가 공백 하나로 표시된 소문자 문자열로 변환 (예: '웰시 코기-펨브로크' -> '웰시 코기 펨브로크')"""
+        if pd.isna(text):
+            return ''
+        text = unicodedata.normalize('NFKC', str(text)).lower()
+        return BreedCanonicalizer.NON_WORD_RUN_PATTERN.sub(' ', text).strip()
+
+    @staticmethod
+    def species(kind_cd):
+        """kind_cd의 동물 종류 (animal_type과 같은 규칙)"""
+        text = str(kind_cd)
+        return '개' if '개' in text else ('고양이' if '고양이' in text else '기타')
+
+    def _insert(self, key, canonical, exact=False):
+        if not key:
+            return
+        node = self.trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[self.TERMINAL] = (canonical, exact)
+
+    def lookup(self, text):
+        """
+        품종명의 첫 글자부터 사전의 표기 변형 찾기 (단어 경계에서 끝나는 가장 긴 일치)
+
+        표기 변형은 띄어쓰기 없이 저장되므로 품종명의 공백은 건너뛰며 비교하고(예: '토이 푸들' = '토이푸들'),
+        일치가 단어 중간에서 끝나면 버립니다(예: '코카푸'). 전체 일치만 허용하는 표기(breed_exact_aliases)는
+        품종명 전체와 같을 때만 씁니다(예: '웰시'는 '웰시'만, '웰시 테리어'는 제외).
+
+        Parameters:
+        text (str): tokens 결과
+
+        Returns:
+        str: 표준 품종명 (없으면 None)
+        """
+        return self._match(text)[0]
+
+    def _match(self, text):
+        """lookup과 같되 (표준 품종명, 일치가 끝난 위치) 반환"""
+        node, found, end = self.trie, None, 0
+        for position, char in enumerate(text):
+            if char == ' ':
+                continue
+            node = node.get(char)
+            if node is None:
+                break
+            entry = node.get(self.TERMINAL)
+            at_end = position + 1 == len(text)
+            if entry is not None and (at_end or text[position + 1] == ' '):
+                canonical, exact = entry
+                if at_end or not exact:
+                    found, end = canonical, position + 1
+        return found, end
+
+    def resolve(self, kind_cd, breed=None):
+        """
+        kind_cd 값 하나를 표준 품종명과 품종 그룹으로 변환
+
+        Parameters:
+        kind_cd (str): 원본 품종 표기 (예: '[개] 믹스견')
+        breed (str): kind_cd에서 추출한 품종명 (없으면 직접 추출)
+
+        Returns:
+        tuple: (표준 품종명 또는 None, 크기, 믹스 여부)
+        """
+        if kind_cd in self._memo:
+            return self._memo[kind_cd]
+
+        if breed is None:
+            breed = TextUtils.extract_breed(kind_cd)
+        species = self.species(kind_cd)
+        normalized = self.normalize(breed)
+        text = self.tokens(breed)
+        canonical, end = self._match(text)
+        mixed = any(keyword in normalized for keyword in self.mixed_keywords)
+        if canonical is not None and not mixed:
+            # 뒤에 다른 품종명이 이어지면 두 품종의 교배종으로 봄 (예: '말티즈 푸들')
+            other = self.lookup(text[end:].strip())
+            mixed = other is not None and other != canonical
+
+        if not normalized:
+            result = (None, '미상' if species == '개' else '해당없음', '미상')
+        else:
+            size = self.sizes.get(canonical, '미상') if species == '개' else '해당없음'
+            if mixed:
+                # 기준 품종이 있는 믹스(예: 진도 믹스)도 믹스로 모으되 크기는 기준 품종을 따름
+                result = (self.mixed_names.get(species, self.mixed_names.get('기타')), size, '믹스')
+            elif canonical is not None:
+                result = (canonical, size, '품종')
+            else:
+                result = (' '.join(unicodedata.normalize('NFKC', str(breed)).split()), size, '미상')
+
+        with self._memo_lock:
+            self._memo[kind_cd] = result
+        return result
+
+    def canonicalize(self, kind_cd):
+        """
+        kind_cd 컬럼 전체를 고유 값 단위로 한 번에 변환
+
+        Parameters:
+        kind_cd (pandas.Series): 원본 품종 표기
+
+        Returns:
+        pandas.DataFrame: breed_canonical, breed_size, breed_lineage 컬럼 (모두 category 타입)
+        """
+        codes, uniques = pd.factorize(kind_cd.astype(object))
+        breeds = TextUtils.extract_breed_series(pd.Series(uniques, dtype=object)).astype(object)
+        # 결측 kind_cd(code -1)가 마지막 행을 가리키도록 미상 행 추가
+        resolved = np.array(
+            [self.resolve(value, breed) for value, breed in zip(uniques, breeds)] + [(None, '미상', '미상')],
+            dtype=object
+        )
+
+        def categorical(values, categories=None):
+            # 고유 값 단위로 범주 코드를 구한 뒤 행 코드로 펼침 (행 단위 문자열 해싱 없음)
+            if categories is None:
+                categories = sorted({value for value in values if value is not None})
+            value_codes = pd.Index(categories, dtype=object).get_indexer(values)
+            return pd.Categorical.from_codes(value_codes[codes], categories=categories)
+
+        return pd.DataFrame({
+            'breed_canonical': categorical(resolved[:, 0]),
+            'breed_size': categorical(resolved[:, 1], self.SIZE_CATEGORIES),
+            'breed_lineage': categorical(resolved[:, 2], self.LINEAGE_CATEGORIES),
+        }, index=kind_cd.index)
+
+    def attach(self, df, column='kind_cd'):
+        """
+        데이터프레임에 표준 품종명과 품종 그룹 컬럼 추가
+
+        Parameters:
+        df (pandas.DataFrame): kind_cd 컬럼이 있는 데이터프레임
+        column (str): 품종 표기 컬럼
+
+        Returns:
+        pandas.DataFrame: breed_canonical, breed_size, breed_lineage 컬럼이 추가된 데이터프레임
+        """
+        groups = self.canonicalize(df[column])
+        for name in groups.columns:
+            df[name] = groups[name]
+
+        matched = groups['breed_lineage'] != '미상'
+        logger.info(f"품종 표준화: 고유 표기 {df[column].nunique()}개 -> 표준 품종 {groups['breed_canonical'].nunique()}개, "
+                    f"사전 일치 {int(matched.sum())}/{len(df)} 행")
+        return df
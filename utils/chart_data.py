@@ -0,0 +1,196 @@
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+class ChartData:
+    """
+    차트로 보내기 전에 데이터를 작은 집계로 줄이는 클래스
+
+    히스토그램은 NumPy로 미리 구간 집계하고, 긴 시계열은 LTTB로 점 수를 줄이며,
+    범주가 많으면 상위 범주 외에는 '그 외'로 묶어 브라우저로 보내는 데이터 크기를 제한합니다.
+    """
+
+    # 실제 범주 '기타'(동물 종류, 처리 결과 등)와 구분되는 이름
+    OTHER_LABEL = '그 외'
+
+    # 현재 스크립트 실행(세션 스레드)에서 그린 차트 수와 직렬화 크기
+    _payload = threading.local()
+
+    @staticmethod
+    def histogram(values, bins=20, value_range=None):
+        """
+        값 배열을 NumPy로 구간 집계
+
+        Parameters:
+        values (array-like): 값 (결측/무한값 제외)
+        bins (int): 구간 수
+        value_range (tuple): (최소, 최대) 구간 범위 (기본: 값의 범위)
+
+        Returns:
+        pandas.DataFrame: bin_left, bin_right, bin_center, count 컬럼
+        """
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return pd.DataFrame(columns=['bin_left', 'bin_right', 'bin_center', 'count'])
+
+        counts, edges = np.histogram(values, bins=bins, range=value_range)
+        return pd.DataFrame({
+            'bin_left': edges[:-1],
+            'bin_right': edges[1:],
+            'bin_center': (edges[:-1] + edges[1:]) / 2,
+            'count': counts,
+        })
+
+    @staticmethod
+    def lttb_indices(x, y, threshold):
+        """
+        Largest-Triangle-Three-Buckets 방식으로 모양을 유지하며 남길 점의 위치 선택
+
+        Parameters:
+        x (numpy.ndarray): 정렬된 x 값 (숫자)
+        y (numpy.ndarray): y 값
+        threshold (int): 남길 점 수 (3 이상)
+
+        Returns:
+        numpy.ndarray: 남길 점의 위치 (처음과 마지막 점 포함)
+        """
+        n = len(x)
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        # 처음/마지막 점을 제외한 나머지를 threshold-2개 구간으로 나눔
+        edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+        selected = np.empty(threshold, dtype=np.int64)
+        selected[0], selected[-1] = 0, n - 1
+        previous = 0
+        for i in range(threshold - 2):
+            start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+            # 다음 구간 평균점 (마지막 구간은 마지막 점)
+            next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+            avg_x = x[next_start:next_end].mean() if next_end > next_start else x[-1]
+            avg_y = y[next_start:next_end].mean() if next_end > next_start else y[-1]
+
+            # 이전 선택점-후보점-다음 구간 평균점이 이루는 삼각형 넓이가 가장 큰 후보 선택
+            area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                          - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+            previous = start + int(np.nanargmax(area)) if len(area) else start
+            selected[i + 1] = previous
+        return selected
+
+    @staticmethod
+    def downsample(df, x, y, max_points=500, group=None):
+        """
+        시계열 데이터프레임을 그룹별로 LTTB 다운샘플링
+
+        Parameters:
+        df (pandas.DataFrame): x 기준으로 그릴 데이터
+        x (str): x 컬럼명 (숫자 또는 날짜)
+        y (str): y 컬럼명
+        max_points (int): 그룹별 최대 점 수
+        group (str): 그룹 컬럼명 (None이면 전체 한 계열)
+
+        Returns:
+        pandas.DataFrame: 줄어든 데이터프레임
+        """
+        if df.empty:
+            return df
+
+        def reduce(part):
+            if len(part) <= max_points:
+                return part
+            part = part.sort_values(x)
+            x_values = part[x]
+            if pd.api.types.is_datetime64_any_dtype(x_values):
+                x_values = x_values.astype('int64')
+            keep = ChartData.lttb_indices(x_values.to_numpy(dtype=float),
+                                          part[y].to_numpy(dtype=float), max_points)
+            return part.iloc[keep]
+
+        if group is None:
+            return reduce(df).reset_index(drop=True)
+        parts = [reduce(part) for _, part in df.groupby(group, sort=False, observed=True)]
+        return pd.concat(parts, ignore_index=True)
+
+    @staticmethod
+    def top_n(counts, n=8, other_label=None):
+        """
+        상위 n개 범주만 남기고 나머지는 '그 외'로 합침
+
+        Parameters:
+        counts (pandas.Series): 범주 -> 건수 (value_counts 결과 등)
+        n (int): 남길 범주 수
+        other_label (str): 나머지 범주 이름 (기본: '그 외')
+
+        Returns:
+        pandas.Series: 최대 n+1개 범주의 건수
+        """
+        counts = counts[counts > 0].sort_values(ascending=False)
+        if len(counts) <= n + 1:
+            return counts
+
+        other_label = other_label or ChartData.OTHER_LABEL
+        top = counts.iloc[:n]
+        top.index = top.index.astype(object)
+        other = counts.iloc[n:].sum()
+        if other_label in top.index:
+            top[other_label] += other
+            return top
+        return pd.concat([top, pd.Series({other_label: other})]).rename(counts.name)
+
+    @staticmethod
+    def show(fig, **kwargs):
+        """
+        차트를 표시하고 직렬화 크기를 현재 실행의 전송량에 합산
+
+        Parameters:
+        fig (plotly.graph_objects.Figure): 표시할 차트
+        kwargs: st.plotly_chart 추가 인자
+        """
+        captured = getattr(ChartData._payload, 'captured', None)
+        if captured is not None:
+            captured.append(fig)
+            return
+
+        size = len(fig.to_json())
+        ChartData._payload.charts = getattr(ChartData._payload, 'charts', 0) + 1
+        ChartData._payload.bytes = getattr(ChartData._payload, 'bytes', 0) + size
+        kwargs.setdefault('use_container_width', True)
+        st.plotly_chart(fig, **kwargs)
+
+    @staticmethod
+    @contextmanager
+    def capture():
+        """
+        블록 안에서 show로 그린 차트를 화면에 표시하지 않고 목록으로 모음 (정적 보고서 생성용)
+
+        Returns:
+        list: 그린 순서대로 모인 plotly Figure 목록
+        """
+        previous = getattr(ChartData._payload, 'captured', None)
+        ChartData._payload.captured = figures = []
+        try:
+            yield figures
+        finally:
+            ChartData._payload.captured = previous
+
+    @staticmethod
+    def reset_payload():
+        """스크립트 실행 시작 시 전송량 집계 초기화"""
+        ChartData._payload.charts = 0
+        ChartData._payload.bytes = 0
+
+    @staticmethod
+    def payload_summary():
+        """
+        현재 실행에서 그린 차트 수와 전송량
+
+        Returns:
+        tuple: (차트 수, 바이트 수)
+        """
+        return getattr(ChartData._payload, 'charts', 0), getattr(ChartData._payload, 'bytes', 0)
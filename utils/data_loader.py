@@ -1,19 +1,85 @@
+import os
+import io
+import glob
+import hashlib
+import datetime
+import numpy as np
 import pandas as pd
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 변환된 Excel 데이터(열 기반 Arrow 파일) 캐시 위치
+EXCEL_CACHE_DIR = os.environ.get('ANIMAL_CACHE_DIR', os.path.join('data', '.cache'))
+
 class DataLoader:
     """데이터 로드를 담당하는 클래스"""
     
+    # 자유 텍스트 컬럼 (문자열 저장 방식 변경 대상)
+    TEXT_COLUMNS = ['happen_place', 'care_addr', 'special_mark', 'kind_cd', 'color_cd', 'care_nm']
+    
+    # Excel 읽기 스키마: 날짜(YYYYMMDD)와 번호 컬럼은 문자열로 읽어 지수 표기/소수점 손실 방지
+    EXCEL_DATE_COLUMNS = ['happen_dt', 'notice_sdt', 'notice_edt']
+    EXCEL_CODE_COLUMNS = ['desertion_no', 'notice_no', 'care_tel', 'officetel']
+    
+    # 캐시 형식이 바뀌면 올려서 이전 캐시를 무시
+    EXCEL_CACHE_VERSION = 2
+    
+    # 디스크에 남겨 둘 Excel 변환 캐시 파일 수 (오래 쓰지 않은 것부터 삭제)
+    MAX_EXCEL_CACHE_FILES = 8
+    
+    @staticmethod
+    def calamine_available():
+        """python-calamine(Rust 기반 Excel 리더) 설치 여부 확인"""
+        try:
+            import python_calamine  # noqa: F401
+            return True
+        except ImportError:
+            return False
+    
+    @staticmethod
+    def arrow_available():
+        """pyarrow 설치 여부 확인"""
+        try:
+            import pyarrow  # noqa: F401
+            return True
+        except ImportError:
+            return False
+    
+    @staticmethod
+    def apply_string_storage(df, string_storage=None, columns=None):
+        """
+        문자열 컬럼을 지정한 저장 방식(StringDtype)으로 변환
+        
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        string_storage (str): 'pyarrow'(Arrow 기반) 또는 'python', None이면 변환하지 않음
+        columns (list): 변환할 컬럼 목록 (기본: TEXT_COLUMNS)
+        
+        Returns:
+        pandas.DataFrame: 문자열 컬럼이 변환된 데이터프레임
+        """
+        if not string_storage:
+            return df
+        if string_storage == 'pyarrow' and not DataLoader.arrow_available():
+            logger.warning("pyarrow가 설치되어 있지 않아 기본 문자열 저장 방식을 사용합니다.")
+            return df
+        
+        dtype = pd.StringDtype(string_storage)
+        for col in (columns if columns is not None else DataLoader.TEXT_COLUMNS):
+            if col in df.columns and df[col].dtype != dtype:
+                df[col] = df[col].astype(dtype)
+        return df
+    
     @staticmethod
-    def load_from_file(file_path):
+    def load_from_file(file_path, string_storage=None):
         """
         파일에서 데이터를 로드
         
         Parameters:
         file_path (str): 데이터 파일 경로
+        string_storage (str): 자유 텍스트 컬럼 저장 방식 ('pyarrow' 등, 기본: 변환 안 함)
         
         Returns:
         pandas.DataFrame: 로드된 데이터프레임
@@ -22,11 +88,13 @@ class DataLoader:
             if file_path.endswith('.csv'):
                 df = pd.read_csv(file_path)
             elif file_path.endswith(('.xls', '.xlsx')):
-                df = pd.read_excel(file_path)
+                with open(file_path, 'rb') as f:
+                    df = DataLoader.load_excel(f.read())
             else:
                 logger.error(f"지원하지 않는 파일 형식: {file_path}")
                 return None
                 
+            df = DataLoader.apply_string_storage(df, string_storage)
             logger.info(f"데이터 로드 완료: {len(df)} 행, {len(df.columns)} 열")
             return df
             
@@ -35,12 +103,13 @@ class DataLoader:
             return None
     
     @staticmethod
-    def load_from_uploaded_file(uploaded_file):
+    def load_from_uploaded_file(uploaded_file, string_storage=None):
         """
         Streamlit에서 업로드된 파일 로드
         
         Parameters:
         uploaded_file: Streamlit의 업로드된 파일 객체
+        string_storage (str): 자유 텍스트 컬럼 저장 방식 ('pyarrow' 등, 기본: 변환 안 함)
         
         Returns:
         pandas.DataFrame: 로드된 데이터프레임
@@ -51,14 +120,121 @@ class DataLoader:
             if file_type == 'csv':
                 df = pd.read_csv(uploaded_file)
             elif file_type in ['xls', 'xlsx']:
-                df = pd.read_excel(uploaded_file)
+                df = DataLoader.load_excel(uploaded_file.getvalue())
             else:
                 logger.error(f"지원하지 않는 파일 형식: {file_type}")
                 return None
                 
+            df = DataLoader.apply_string_storage(df, string_storage)
             logger.info(f"업로드된 데이터 로드 완료: {len(df)} 행, {len(df.columns)} 열")
             return df
             
         except Exception as e:
             logger.error(f"업로드된 데이터 로드 중 오류 발생: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    @staticmethod
+    def load_excel(data, cache_dir=None):
+        """
+        Excel 파일을 선언된 스키마로 읽고 변환 결과를 열 기반 파일로 캐시
+        
+        같은 내용의 통합 문서는 다시 파싱하지 않고 캐시에서 바로 읽습니다.
+        python-calamine이 있으면 시트를 한 번에 읽어 컬럼 단위로 나누고, 없으면 pandas 기본 엔진을 사용합니다.
+        캐시 파일은 최근에 쓴 MAX_EXCEL_CACHE_FILES개만 유지합니다.
+        
+        Parameters:
+        data (bytes): Excel 파일 내용
+        cache_dir (str): 캐시 디렉토리 (기본: data/.cache)
+        
+        Returns:
+        pandas.DataFrame: 첫 번째 시트 데이터프레임
+        """
+        cache_path = None
+        if DataLoader.arrow_available():
+            digest = hashlib.sha1(data).hexdigest()[:16]
+            cache_path = os.path.join(cache_dir or EXCEL_CACHE_DIR,
+                                      f"excel_{digest}_v{DataLoader.EXCEL_CACHE_VERSION}.arrow")
+            if os.path.exists(cache_path):
+                logger.info(f"Excel 변환 캐시 사용: {cache_path}")
+                # 최근에 쓴 캐시로 표시 (정리 순서 기준)
+                os.utime(cache_path)
+                return pd.read_feather(cache_path)
+        
+        if DataLoader.calamine_available():
+            df = DataLoader._read_excel_rows(data)
+        else:
+            # 날짜 컬럼은 날짜 셀이 문자열('2023-01-05 00:00:00')로 바뀌지 않도록 그대로 읽음
+            df = pd.read_excel(io.BytesIO(data), dtype={col: str for col in DataLoader.EXCEL_CODE_COLUMNS})
+        df = DataLoader._apply_excel_schema(df)
+        
+        if cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                df.to_feather(tmp_path)
+                os.replace(tmp_path, cache_path)
+                DataLoader._prune_excel_cache(os.path.dirname(cache_path))
+            except Exception as e:
+                # 한 컬럼에 숫자/문자가 섞여 Arrow로 변환할 수 없는 경우 등은 캐시 없이 진행
+                logger.warning(f"Excel 변환 결과 캐시 저장 실패: {e}")
+        return df
+    
+    @staticmethod
+    def _prune_excel_cache(cache_dir):
+        """오래된 Excel 변환 캐시 파일 정리 (최근에 쓴 MAX_EXCEL_CACHE_FILES개만 유지)"""
+        files = sorted(glob.glob(os.path.join(cache_dir, 'excel_*.arrow')), key=os.path.getmtime, reverse=True)
+        for path in files[DataLoader.MAX_EXCEL_CACHE_FILES:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _read_excel_rows(data):
+        """python-calamine으로 첫 번째 시트를 한 번에 읽어 2차원 배열의 열 단위로 컬럼을 만듦"""
+        from python_calamine import CalamineWorkbook
+        
+        sheet = CalamineWorkbook.from_filelike(io.BytesIO(data)).get_sheet_by_index(0)
+        rows = sheet.to_python()
+        if not rows:
+            return pd.DataFrame()
+        header = [str(name) for name in rows[0]]
+        grid = np.array(rows[1:], dtype=object).reshape(-1, len(header))
+        # 빈 셀('')은 결측값으로
+        grid[grid == ''] = None
+        return pd.DataFrame({name: pd.Series(grid[:, i], dtype=object) for i, name in enumerate(header)})
+    
+    @staticmethod
+    def _apply_excel_schema(df):
+        """
+        Excel에서 읽은 컬럼을 CSV와 같은 형태로 정리
+        
+        날짜/번호 컬럼은 정수 값이면 소수점 없는 문자열로, 날짜 셀은 YYYYMMDD 문자열로 변환하고
+        나머지 텍스트 컬럼의 숫자 셀도 문자열로 맞춥니다.
+        """
+        df.columns = [str(col) for col in df.columns]
+        for col in df.columns:
+            values = df[col]
+            if col in DataLoader.EXCEL_DATE_COLUMNS or col in DataLoader.EXCEL_CODE_COLUMNS:
+                if pd.api.types.is_datetime64_any_dtype(values):
+                    df[col] = values.dt.strftime('%Y%m%d')
+                    continue
+                # 숫자/문자 셀과 섞인 날짜 셀(datetime.date, datetime.datetime)도 YYYYMMDD로 맞춤
+                is_date = np.fromiter((isinstance(value, datetime.date) for value in values),
+                                      dtype=bool, count=len(values))
+                if is_date.any():
+                    values = values.astype(object)
+                    values[is_date] = [value.strftime('%Y%m%d') for value in values[is_date]]
+                numbers = pd.to_numeric(values, errors='coerce')
+                integral = numbers.notna() & (numbers % 1 == 0)
+                text = values.astype(object).where(values.isna(), values.astype(str))
+                text[integral] = numbers[integral].astype('int64').astype(str)
+                df[col] = text
+            elif values.dtype == object:
+                # 숫자만 적힌 셀이 섞여 있으면 문자열로 통일 (숫자 컬럼은 그대로)
+                numbers = pd.to_numeric(values, errors='coerce')
+                if numbers.isna().sum() > values.isna().sum():
+                    df[col] = values.where(values.isna(), values.astype(str))
+                else:
+                    df[col] = numbers
+        return df
@@ -1,8 +1,16 @@
 import pandas as pd
 import numpy as np
-import re
 import logging
-from utils.utils import DateUtils, LocationUtils, TextUtils
+from utils.utils import DateUtils, LocationUtils, TextUtils, BitmaskUtils
+from utils.rule_set import RuleSet
+from utils.data_loader import DataLoader
+from utils.outcome import OutcomeAnalyzer
+from utils.length_of_stay import LengthOfStayAnalyzer
+from utils.dedup import DuplicateDetector
+from utils.fallback_classifier import FallbackClassifier
+from utils.data_quality import DataQualityValidator
+from utils.shelter_registry import ShelterRegistry
+from utils.breed_canonicalizer import BreedCanonicalizer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -10,111 +18,103 @@ logger = logging.getLogger(__name__)
 class AnimalDataProcessor:
     """유기동물 데이터 전처리를 담당하는 클래스"""
     
-    def __init__(self, df):
+    # 전처리 단계 (실행 순서대로 메서드명, 단계명)
+    PREPROCESS_STAGES = [
+        ('_validate_data', '데이터 품질 검사'),
+        ('_select_necessary_columns', '필요 컬럼 선택'),
+        ('_convert_date_columns', '날짜 변환'),
+        ('_extract_time_components', '시간 구성요소 추출'),
+        ('_process_animal_type_and_status', '동물 종류 및 상태 처리'),
+        ('_process_color_information', '색상 정보 처리'),
+        ('_process_location_information', '위치 정보 처리'),
+        ('_match_shelters', '보호소 등록 정보 연결'),
+        ('_process_weight_information', '체중 정보 처리'),
+        ('_process_breed_information', '품종 정보 처리'),
+        ('_process_outcome_information', '보호 결과 및 체중 구간 분류'),
+        ('_process_length_of_stay', '보호 기간 및 나이 구간 계산'),
+        ('_detect_duplicates', '중복 의심 기록 탐지'),
+        ('_apply_string_storage', '문자열 저장 방식 적용'),
+        ('_set_date_index', '날짜 인덱스 설정'),
+    ]
+    
+    def __init__(self, df, string_storage=None, ml_fallback=False):
         """
         초기화 함수
         
         Parameters:
         df (pandas.DataFrame): 처리할 원본 데이터프레임
+        string_storage (str): 문자열 컬럼 저장 방식 ('pyarrow'면 Arrow 기반, 기본: 변환 안 함)
+        ml_fallback (bool): 키워드로 분류되지 않은 장소/색상을 학습 모델로 보조 분류할지 여부
         """
         self.df = df.copy()
-        
-        # 색상 및 패턴 키워드 통합 사전
-        self.COLOR_PATTERNS = {
-            # 기본 색상
-            '검정': ['검정', '검정색', '검은색', '검', '흑색', '흑', '블랙'],
-            '흰색': ['흰색', '흰', '백색', '백', '하얀색', '아이보리', '크림색', '크림', '화이트'],
-            '갈색': ['갈색', '갈', '연갈색', '연갈', '황갈색', '황토색', '브라운', '밤갈색', '초콜릿색'],
-            '노랑': ['황색', '노랑', '노란색', '노랑색', '황', '금색', '옐로우', '누런색'],
-            '회색': ['회색', '회', '그레이', '그레이색'],
-            
-            # 무늬/패턴
-            '고등어무늬': ['고등어', '고등어색', '고등어태비'],
-            '치즈무늬': ['치즈', '치즈색', '치즈태비'],
-            '턱시도무늬': ['턱시도'],
-            '태비무늬': ['태비'],
-            '호피무늬': ['호피']
-        }
-        
-        # 색상 카테고리 정의
-        self.COLOR_TYPES = {
-            '단색': ['검정', '흰색', '갈색', '노랑', '회색'],
-            '무늬': ['고등어무늬', '치즈무늬', '턱시도무늬', '태비무늬', '호피무늬']
-        }
-        
-        # 장소 유형 매핑
-        self.PLACE_TYPE_MAPPING = {
-            '공공기관': ['소방서', '구청', '시청', '경찰서', '주민센터', '학교', '대학', '도서관', '우체국', '공공기관', '사무소', '청사', '센터'],
-            '상업시설': ['마트', '시장', '상가', '쇼핑', '편의점', '백화점', '매장', '가게', '식당', '카페', '음식점', '마을회관', '슈퍼'],
-            '주거지역': ['아파트', '주택', '빌라', '마을', '차', '단지', '동네', '오피스텔', '다세대'],
-            '도로변': ['로', '길', '도로', '거리', '대로', '번길', '버스', '버스정류장', '교차로', '사거리', '고가', '다리', '철길', '지하도'],
-            '공원': ['공원', '산책로', '광장', '정원', '산', '숲', '강', '하천', '계곡', '저수지', '호수', '유원지', '놀이터'],
-            '농촌지역': ['농장', '논', '밭', '과수원', '농지', '축사', '목장', '양식장', '비닐하우스', '창고'],
-            '공사장': ['공사장', '건설', '공사', '폐가', '폐건물', '공터', '빈터', '유휴지'],
-            '교통시설': ['역', '지하철', '기차', '고속도로', '휴게소', '주차장', '정류소', '환승센터', '공항', '철도'],
-            '종교시설': ['교회', '성당', '사찰', '절', '묘지', '납골당', '종교'],
-        }
-        
-        # 시설 특성 매핑
-        self.FACILITY_TYPE_MAPPING = {
-            '소방서': ['소방서', '119', '구조대', '안전센터'],
-            '병원': ['병원', '의원', '보건소', '진료소', '의료', '약국', '동물병원', '의료원'],
-            '관공서': ['시청', '구청', '동사무소', '주민센터', '관공서', '군청', '행정', '관리사무소', '공단', '공사'],
-            '버스정류장': ['버스', '정류장', '버스정류장', '터미널', '승강장'],
-            '교육시설': ['학교', '유치원', '어린이집', '대학교', '학원', '도서관', '연구소', '교육', '훈련원','대학'],
-            '복지시설': ['복지관', '경로당', '양로원', '보육원', '쉼터', '보호소', '재활원'],
-            '체육시설': ['체육관', '운동장', '구장', '경기장', '스포츠센터', '수영장', '헬스장', '골프장'],
-            '공원및녹지': ['공원', '놀이터', '광장', '정원', '산책로', '녹지', '휴식공간'],
-            '상업시설': ['상가', '시장', '마트', '슈퍼', '편의점', '매장', '백화점', '쇼핑', '상점'],
-            '식음료': ['식당', '카페', '음식점', '레스토랑', '주점', '호프', '분식'],
-            '주거시설': ['아파트', '주택', '빌라', '오피스텔', '다세대', '기숙사', '생활관'],
-            '산업시설': ['공장', '창고', '물류', '산업', '연구소', '단지'],
-            '철도시설': ['역', '기차역', '지하철역', '철도', '전철', '지하철', 'KTX', 'SRT', '광역철도'],
-            '터미널': ['터미널', '고속버스', '시외버스', '환승센터', '공항'],
-            '기타': [],
-        }
-        
-        # 장소 유형 우선순위 정의
-        self.PRIORITY_ORDER = [
-            '공공기관', '상업시설', '교육시설', '병원', '종교시설', '복지시설', 
-            '공원', '주거지역', '농촌지역', '도로변', '교통시설', '공사장'
-        ]
+        self.string_storage = string_storage
+        self.ml_fallback = ml_fallback
+        
+        # 예외로 중단된 처리 (처리명, 오류 메시지)와 원본 기준 품질 문제 행 위치
+        self.stage_errors = []
+        self.quality_rows = {}
+        
+        # 프로세스 공유 규칙 (키워드 사전, 컴파일된 정규식, 우선순위 배열)
+        self.rules = RuleSet.current()
+        
+        # 기존 속성명 유지 (공유 규칙 객체를 참조만 함)
+        self.COLOR_PATTERNS = self.rules.color_patterns
+        self.COLOR_TYPES = self.rules.color_types
+        self.PLACE_TYPE_MAPPING = self.rules.place_type_mapping
+        self.FACILITY_TYPE_MAPPING = self.rules.facility_type_mapping
+        self.PRIORITY_ORDER = self.rules.priority_order
     
-    def preprocess_data(self):
+    def preprocess_data(self, progress_callback=None):
         """
         데이터 전처리 실행
         
+        Parameters:
+        progress_callback (callable): 각 단계 시작 전에 (단계 번호, 전체 단계 수, 단계명)으로 호출
+                                      (예외를 발생시키면 전처리를 중단)
+        
         Returns:
         pandas.DataFrame: 전처리된 데이터프레임
         """
         logger.info("데이터 전처리 시작")
         
-        # 1. 필요 컬럼만 선택
-        self._select_necessary_columns()
-        
-        # 2. 데이터 타입 변환 (날짜 처리)
-        self._convert_date_columns()
-        
-        # 3. 시간 구성요소 추출 (년, 월, 요일, 계절 등)
-        self._extract_time_components()
-        
-        # 4. 동물 종류 및 상태 처리
-        self._process_animal_type_and_status()
-        
-        # 5. 색상 정보 처리
-        self._process_color_information()
-        
-        # 6. 위치 정보 처리
-        self._process_location_information()
-        
-        # 7. 체중 정보 처리
-        self._process_weight_information()
-        
-        # 8. 품종 정보 처리
-        self._process_breed_information()
+        total = len(self.PREPROCESS_STAGES)
+        for step, (method_name, label) in enumerate(self.PREPROCESS_STAGES):
+            if progress_callback is not None:
+                progress_callback(step, total, label)
+            getattr(self, method_name)()
         
         logger.info("데이터 전처리 완료")
         return self.df
+    
+    def quality_report(self):
+        """
+        전처리 중 기록된 데이터 품질 보고서
+        
+        Returns:
+        dict: summary(검사 항목별 건수 데이터프레임), rows(검사 항목 -> 원본 기준 행 위치 배열),
+              stage_errors(오류로 중단된 처리 목록)
+        """
+        masks = self.df['quality_mask'] if 'quality_mask' in self.df.columns else pd.Series(dtype=np.uint16)
+        return {
+            'summary': DataQualityValidator.summary(masks),
+            'rows': self.quality_rows,
+            'stage_errors': list(self.stage_errors),
+        }
+    
+    def _record_error(self, label, error):
+        """처리 중 발생한 예외를 기록 (전처리는 계속 진행)"""
+        logger.error(f"{label} 중 오류 발생: {error}")
+        self.stage_errors.append((label, str(error)))
+    
+    def _validate_data(self):
+        """원본 값 기준 데이터 품질 검사 (날짜/체중/성별·중성화 코드/시도/색상 노이즈)"""
+        try:
+            masks = DataQualityValidator.validate(self.df, self.rules)
+            self.df['quality_mask'] = masks.to_numpy()
+            self.quality_rows = DataQualityValidator.report(masks)
+            logger.info(f"데이터 품질 검사 완료: 문제 행 {int((masks != 0).sum())}개")
+        except Exception as e:
+            self._record_error("데이터 품질 검사", e)
 
     def _select_necessary_columns(self):
         """불필요한 컬럼 제거"""
@@ -125,7 +125,7 @@ class AnimalDataProcessor:
                 self.df = self.df.drop(columns=columns_to_drop)
                 logger.info(f"불필요한 컬럼 {len(columns_to_drop)}개 제거 완료")
         except Exception as e:
-            logger.error(f"컬럼 제거 중 오류 발생: {e}")
+            self._record_error("컬럼 제거", e)
     
     def _convert_date_columns(self):
         """날짜 컬럼 처리"""
@@ -134,7 +134,7 @@ class AnimalDataProcessor:
             self.df = DateUtils.convert_date_columns(self.df, format='%Y%m%d')
             logger.info("날짜 컬럼 변환 완료")
         except Exception as e:
-            logger.error(f"날짜 컬럼 처리 중 오류 발생: {e}")
+            self._record_error("날짜 컬럼 처리", e)
 
     def _extract_time_components(self):
         """날짜 컬럼에서 시간 구성요소(년, 월, 요일, 계절) 추출"""
@@ -148,7 +148,7 @@ class AnimalDataProcessor:
             
             logger.info("시간 구성요소 추출 완료")
         except Exception as e:
-            logger.error(f"시간 구성요소 추출 중 오류 발생: {e}")
+            self._record_error("시간 구성요소 추출", e)
     
     def _process_animal_type_and_status(self):
         """동물 종류 및 상태 정보 처리"""
@@ -175,7 +175,7 @@ class AnimalDataProcessor:
                 self.df = self.process_animal_status(self.df)
                 logger.info("성별 및 중성화 정보 처리 완료")
         except Exception as e:
-            logger.error(f"동물 종류 및 상태 처리 중 오류 발생: {e}")
+            self._record_error("동물 종류 및 상태 처리", e)
     
     def process_animal_status(self, df, sex_col='sex_cd', neuter_col='neuter_yn'):
         """성별 및 중성화 정보 처리 후 컬럼명을 한글로 변경"""
@@ -206,7 +206,7 @@ class AnimalDataProcessor:
             
             return df
         except Exception as e:
-            logger.error(f"동물 상태 처리 중 오류 발생: {e}")
+            self._record_error("동물 상태 처리", e)
             return df  # 오류 발생 시 원본 반환
     
     def _process_color_information(self):
@@ -214,16 +214,21 @@ class AnimalDataProcessor:
         try:
             if 'color_cd' in self.df.columns:
                 # 색상 필터링: ~동, ~구, ~시, ~로 포함 되는 경우 미상으로 처리
-                noise_pattern = r'(동|구|시|리|면|부근|길)'
-                self.df['color_cd'] = self.df['color_cd'].apply(
-                    lambda x: re.sub(f'.*{noise_pattern}.*', '확인필요', x) if isinstance(x, str) and re.search(noise_pattern, x) else x
-                )
+                noise_mask = self.df['color_cd'].str.contains(self.rules.color_noise_pattern, na=False)
+                self.df['color_cd'] = self.df['color_cd'].mask(noise_mask, '확인필요')
                 
                 # 색상 처리 함수 적용
                 self.df = self.process_color_column(self.df, 'color_cd')
+                
+                # 색상 키워드가 없는 값은 학습 모델로 보조 분류 (color_cat_inferred로 구분)
+                if self.ml_fallback:
+                    self.df['color_cat'], self.df['color_cat_inferred'] = FallbackClassifier.fill(
+                        self.df['color_cd'], self.df['color_cat'], 'color_cat', '확인필요', self.rules.version
+                    )
+                    self.df['color_type'] = self.df['color_cat'].str.split('(').str[0]
                 logger.info("색상 정보 처리 완료")
         except Exception as e:
-            logger.error(f"색상 정보 처리 중 오류 발생: {e}")
+            self._record_error("색상 정보 처리", e)
     
     def extract_colors_from_text(self, text):
         """텍스트에서 색상 키워드를 추출하여 표준화된 색상명 반환"""
@@ -234,13 +239,13 @@ class AnimalDataProcessor:
         found_colors = []
         
         # 여러 구분자로 텍스트 분리
-        parts = re.split(r'[,/·\s]+', text)
+        parts = RuleSet.COLOR_SPLIT_PATTERN.split(text)
         parts = [part.strip() for part in parts if part.strip()]
         
         # 각 부분에서 색상 찾기
         for part in parts:
-            for color_name, keywords in self.COLOR_PATTERNS.items():
-                if any(keyword.lower() in part for keyword in keywords):
+            for color_name, keywords in self.rules.color_keywords:
+                if any(keyword in part for keyword in keywords):
                     if color_name not in found_colors:
                         found_colors.append(color_name)
         
@@ -252,8 +257,8 @@ class AnimalDataProcessor:
             return '확인필요'
         
         # 분류를 위한 색상 그룹 분류
-        basic_colors = [c for c in colors if c in self.COLOR_TYPES['단색']]
-        pattern_colors = [c for c in colors if c in self.COLOR_TYPES['무늬']]
+        basic_colors = [c for c in colors if c in self.rules.basic_colors]
+        pattern_colors = [c for c in colors if c in self.rules.pattern_colors]
         
         # 무늬가 있는 경우 우선 처리
         if pattern_colors:
@@ -280,23 +285,25 @@ class AnimalDataProcessor:
     
     def process_color_column(self, df, color_column):
         """데이터프레임의 색상 컬럼을 처리하여 새로운 컬럼 추가"""
-        # 추출된 색상 목록 컬럼 추가 (리스트 형태로 저장)
-        df['color_list_raw'] = df[color_column].apply(self.extract_colors_from_text)
+        # 고유 색상 문자열마다 한 번씩만 분류한 뒤 전체 행으로 확장
+        codes, uniques = pd.factorize(df[color_column])
+        color_table = pd.DataFrame({'color_list_raw': [self.extract_colors_from_text(x) for x in uniques] + [[]]})
         
-        # 색상 카테고리 컬럼 추가 (리스트를 사용)
-        df['color_cat'] = df['color_list_raw'].apply(self.identify_color_category)
+        # 색상 카테고리 (리스트를 사용)
+        color_table['color_cat'] = color_table['color_list_raw'].apply(self.identify_color_category)
         
         # 추출된 색상 목록을 /로 구분된 문자열로 변환 (표시용)
-        df['color_list'] = df['color_list_raw'].apply(
+        color_table['color_list'] = color_table['color_list_raw'].apply(
             lambda colors: '/'.join(colors) if colors else '확인필요'
         )
         
-        # 단색/무늬/이색/삼색 등 분류 컬럼 추가
-        df['color_type'] = df['color_cat'].apply(
+        # 단색/무늬/이색/삼색 등 분류
+        color_table['color_type'] = color_table['color_cat'].apply(
             lambda x: x.split('(')[0] if '(' in x else x
         )
         
-        df = df.drop(columns=['color_list_raw'])
+        for col in ['color_cat', 'color_list', 'color_type']:
+            df[col] = color_table[col].to_numpy()[codes]
         
         return df
     
@@ -308,21 +315,17 @@ class AnimalDataProcessor:
             
         location_text = str(location_text)
         
-        # 일치하는 모든 장소 유형 찾기
-        matched_types = []
-        for place_type, keywords in self.PLACE_TYPE_MAPPING.items():
-            for keyword in keywords:
-                if keyword in location_text:
-                    matched_types.append(place_type)
-                    break
-        
-        # 우선순위 높은 순으로 반환
-        for priority_type in self.PRIORITY_ORDER:
-            if priority_type in matched_types:
-                return priority_type
+        # 일치하는 장소 유형 중 우선순위가 가장 높은 것 선택
+        best_rank = len(self.rules.priority_order)
+        best_type = "기타"
+        for idx, (place_type, keywords) in enumerate(self.rules.place_keywords):
+            rank = self.rules.priority_rank[idx]
+            if rank < best_rank and any(keyword in location_text for keyword in keywords):
+                best_rank = rank
+                best_type = place_type
         
         # 일치하는 타입이 없으면 기타
-        return "기타"
+        return best_type
     
     def classify_location(self, location_text):
         """입력 텍스트에서 장소 정보 종합 분류"""
@@ -339,12 +342,10 @@ class AnimalDataProcessor:
         place_type = self.get_priority_place_type(location_text)
         
         # 시설 특성 결정 
-        facility_types = []
-        for facility_type, keywords in self.FACILITY_TYPE_MAPPING.items():
-            for keyword in keywords:
-                if keyword in location_text:
-                    facility_types.append(facility_type)
-                    break
+        facility_types = [
+            facility_type for facility_type, keywords in self.rules.facility_keywords
+            if any(keyword in location_text for keyword in keywords)
+        ]
         
         result = {
             "original_text": location_text,
@@ -354,23 +355,62 @@ class AnimalDataProcessor:
         return result
     
     
+    def get_place_mask(self, location_text):
+        """입력 텍스트와 일치하는 모든 장소 유형의 비트마스크 (비트 순서: PLACE_TYPE_MAPPING)"""
+        mask = 0
+        for bit, (_, keywords) in enumerate(self.rules.place_keywords):
+            if any(keyword in location_text for keyword in keywords):
+                mask |= 1 << bit
+        return mask
+    
+    def get_facility_mask(self, location_text):
+        """입력 텍스트와 일치하는 모든 시설 특성의 비트마스크 (일치 없으면 '기타' 비트)"""
+        mask = 0
+        for bit, (_, keywords) in enumerate(self.rules.facility_keywords):
+            if any(keyword in location_text for keyword in keywords):
+                mask |= 1 << bit
+        return mask or BitmaskUtils.bits_of(['기타'], self.rules.facility_names)
+    
     def classify_locations_in_dataframe(self, df, location_column):
         """
         데이터프레임의 장소 컬럼을 분류하여 장소 유형과 시설 특성 컬럼 추가
+        
+        여러 개가 일치할 수 있는 장소 유형/시설 특성은 라벨당 비트 하나인 정수 비트마스크
+        (place_mask, facility_mask)로 저장하며, 표시할 때는 BitmaskUtils.decode로 변환합니다.
+        분류에 쓴 라벨 순서는 df.attrs에 함께 기록하므로 나중에 규칙이 바뀌어도 그대로 해석할 수 있습니다.
         """
-        # 장소 유형 추가
-        df['place_type'] = df[location_column].apply(
-            lambda x: self.get_priority_place_type(str(x)) if pd.notna(x) else '기타'
+        # 장소 유형 추가 (고유 장소 문자열마다 한 번씩만 분류)
+        df['place_type'] = TextUtils.map_unique(
+            df[location_column], lambda x: self.get_priority_place_type(str(x)) if pd.notna(x) else '기타'
         )
-        # print(df)
         
-        # 시설 특성 추가
-        df['facility_types'] = df[location_column].apply(
-            lambda x: ', '.join(self.classify_location(str(x))['facility_types']) if pd.notna(x) else '기타'
-        )
+        # 장소 유형 전체 일치 및 시설 특성 비트마스크 추가
+        other_mask = BitmaskUtils.bits_of(['기타'], self.rules.facility_names)
+        df['place_mask'] = TextUtils.map_unique(
+            df[location_column], lambda x: self.get_place_mask(str(x)) if pd.notna(x) else 0
+        ).astype(BitmaskUtils.dtype_for(len(self.rules.place_types)))
+        df['facility_mask'] = TextUtils.map_unique(
+            df[location_column], lambda x: self.get_facility_mask(str(x)) if pd.notna(x) else other_mask
+        ).astype(BitmaskUtils.dtype_for(len(self.rules.facility_names)))
+        BitmaskUtils.record_labels(df, 'place_mask', self.rules.place_types)
+        BitmaskUtils.record_labels(df, 'facility_mask', self.rules.facility_names)
         
         return df
     
+    def _mark_inferred_place_types(self):
+        """학습 모델로 추정한 장소 유형을 place_mask에도 반영 ('기타' 비트는 지움)"""
+        inferred = self.df['place_type_inferred'].to_numpy(dtype=bool)
+        if not inferred.any():
+            return
+        labels = BitmaskUtils.labels_of(self.df, 'place_mask', self.rules.place_types)
+        positions = pd.Index(labels).get_indexer(self.df['place_type'].to_numpy(dtype=object)[inferred])
+        rows, positions = np.flatnonzero(inferred)[positions >= 0], positions[positions >= 0]
+
+        masks = self.df['place_mask'].to_numpy().copy()
+        one, other = masks.dtype.type(1), masks.dtype.type(BitmaskUtils.bits_of(['기타'], labels))
+        masks[rows] = (masks[rows] & ~other) | np.left_shift(one, positions.astype(masks.dtype))
+        self.df['place_mask'] = masks
+    
     def _process_location_information(self):
         """위치 정보 처리"""
         try:
@@ -382,6 +422,13 @@ class AnimalDataProcessor:
             if location_column:
                 # 장소 유형 및 시설 특성 분류 (내부 메서드 활용)
                 self.df = self.classify_locations_in_dataframe(self.df, location_column)
+                
+                # 키워드가 없는 장소는 학습 모델로 보조 분류 (place_type_inferred로 구분)
+                if self.ml_fallback:
+                    self.df['place_type'], self.df['place_type_inferred'] = FallbackClassifier.fill(
+                        self.df[location_column], self.df['place_type'], 'place_type', '기타', self.rules.version
+                    )
+                    self._mark_inferred_place_types()
                 logger.info(f"{location_column} 컬럼에서 장소 유형 및 시설 특성 분류 완료")
             
             # 2. 보호소 주소 처리 (care_addr)
@@ -391,29 +438,101 @@ class AnimalDataProcessor:
                 logger.info("care_addr 컬럼에서 시도, 시군구, 권역 정보 추출 완료")
                 
         except Exception as e:
-            logger.error(f"위치 정보 처리 중 오류 발생: {e}")
+            self._record_error("위치 정보 처리", e)
     
     
+    def _match_shelters(self):
+        """보호소명을 등록 보호소(animal_care_center.csv)와 연결하고 표준 보호소명/주소 추가"""
+        try:
+            registry = ShelterRegistry.current()
+            if registry is not None and 'care_nm' in self.df.columns:
+                self.df = registry.attach(self.df, 'care_nm')
+                logger.info("보호소 등록 정보 연결 완료")
+        except Exception as e:
+            self._record_error("보호소 등록 정보 연결", e)
+    
     def _process_breed_information(self):
         """품종 정보 처리"""
         try:
             if 'kind_cd' in self.df.columns:
                 # utils.py의 TextUtils 클래스 활용
-                self.df['breed'] = self.df['kind_cd'].apply(TextUtils.extract_breed)
+                self.df['breed'] = TextUtils.extract_breed_series(self.df['kind_cd'])
+                # 표기 변형을 모은 표준 품종명과 품종 그룹 (크기, 믹스 여부)
+                self.df = BreedCanonicalizer.current().attach(self.df, 'kind_cd')
                 logger.info("품종 정보 처리 완료")
         except Exception as e:
-            logger.error(f"품종 정보 처리 중 오류 발생: {e}")
+            self._record_error("품종 정보 처리", e)
     
     def _process_weight_information(self):
         """체중 정보 처리"""
         try:
             if 'weight' in self.df.columns:
                 # utils.py의 TextUtils 클래스 활용
-                self.df['weight'] = self.df['weight'].apply(TextUtils.extract_weight)
+                self.df['weight'] = TextUtils.extract_weight_series(self.df['weight'])
                 logger.info("체중 정보 처리 완료")
         except Exception as e:
-            logger.error(f"체중 정보 처리 중 오류 발생: {e}")
+            self._record_error("체중 정보 처리", e)
         
     
 
     
+    
+    def _process_outcome_information(self):
+        """보호 결과 및 체중 구간 정보 처리"""
+        try:
+            if 'process_state' in self.df.columns:
+                self.df = OutcomeAnalyzer.assign_outcome(self.df)
+                logger.info("보호 결과 분류 완료")
+            
+            if 'weight' in self.df.columns:
+                self.df = OutcomeAnalyzer.assign_weight_band(self.df)
+                logger.info("체중 구간 분류 완료")
+        except Exception as e:
+            self._record_error("보호 결과 처리", e)
+    
+    def _process_length_of_stay(self):
+        """보호 기간(일), 중도절단 여부 및 나이 구간 계산"""
+        try:
+            if 'happen_dt' in self.df.columns:
+                self.df = LengthOfStayAnalyzer.derive_durations(self.df)
+                logger.info("보호 기간 계산 완료")
+            
+            if 'age' in self.df.columns:
+                self.df = LengthOfStayAnalyzer.assign_age_band(self.df)
+                logger.info("나이 구간 분류 완료")
+        except Exception as e:
+            self._record_error("보호 기간 계산", e)
+    
+    def _detect_duplicates(self):
+        """재공고/이송 등으로 중복 등록된 기록 탐지"""
+        try:
+            if 'happen_dt' in self.df.columns:
+                duplicates = DuplicateDetector().find_duplicates(self.df)
+                self.df['dup_group'] = duplicates['dup_group'].to_numpy()
+                self.df['is_duplicate'] = duplicates['is_duplicate'].to_numpy()
+                logger.info("중복 의심 기록 탐지 완료")
+        except Exception as e:
+            self._record_error("중복 의심 기록 탐지", e)
+    
+    def _apply_string_storage(self):
+        """원본 및 파생 문자열 컬럼을 지정한 저장 방식으로 변환"""
+        try:
+            if self.string_storage:
+                string_columns = [
+                    col for col in self.df.columns
+                    if (pd.api.types.is_object_dtype(self.df[col]) or pd.api.types.is_string_dtype(self.df[col]))
+                    and not isinstance(self.df[col].dtype, pd.CategoricalDtype)
+                ]
+                self.df = DataLoader.apply_string_storage(self.df, self.string_storage, string_columns)
+                logger.info(f"문자열 저장 방식 적용 완료: {self.string_storage}")
+        except Exception as e:
+            self._record_error("문자열 저장 방식 적용", e)
+    
+    def _set_date_index(self):
+        """발생일(happen_dt) 기준 정렬된 날짜 인덱스 설정"""
+        try:
+            if 'happen_dt' in self.df.columns:
+                self.df = DateUtils.set_date_index(self.df, 'happen_dt')
+                logger.info("날짜 인덱스 설정 완료")
+        except Exception as e:
+            self._record_error("날짜 인덱스 설정", e)
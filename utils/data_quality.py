@@ -0,0 +1,155 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.utils import TextUtils, BitmaskUtils
+from utils.rule_set import RuleSet
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class DataQualityValidator:
+    """
+    원본 데이터의 품질 문제를 한 번의 벡터 연산으로 검사하는 클래스
+
+    행마다 해당하는 검사 항목을 비트마스크(quality_mask)로 기록하므로
+    전처리 후에도 행과 함께 유지되며, 항목별 건수와 행 위치를 바로 계산할 수 있습니다.
+    """
+
+    # (검사 항목, 대상 컬럼, 설명) - 순서가 비트 순서
+    CHECKS = [
+        ('happen_dt_invalid', 'happen_dt', '날짜 변환 실패'),
+        ('notice_sdt_invalid', 'notice_sdt', '날짜 변환 실패'),
+        ('notice_edt_invalid', 'notice_edt', '날짜 변환 실패'),
+        ('weight_invalid', 'weight', '체중 변환 실패'),
+        ('weight_out_of_range', 'weight', '체중 범위 벗어남'),
+        ('sex_unknown', 'sex_cd', '알 수 없는 성별 코드'),
+        ('neuter_unknown', 'neuter_yn', '알 수 없는 중성화 코드'),
+        ('sido_missing', 'care_addr', '시도 추출 실패'),
+        ('color_noise', 'color_cd', '주소 형태의 색상 값'),
+    ]
+    LABELS = [name for name, _, _ in CHECKS]
+    DISPLAY_LABELS = [f'{column} {description}' for _, column, description in CHECKS]
+
+    DATE_FORMAT = '%Y%m%d'
+
+    # 정상으로 볼 체중 범위(kg, 경계 포함)
+    WEIGHT_RANGE = (0.05, 100.0)
+
+    # 공공데이터 코드값 (Q/U는 '미상'으로 정상 처리)
+    SEX_CODES = ['M', 'F', 'Q']
+    NEUTER_CODES = ['Y', 'N', 'U']
+
+    @staticmethod
+    def validate(df, rules=None):
+        """
+        원본 데이터프레임의 전체 검사 항목을 행별 비트마스크로 계산
+
+        대상 컬럼이 없는 검사는 건너뜁니다. 결측값은 '변환 실패'로 보지 않지만
+        성별/중성화 코드와 보호소 주소는 결측이면 문제로 셉니다.
+
+        Parameters:
+        df (pandas.DataFrame): 전처리 전 원본 데이터프레임
+        rules (RuleSet): 사용할 분류 규칙 (기본: 현재 공유 규칙)
+
+        Returns:
+        pandas.Series: 행별 품질 비트마스크 (비트 순서: LABELS, df와 같은 인덱스)
+        """
+        rules = rules or RuleSet.current()
+        per_unique = DataQualityValidator._per_unique
+        flags = {}
+
+        for column in ('happen_dt', 'notice_sdt', 'notice_edt'):
+            if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+                flags[f'{column}_invalid'] = per_unique(df[column], DataQualityValidator._invalid_dates)
+
+        if 'weight' in df.columns:
+            weight = per_unique(df['weight'], TextUtils.extract_weight_series, missing=np.nan)
+            low, high = DataQualityValidator.WEIGHT_RANGE
+            flags['weight_invalid'] = df['weight'].notna().to_numpy() & np.isnan(weight)
+            flags['weight_out_of_range'] = ~np.isnan(weight) & ((weight < low) | (weight > high))
+
+        if 'sex_cd' in df.columns:
+            flags['sex_unknown'] = ~df['sex_cd'].isin(DataQualityValidator.SEX_CODES).to_numpy()
+        if 'neuter_yn' in df.columns:
+            flags['neuter_unknown'] = ~df['neuter_yn'].isin(DataQualityValidator.NEUTER_CODES).to_numpy()
+
+        if 'care_addr' in df.columns:
+            flags['sido_missing'] = per_unique(df['care_addr'], lambda values: ~values.astype('string').str.replace(
+                RuleSet.PAREN_PATTERN, '', regex=True
+            ).str.strip().str.match(rules.sido_pattern).fillna(False).astype(bool), missing=True)
+
+        if 'color_cd' in df.columns:
+            flags['color_noise'] = per_unique(df['color_cd'], lambda values: values.astype('string').str.contains(
+                rules.color_noise_pattern, na=False
+            ).astype(bool))
+
+        dtype = BitmaskUtils.dtype_for(len(DataQualityValidator.LABELS))
+        masks = np.zeros(len(df), dtype=dtype)
+        for bit, name in enumerate(DataQualityValidator.LABELS):
+            if name in flags:
+                masks |= np.asarray(flags[name], dtype=bool).astype(dtype) << dtype(bit)
+        return pd.Series(masks, index=df.index, name='quality_mask')
+
+    @staticmethod
+    def _per_unique(series, func, missing=False):
+        """고유값에만 벡터 검사 함수를 적용한 뒤 전체 행으로 확장 (결측 행은 missing 값)"""
+        codes, uniques = pd.factorize(series)
+        values = np.asarray(func(pd.Series(uniques)))
+        values = np.append(values, np.asarray(missing, dtype=values.dtype))
+        return values[codes]
+
+    @staticmethod
+    def _invalid_dates(values):
+        """YYYYMMDD 형식으로 변환되지 않는 (빈 문자열이 아닌) 값 여부"""
+        text = values.astype('string').str.strip()
+        parsed = pd.to_datetime(text, format=DataQualityValidator.DATE_FORMAT, errors='coerce')
+        return (text.notna() & (text != '') & parsed.isna()).to_numpy(dtype=bool)
+
+    @staticmethod
+    def summary(masks):
+        """
+        검사 항목별 문제 건수와 비율
+
+        Parameters:
+        masks (pandas.Series): validate 결과 (quality_mask 컬럼)
+
+        Returns:
+        pandas.DataFrame: check, column, description, count, ratio 컬럼 (건수 내림차순)
+        """
+        counts = BitmaskUtils.counts(masks, DataQualityValidator.LABELS)
+        info = pd.DataFrame(DataQualityValidator.CHECKS, columns=['check', 'column', 'description'])
+        info['count'] = info['check'].map(counts).fillna(0).astype(int).to_numpy()
+        info['ratio'] = info['count'] / max(len(masks), 1)
+        return info.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def rows(masks, check):
+        """
+        검사 항목에 해당하는 행의 위치
+
+        Parameters:
+        masks (pandas.Series): validate 결과 (quality_mask 컬럼)
+        check (str): 검사 항목 (LABELS 중 하나)
+
+        Returns:
+        numpy.ndarray: 행 위치 배열 (0부터)
+        """
+        return np.flatnonzero(BitmaskUtils.contains(masks, [check], DataQualityValidator.LABELS))
+
+    @staticmethod
+    def report(masks):
+        """
+        검사 항목별 문제 행 위치 (문제가 있는 항목만)
+
+        Parameters:
+        masks (pandas.Series): validate 결과 (quality_mask 컬럼)
+
+        Returns:
+        dict: 검사 항목 -> 행 위치 배열
+        """
+        report = {}
+        for name in DataQualityValidator.LABELS:
+            positions = DataQualityValidator.rows(masks, name)
+            if len(positions):
+                report[name] = positions
+        return report
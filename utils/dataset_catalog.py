@@ -0,0 +1,345 @@
+import os
+import json
+import shutil
+import logging
+import threading
+from datetime import datetime
+import pandas as pd
+from utils.utils import BitmaskUtils, CacheUtils, DateUtils, ResultCache
+from utils.data_loader import DataLoader
+from utils.shared_dataset import SharedDataset
+from utils.sketches import DatasetSketch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 카탈로그 저장 위치 (환경 변수로 변경 가능)
+DEFAULT_CATALOG_DIR = os.environ.get('ANIMAL_CATALOG_DIR', os.path.join('data', 'catalog'))
+
+# 연/월/시도 값이 없는 행이 들어가는 파티션 이름
+UNKNOWN_PARTITION = '미상'
+
+class DatasetCatalog:
+    """
+    여러 전처리 결과 파일을 연/월/시도 파티션으로 등록하고
+    필터 조건에 해당하는 파티션만 읽어 합치는 데이터셋 카탈로그
+
+    파티션은 Arrow IPC 파일로 저장되고, 파티션 목록과 값은 manifest.json에 기록되어
+    파일을 열지 않고도 필요 없는 파티션을 건너뛸 수 있습니다.
+    """
+
+    MANIFEST_NAME = 'manifest.json'
+    PARTITION_COLUMNS = ['happen_year', 'happen_month', 'sido']
+
+    # 파티션 조합 -> 공유 데이터셋 키
+    _dataset_keys = ResultCache(max_entries=16)
+    _lock = threading.Lock()
+
+    def __init__(self, root=None):
+        """
+        초기화 함수
+
+        Parameters:
+        root (str): 카탈로그 디렉토리 (기본: data/catalog)
+        """
+        self.root = root or DEFAULT_CATALOG_DIR
+
+    def register(self, df, source_name):
+        """
+        전처리된 데이터프레임을 연/월/시도 파티션으로 나눠 카탈로그에 등록
+
+        Parameters:
+        df (pandas.DataFrame): 전처리된 데이터프레임
+        source_name (str): 원본 파일명 (표시용)
+
+        Returns:
+        int: 새로 기록한 파티션 수 (이미 등록된 데이터면 0)
+        """
+        if not DataLoader.arrow_available():
+            logger.warning("pyarrow가 설치되어 있지 않아 카탈로그에 등록할 수 없습니다.")
+            return 0
+        if any(col not in df.columns for col in self.PARTITION_COLUMNS):
+            logger.warning("파티션 컬럼(연/월/시도)이 없어 카탈로그에 등록할 수 없습니다.")
+            return 0
+
+        source_id = CacheUtils.fingerprint(df)[:16]
+        with self._lock:
+            manifest = self._read_manifest()
+            if source_id in manifest['sources']:
+                logger.info(f"이미 카탈로그에 등록된 데이터: {source_name}")
+                return 0
+
+            frame = df.reset_index(drop=True)
+            keys = pd.MultiIndex.from_arrays([
+                frame['happen_year'].astype('Int64'),
+                frame['happen_month'].astype('Int64'),
+                frame['sido'].astype('string'),
+            ])
+            partitions = []
+            for (year, month, sido), rows in frame.groupby(keys, dropna=False, sort=True).indices.items():
+                part = frame.take(rows)
+                values = {
+                    'year': None if pd.isna(year) else int(year),
+                    'month': None if pd.isna(month) else int(month),
+                    'sido': None if pd.isna(sido) else str(sido),
+                }
+                path = self._partition_path(values, source_id)
+                full_path = os.path.join(self.root, path)
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                part.to_feather(full_path, compression='uncompressed')
+                # 파티션별 상위 값/고유값 요약 (여러 파티션을 읽지 않고 병합해 사용)
+                sketch_path = path[:-len('.arrow')] + '.sketch.json'
+                DatasetSketch.build(part).save(os.path.join(self.root, sketch_path))
+
+                dates = part['happen_dt'].dropna()
+                partitions.append({
+                    'path': path,
+                    'sketch': sketch_path,
+                    'source': source_id,
+                    'rows': len(part),
+                    'min_date': dates.min().isoformat() if len(dates) else None,
+                    'max_date': dates.max().isoformat() if len(dates) else None,
+                    **values,
+                })
+
+            manifest['sources'][source_id] = {
+                'name': source_name,
+                'rows': len(frame),
+                'registered_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            manifest['partitions'].extend(partitions)
+            self._write_manifest(manifest)
+
+        logger.info(f"카탈로그 등록 완료: {source_name} ({len(frame)} 행, 파티션 {len(partitions)}개)")
+        return len(partitions)
+
+    def remove_source(self, source_id):
+        """
+        등록된 원본 파일과 그 파티션을 카탈로그에서 삭제
+
+        Parameters:
+        source_id (str): sources()의 source_id
+        """
+        with self._lock:
+            manifest = self._read_manifest()
+            if manifest['sources'].pop(source_id, None) is None:
+                return
+            removed = [p for p in manifest['partitions'] if p['source'] == source_id]
+            manifest['partitions'] = [p for p in manifest['partitions'] if p['source'] != source_id]
+            self._write_manifest(manifest)
+
+        for partition in removed:
+            for path in (partition['path'], partition.get('sketch')):
+                try:
+                    if path:
+                        os.remove(os.path.join(self.root, path))
+                except OSError:
+                    pass
+        logger.info(f"카탈로그에서 삭제: {source_id} (파티션 {len(removed)}개)")
+
+    def clear(self):
+        """카탈로그 전체 삭제"""
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def sources(self):
+        """
+        등록된 원본 파일 목록
+
+        Returns:
+        pandas.DataFrame: source_id, name, rows, registered_at 컬럼
+        """
+        manifest = self._read_manifest()
+        return pd.DataFrame(
+            [{'source_id': key, **info} for key, info in manifest['sources'].items()],
+            columns=['source_id', 'name', 'rows', 'registered_at']
+        )
+
+    def partitions(self):
+        """
+        전체 파티션 목록 (manifest 기준, 파일은 열지 않음)
+
+        Returns:
+        pandas.DataFrame: path, sketch, source, rows, min_date, max_date, year, month, sido 컬럼
+        """
+        manifest = self._read_manifest()
+        return pd.DataFrame(manifest['partitions'],
+                            columns=['path', 'sketch', 'source', 'rows', 'min_date', 'max_date', 'year', 'month', 'sido'])
+
+    def prune(self, years=None, months=None, sidos=None, start=None, end=None):
+        """
+        필터 조건과 겹치지 않는 파티션을 제외한 파티션 목록
+
+        Parameters:
+        years (list): 포함할 연도 (None이면 전체, UNKNOWN_PARTITION은 연도 미상 파티션)
+        months (list): 포함할 월 (None이면 전체, UNKNOWN_PARTITION은 월 미상 파티션)
+        sidos (list): 포함할 시도 (None이면 전체, UNKNOWN_PARTITION은 시도 미상 파티션)
+        start: 기간 시작일 (포함)
+        end: 기간 종료일 (포함)
+
+        Returns:
+        pandas.DataFrame: 남은 파티션 목록
+        """
+        parts = self.partitions()
+        if parts.empty:
+            return parts
+
+        keep = pd.Series(True, index=parts.index)
+        for column, selected in (('year', years), ('month', months), ('sido', sidos)):
+            if selected is None:
+                continue
+            selected = list(selected)
+            matched = parts[column].isin(selected)
+            if UNKNOWN_PARTITION in selected:
+                matched |= parts[column].isna()
+            keep &= matched
+
+        # 파티션의 최소/최대 발생일이 기간과 겹치지 않으면 제외 (발생일 없는 파티션도 제외)
+        if start is not None:
+            keep &= pd.to_datetime(parts['max_date']) >= pd.Timestamp(start)
+        if end is not None:
+            keep &= pd.to_datetime(parts['min_date']) < pd.Timestamp(end) + pd.Timedelta(days=1)
+
+        pruned = parts[keep]
+        logger.info(f"파티션 선택: 전체 {len(parts)}개 중 {len(pruned)}개")
+        return pruned
+
+    def load(self, partitions, columns=None):
+        """
+        선택한 파티션만 메모리 매핑으로 읽어 하나의 데이터프레임으로 합침
+
+        Parameters:
+        partitions (pandas.DataFrame): prune 결과
+        columns (list): 읽을 컬럼 (None이면 전체)
+
+        Returns:
+        pandas.DataFrame: 발생일 순으로 정렬된 데이터프레임 (파티션이 없으면 빈 데이터프레임)
+        """
+        if partitions is None or partitions.empty:
+            return pd.DataFrame()
+
+        import pyarrow as pa
+
+        tables = []
+        for path in partitions['path']:
+            table = pa.ipc.open_file(pa.memory_map(os.path.join(self.root, path), 'r')).read_all()
+            if columns is not None:
+                table = table.select([c for c in columns if c in table.column_names])
+            tables.append(table)
+        tables, mask_labels = self._align_masks(tables)
+
+        # 내보내기 시점마다 컬럼 구성이 다를 수 있으므로 스키마를 합쳐서 연결
+        try:
+            table = pa.concat_tables(tables, promote_options='default')
+        except TypeError:
+            table = pa.concat_tables(tables, promote=True)
+
+        frame = SharedDataset.to_frame(table)
+        if 'happen_dt' in frame.columns:
+            frame = DateUtils.set_date_index(frame)
+        if mask_labels:
+            frame.attrs[BitmaskUtils.LABELS_ATTR] = mask_labels
+        return frame
+
+    @staticmethod
+    def _align_masks(tables):
+        """
+        파티션마다 기록된 비트마스크 라벨 순서가 다르면(다른 규칙으로 분류한 파일) 하나의 순서로 맞춤
+
+        Returns:
+        tuple: (맞춘 Arrow 테이블 목록, 비트마스크 컬럼 -> 합친 라벨 순서)
+        """
+        import pyarrow as pa
+
+        labels = []
+        for table in tables:
+            metadata = json.loads((table.schema.metadata or {}).get(b'pandas', b'{}'))
+            labels.append((metadata.get('attributes') or {}).get(BitmaskUtils.LABELS_ATTR, {}))
+
+        # 처음 나온 순서를 유지하고 새 라벨은 뒤에 추가
+        merged = {}
+        for table_labels in labels:
+            for column, column_labels in table_labels.items():
+                target = merged.setdefault(column, [])
+                target.extend(label for label in column_labels if label not in target)
+
+        aligned = []
+        for table, table_labels in zip(tables, labels):
+            for column, column_labels in table_labels.items():
+                if column_labels != merged[column] and column in table.column_names:
+                    masks = BitmaskUtils.remap(table[column].to_pandas(), column_labels, merged[column])
+                    table = table.set_column(table.column_names.index(column), column, pa.array(masks.to_numpy()))
+            aligned.append(table)
+        return aligned, merged
+
+    def load_shared(self, partitions):
+        """
+        선택한 파티션을 합친 결과를 공유 데이터셋으로 등록하고 키 반환 (같은 파티션 조합은 재사용)
+
+        선택을 바꿀 때마다 합친 사본이 쌓이지 않도록, 이전에 만든 합본 중
+        살아 있는 세션이 쓰지 않는 것은 닫고 파일을 삭제합니다.
+
+        Parameters:
+        partitions (pandas.DataFrame): prune 결과
+
+        Returns:
+        str: 공유 데이터셋 키 (파티션이 없으면 None)
+        """
+        if partitions is None or partitions.empty:
+            return None
+
+        cache_key = (self.root, tuple(sorted(partitions['path'])))
+        key = self._dataset_keys.get(cache_key)
+        if key is not None and SharedDataset.open(key) is not None:
+            return key
+        key = SharedDataset.publish(self.load(partitions))
+        for previous in set(self._dataset_keys.values()) - {key}:
+            SharedDataset.discard(previous)
+        sketch = self.sketch(partitions)
+        if sketch is not None:
+            DatasetSketch.register(key, sketch)
+        return self._dataset_keys.put(cache_key, key)
+
+    def sketch(self, partitions):
+        """
+        선택한 파티션의 요약을 병합 (파티션 파일은 읽지 않음)
+
+        Parameters:
+        partitions (pandas.DataFrame): prune 결과
+
+        Returns:
+        DatasetSketch: 병합된 요약 (요약이 없는 파티션이 있으면 None)
+        """
+        if partitions is None or partitions.empty or 'sketch' not in partitions.columns:
+            return None
+        merged = DatasetSketch()
+        for path in partitions['sketch']:
+            sketch = DatasetSketch.load(os.path.join(self.root, path)) if isinstance(path, str) else None
+            if sketch is None:
+                return None
+            merged.merge(sketch)
+        return merged
+
+    def _partition_path(self, values, source_id):
+        """파티션 값으로 상대 경로 생성 (year=2023/month=05/sido=서울특별시/part-<id>.arrow)"""
+        year = UNKNOWN_PARTITION if values['year'] is None else str(values['year'])
+        month = UNKNOWN_PARTITION if values['month'] is None else f"{values['month']:02d}"
+        sido = UNKNOWN_PARTITION if values['sido'] is None else values['sido'].replace(os.sep, '_')
+        return os.path.join(f"year={year}", f"month={month}", f"sido={sido}", f"part-{source_id}.arrow")
+
+    def _read_manifest(self):
+        """manifest.json 읽기 (없으면 빈 카탈로그)"""
+        path = os.path.join(self.root, self.MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {'version': 1, 'sources': {}, 'partitions': []}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        """manifest.json 원자적 저장"""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, self.MANIFEST_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,201 @@
+import logging
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class DuplicateDetector:
+    """
+    재공고/보호소 이송 등으로 중복 등록된 동일 개체 의심 기록 탐지를 담당하는 클래스
+
+    발견 장소가 같은(공백/기호 차이만 있는) 쌍만 중복 후보로 보고, 그 안에서 나머지 항목의 가중합으로 판정합니다.
+    같은 날 같은 시군구에서 발견된 흰색 수컷 믹스견처럼 흔한 조합은 장소가 다르면 다른 개체로 봅니다.
+    """
+
+    # 항목별 유사도 가중치 (합계 1.0)
+    WEIGHTS = {
+        'kind': 0.20,
+        'color': 0.20,
+        'sex': 0.15,
+        'weight': 0.15,
+        'place': 0.15,
+        'date': 0.10,
+        'shelter': 0.05,
+    }
+
+    # 한 번에 점수를 매길 최대 후보 쌍 수 (메모리 사용량 제한)
+    CHUNK_PAIRS = 2_000_000
+
+    def __init__(self, window_days=7, threshold=0.8, max_block_size=2000, weight_tolerance=0.2):
+        """
+        초기화 함수
+
+        Parameters:
+        window_days (int): 같은 개체로 볼 발생일 최대 차이(일)
+        threshold (float): 중복으로 판단할 최소 유사도 점수
+        max_block_size (int): 블록이 이보다 크면 품종으로 더 세분화
+        weight_tolerance (float): 같은 체중으로 볼 상대 오차
+        """
+        self.window_days = window_days
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.weight_tolerance = weight_tolerance
+
+    def find_duplicates(self, df):
+        """
+        블로킹 키(발생일 구간 × 시군구 × 동물 종류) 안에서만 쌍을 비교해 중복 의심 기록 탐지
+
+        Parameters:
+        df (pandas.DataFrame): 전처리된 데이터프레임
+
+        Returns:
+        pandas.DataFrame: dup_group(중복 묶음 번호, 단독 기록은 -1), is_duplicate(대표 기록 외 중복) 컬럼
+        """
+        n = len(df)
+        result = pd.DataFrame({'dup_group': np.full(n, -1, dtype=np.int32),
+                               'is_duplicate': np.zeros(n, dtype=bool)}, index=df.index)
+        if n < 2 or 'happen_dt' not in df.columns:
+            return result
+
+        features = self._encode_features(df)
+
+        # 후보 쌍을 나누어 점수를 매기고 기준을 넘는 쌍만 모음
+        matched_left, matched_right = [], []
+        for left, right in self._candidate_pairs(features):
+            matched = self._score_pairs(features, left, right) >= self.threshold
+            matched_left.append(left[matched])
+            matched_right.append(right[matched])
+        if not matched_left or sum(len(left) for left in matched_left) == 0:
+            return result
+        left, right = np.concatenate(matched_left), np.concatenate(matched_right)
+
+        # 중복 쌍을 그래프로 보고 연결 요소 단위로 묶음 번호 부여
+        graph = coo_matrix((np.ones(len(left), dtype=np.int8), (left, right)), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        group_size = np.bincount(labels)
+        in_group = group_size[labels] > 1
+
+        # 묶음 안에서 가장 최근 공고(없으면 마지막 행)를 대표 기록으로 유지
+        recency = features['recency']
+        order = np.lexsort((recency, labels))
+        is_last = np.r_[labels[order][1:] != labels[order][:-1], True]
+        representative = np.zeros(n, dtype=bool)
+        representative[order[is_last]] = True
+
+        _, group_ids = np.unique(labels[in_group], return_inverse=True)
+        result.loc[in_group, 'dup_group'] = group_ids.astype(np.int32)
+        result['is_duplicate'] = in_group & ~representative
+
+        logger.info(f"중복 의심 기록 탐지 완료: {len(np.unique(group_ids))}개 묶음, "
+                    f"{int(result['is_duplicate'].sum())}건 중복")
+        return result
+
+    def _encode_features(self, df):
+        """비교에 쓰는 컬럼을 정수 코드/숫자 배열로 변환"""
+        def codes(column, normalize=False):
+            if column not in df.columns:
+                return np.full(len(df), -1, dtype=np.int64)
+            values = df[column].astype('string')
+            if normalize:
+                values = values.str.replace(r'[^0-9A-Za-z가-힣]+', '', regex=True).str.lower()
+                # 기호만 있던 값은 결측으로 봄 (서로 일치한다고 보지 않음)
+                values = values.mask(values == '')
+            return pd.factorize(values)[0].astype(np.int64)
+
+        happen = df['happen_dt']
+        base = happen.min()
+        days = (happen - base).dt.days.to_numpy(dtype=float)
+
+        recency_column = 'notice_sdt' if 'notice_sdt' in df.columns else 'happen_dt'
+        recency = (df[recency_column] - base).dt.days.fillna(-1).to_numpy(dtype=np.int64)
+        recency = recency * len(df) + np.arange(len(df))
+
+        return {
+            'days': days,
+            'block': pd.factorize(pd.MultiIndex.from_arrays([codes('sigungu'), codes('animal_type')]))[0],
+            'kind': codes('kind_cd', normalize=True),
+            'color': codes('color_list' if 'color_list' in df.columns else 'color_cd', normalize=True),
+            'sex': codes('sex_cd'),
+            'place': codes('happen_place', normalize=True),
+            'shelter': codes('care_nm', normalize=True),
+            'weight': pd.to_numeric(df['weight'], errors='coerce').to_numpy(dtype=float)
+            if 'weight' in df.columns else np.full(len(df), np.nan),
+            'recency': recency,
+        }
+
+    def _candidate_pairs(self, features, chunk_pairs=None):
+        """
+        같은 블록(시군구 × 동물 종류)에서 발생일 차이가 window_days 이하인 쌍을 빠짐없이 생성
+
+        블록과 발생일로 정렬한 뒤 각 행에서 window_days일 뒤까지의 행만 짝지으므로 고정 구간 경계에서
+        놓치는 쌍이 없습니다. 어떤 window_days + 1일 구간이라도 max_block_size보다 큰 블록은
+        블록 전체를 품종 코드로 세분화합니다. 메모리를 제한하기 위해 쌍을 나누어 반환합니다.
+
+        Parameters:
+        features (dict): _encode_features 결과
+        chunk_pairs (int): 한 번에 반환할 최대 쌍 수 (기본: CHUNK_PAIRS)
+
+        Yields:
+        tuple: (왼쪽 행 위치 배열, 오른쪽 행 위치 배열)
+        """
+        chunk_pairs = chunk_pairs or self.CHUNK_PAIRS
+        days = features['days']
+        rows = np.flatnonzero(~np.isnan(days))
+        if len(rows) < 2:
+            return
+        day_values = days[rows].astype(np.int64)
+        window = max(self.window_days, 0)
+
+        # 바쁜 기간이 있는 블록은 블록 전체를 품종으로 세분화 (쌍마다 같은 기준을 쓰도록 블록 단위로 결정)
+        block, blocks = pd.factorize(features['block'][rows])
+        bucket = day_values // (window + 1)
+        n_buckets = int(bucket.max()) + 1
+        busiest = np.bincount(bucket * len(blocks) + block, minlength=n_buckets * len(blocks))
+        busiest = busiest.reshape(n_buckets, len(blocks)).max(axis=0)
+        large = busiest[block] > self.max_block_size
+        block = pd.factorize(pd.MultiIndex.from_arrays([block, np.where(large, features['kind'][rows], -1)]))[0]
+
+        # (블록, 발생일) 정렬 키에서 각 행의 window_days일 뒤까지 범위의 끝 위치
+        key = block.astype(np.int64) * (int(day_values.max()) + window + 1) + day_values
+        order = np.argsort(key, kind='stable')
+        key = key[order]
+        partners = np.searchsorted(key, key + window, side='right') - np.arange(len(key)) - 1
+
+        start = 0
+        cumulative = np.cumsum(partners)
+        while start < len(key):
+            done = cumulative[start - 1] if start else 0
+            stop = max(int(np.searchsorted(cumulative, done + chunk_pairs, side='right')), start + 1)
+            counts = partners[start:stop]
+            left = np.repeat(np.arange(start, stop), counts)
+            # 각 왼쪽 행의 1, 2, ..., counts 번째 다음 행
+            offsets = np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+            if len(left):
+                yield rows[order[left]], rows[order[left + offsets]]
+            start = stop
+
+    def _score_pairs(self, features, left, right):
+        """후보 쌍의 항목별 일치 여부를 가중합해 유사도 점수 계산 (발견 장소가 다르거나 없으면 0점)"""
+        w = self.WEIGHTS
+
+        def same(name):
+            a, b = features[name][left], features[name][right]
+            return ((a == b) & (a >= 0)).astype(float)
+
+        weight_l, weight_r = features['weight'][left], features['weight'][right]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight_diff = np.abs(weight_l - weight_r) / np.maximum(np.maximum(weight_l, weight_r), 1e-6)
+        weight_score = np.where(np.isnan(weight_diff), 0.5, (weight_diff <= self.weight_tolerance).astype(float))
+
+        day_gap = np.abs(features['days'][left] - features['days'][right])
+        date_score = 1.0 - day_gap / max(self.window_days, 1)
+
+        same_place = same('place')
+        score = (w['kind'] * same('kind') + w['color'] * same('color') + w['sex'] * same('sex')
+                 + w['weight'] * weight_score + w['place'] * same_place + w['date'] * date_score
+                 + w['shelter'] * same('shelter'))
+        # 다른 항목이 모두 같아도 장소가 다르면 다른 개체로 봄
+        return score * same_place
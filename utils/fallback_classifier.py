@@ -0,0 +1,221 @@
+import os
+import glob
+import hashlib
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from utils.utils import CacheUtils, ResultCache
+from utils.shared_dataset import DEFAULT_CACHE_DIR
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 학습한 모델 저장 위치 (환경 변수로 변경 가능)
+DEFAULT_MODEL_DIR = os.environ.get('ANIMAL_MODEL_DIR', os.path.join(DEFAULT_CACHE_DIR, 'models'))
+
+class FallbackClassifier:
+    """
+    키워드 규칙으로 분류되지 않은 텍스트(장소 '기타', 색상 '확인필요')를 보조로 분류하는 클래스
+
+    규칙으로 분류된 고유 텍스트를 문자 n-gram 해싱 벡터로 바꿔 선형 모델을 학습하고,
+    분류되지 않은 고유 텍스트에만 묶음 단위로 적용합니다. 모델은 (대상, 규칙 버전, 학습 데이터 지문)별로
+    한 번만 학습해 디스크와 메모리에 저장하므로 같은 데이터를 다시 올릴 때는 학습하지 않고,
+    다른 데이터에는 그 데이터로 학습한 모델을 씁니다.
+    """
+
+    # 모델 형식이 바뀌면 올려서 기존 저장 모델을 무시
+    MODEL_VERSION = 1
+
+    # 해싱 벡터 차원 (모델 크기: 클래스 수 x 차원)
+    N_FEATURES = 2 ** 16
+    NGRAM_RANGE = (2, 4)
+
+    # 학습에 필요한 최소 고유 텍스트 수, 클래스별 최소 고유 텍스트 수, 최대 클래스 수,
+    # 학습에 쓸 최대 고유 텍스트 수 (자주 등장하는 순)
+    MIN_SAMPLES = 50
+    MIN_CLASS_SAMPLES = 5
+    MAX_CLASSES = 32
+    MAX_TRAIN_SAMPLES = 100000
+    EPOCHS = 5
+
+    # 이 확률 이상으로 예측한 경우에만 라벨을 채움 (사전 분포만으로 나온 예측은 제외)
+    MIN_CONFIDENCE = 0.8
+
+    # 한 번에 벡터화/예측할 고유 텍스트 수
+    BATCH_SIZE = 50000
+
+    # 디스크에 보관할 모델 파일 수
+    MAX_MODEL_FILES = 16
+
+    # (대상, 규칙 버전, 학습 데이터 지문) -> 학습된 모델
+    _models = ResultCache(max_entries=4)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        """scikit-learn 설치 여부 확인"""
+        try:
+            import sklearn  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @staticmethod
+    def fill(texts, labels, target, unmatched_label, rules_version, model_dir=None):
+        """
+        규칙으로 분류되지 않은 행의 라벨을 학습 모델의 예측으로 채움
+
+        Parameters:
+        texts (pandas.Series): 분류 대상 텍스트 (예: happen_place)
+        labels (pandas.Series): 규칙 분류 결과 (같은 텍스트는 같은 라벨)
+        target (str): 분류 대상 이름 (모델 저장 키, 예: 'place_type')
+        unmatched_label (str): 규칙으로 분류되지 않았음을 뜻하는 라벨 (예: '기타')
+        rules_version (str): 규칙 버전 (모델 캐시 키)
+        model_dir (str): 모델 저장 디렉토리 (기본: data/.cache/models)
+
+        Returns:
+        tuple: (채운 라벨 Series, 예측으로 채웠는지 여부 Series) - 모델을 쓸 수 없으면 원래 라벨 그대로
+        """
+        inferred = pd.Series(False, index=labels.index)
+        if not FallbackClassifier.available() or len(texts) == 0:
+            return labels, inferred
+
+        # 고유 텍스트 단위로 학습/예측 (결측 텍스트는 제외)
+        codes, uniques = pd.factorize(texts)
+        _, first = np.unique(codes, return_index=True)
+        valid = codes[first] >= 0
+        first, unique_codes = first[valid], codes[first][valid]
+        unique_texts = np.asarray(uniques, dtype=object)[unique_codes].astype(str)
+        unique_labels = np.asarray(labels, dtype=object)[first]
+
+        unmatched = (unique_labels == unmatched_label) & (unique_texts != unmatched_label)
+        if not unmatched.any():
+            return labels, inferred
+
+        model = FallbackClassifier._model(
+            target, rules_version, unique_texts[~unmatched], unique_labels[~unmatched],
+            np.bincount(codes[codes >= 0])[unique_codes[~unmatched]], unmatched_label, model_dir
+        )
+        if model is None:
+            return labels, inferred
+
+        predicted = FallbackClassifier.predict(model, unique_texts[unmatched])
+        if not any(label is not None for label in predicted):
+            return labels, inferred
+
+        # 고유 텍스트별 예측을 전체 행으로 확장
+        lookup = np.full(len(uniques), None, dtype=object)
+        lookup[unique_codes[unmatched]] = predicted
+        row_labels = np.where(codes >= 0, lookup[codes], None)
+        filled = pd.notna(row_labels)
+
+        result = labels.where(~filled, row_labels)
+        inferred = pd.Series(filled, index=labels.index)
+        logger.info(f"{target} 보조 분류: 미분류 고유값 {int(unmatched.sum())}개 중 "
+                    f"{sum(label is not None for label in predicted)}개, {int(filled.sum())} 행 채움")
+        return result, inferred
+
+    @staticmethod
+    def predict(model, texts):
+        """
+        텍스트 묶음 단위 예측 (확률이 MIN_CONFIDENCE 미만이면 None)
+
+        Parameters:
+        model (dict): _model 결과 ({'vectorizer', 'classifier'})
+        texts (array-like): 예측할 텍스트
+
+        Returns:
+        numpy.ndarray: 예측 라벨 (object 배열)
+        """
+        texts = np.asarray(texts, dtype=object)
+        result = np.full(len(texts), None, dtype=object)
+        classes = model['classifier'].classes_
+        for start in range(0, len(texts), FallbackClassifier.BATCH_SIZE):
+            batch = texts[start:start + FallbackClassifier.BATCH_SIZE]
+            proba = model['classifier'].predict_proba(model['vectorizer'].transform(batch))
+            best = proba.argmax(axis=1)
+            confident = proba[np.arange(len(batch)), best] >= FallbackClassifier.MIN_CONFIDENCE
+            result[start:start + len(batch)][confident] = classes[best[confident]]
+        return result
+
+    @staticmethod
+    def _model(target, rules_version, texts, labels, counts, unmatched_label, model_dir=None):
+        """(대상, 규칙 버전, 학습 데이터 지문)별 모델 반환 (메모리 -> 디스크 -> 새로 학습 순서)"""
+        data_key = CacheUtils.fingerprint(pd.DataFrame({'text': texts, 'label': labels, 'count': counts}))[:16]
+        cache_key = (target, rules_version, data_key)
+        model = FallbackClassifier._models.get(cache_key)
+        if model is not None:
+            return model
+
+        import joblib
+
+        path = FallbackClassifier._path(target, rules_version, data_key, model_dir)
+        with FallbackClassifier._lock:
+            model = FallbackClassifier._models.get(cache_key)
+            if model is not None:
+                return model
+
+            if os.path.exists(path):
+                try:
+                    model = joblib.load(path)
+                except Exception as e:
+                    logger.warning(f"저장된 보조 분류 모델을 읽을 수 없어 다시 학습합니다: {e}")
+            if model is None:
+                model = FallbackClassifier._train(target, texts, labels, counts, unmatched_label)
+                if model is None:
+                    return None
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                joblib.dump(model, tmp_path)
+                os.replace(tmp_path, path)
+                FallbackClassifier._prune(os.path.dirname(path))
+
+            FallbackClassifier._models.put(cache_key, model)
+        return model
+
+    @staticmethod
+    def _train(target, texts, labels, counts, unmatched_label):
+        """규칙으로 분류된 고유 텍스트로 문자 n-gram 선형 모델 학습 (데이터가 부족하면 None)"""
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+
+        # 고유 텍스트가 충분한 상위 클래스만 학습
+        class_sizes = pd.Series(labels).value_counts()
+        classes = class_sizes[class_sizes >= FallbackClassifier.MIN_CLASS_SAMPLES].index
+        classes = [c for c in classes if c != unmatched_label][:FallbackClassifier.MAX_CLASSES]
+        keep = np.flatnonzero(np.isin(labels, classes))
+        if len(classes) < 2 or len(keep) < FallbackClassifier.MIN_SAMPLES:
+            logger.info(f"{target} 보조 분류 모델 학습 생략: 학습 데이터 부족 ({len(keep)}개, 클래스 {len(classes)}개)")
+            return None
+        if len(keep) > FallbackClassifier.MAX_TRAIN_SAMPLES:
+            keep = keep[np.argsort(-counts[keep], kind='stable')[:FallbackClassifier.MAX_TRAIN_SAMPLES]]
+
+        vectorizer = HashingVectorizer(
+            analyzer='char_wb', ngram_range=FallbackClassifier.NGRAM_RANGE,
+            n_features=FallbackClassifier.N_FEATURES, alternate_sign=False
+        )
+        classifier = SGDClassifier(loss='log_loss', alpha=1e-5, max_iter=FallbackClassifier.EPOCHS,
+                                   tol=None, random_state=0)
+        # 자주 등장하는 텍스트에 더 큰 가중치 (로그 스케일)
+        classifier.fit(vectorizer.transform(texts[keep]), labels[keep],
+                       sample_weight=np.log1p(counts[keep]))
+        logger.info(f"{target} 보조 분류 모델 학습 완료: 고유 텍스트 {len(keep)}개, 클래스 {len(classes)}개")
+        return {'vectorizer': vectorizer, 'classifier': classifier}
+
+    @staticmethod
+    def _path(target, rules_version, data_key, model_dir=None):
+        """모델 파일 경로 (규칙 버전은 파일명에 안전하도록 해시)"""
+        version = hashlib.sha1(str(rules_version).encode()).hexdigest()[:12]
+        return os.path.join(model_dir or DEFAULT_MODEL_DIR,
+                            f"{target}_{version}_{data_key}_v{FallbackClassifier.MODEL_VERSION}.joblib")
+
+    @staticmethod
+    def _prune(model_dir):
+        """오래된 모델 파일 정리 (최근 MAX_MODEL_FILES개만 유지)"""
+        files = sorted(glob.glob(os.path.join(model_dir, '*.joblib')), key=os.path.getmtime, reverse=True)
+        for path in files[FallbackClassifier.MAX_MODEL_FILES:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
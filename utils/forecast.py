@@ -0,0 +1,183 @@
+import os
+import hashlib
+import logging
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.utils import ResultCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 최소 학습 기간(개월): 이보다 짧으면 예측하지 않고, 2년 미만이면 계절성 없이 적합
+MIN_MONTHS = 6
+SEASONAL_MONTHS = 24
+
+
+def _fit_series(task):
+    """
+    월별 발생 건수 한 개 계열에 ETS 모델을 적합하고 예측 (프로세스 풀 작업 단위)
+
+    Parameters:
+    task (tuple): (계열 키, 월별 건수 배열, 예측 개월 수, 신뢰수준)
+
+    Returns:
+    tuple: (계열 키, 예측값, 하한, 상한, 모델명) - 실패 시 예측값은 None
+    """
+    from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+
+    key, values, horizon, confidence = task
+    values = pd.Series(np.asarray(values, dtype=float))
+    seasonal = len(values) >= SEASONAL_MONTHS
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = ETSModel(
+                values,
+                error='add',
+                trend='add',
+                damped_trend=True,
+                seasonal='add' if seasonal else None,
+                seasonal_periods=12 if seasonal else None,
+            )
+            fitted = model.fit(disp=False)
+            frame = fitted.get_prediction(start=len(values), end=len(values) + horizon - 1).summary_frame(alpha=1 - confidence)
+
+        mean = np.clip(frame['mean'].to_numpy(), 0, None)
+        lower = np.clip(frame['pi_lower'].to_numpy(), 0, None)
+        upper = np.clip(frame['pi_upper'].to_numpy(), 0, None)
+        return key, mean, lower, upper, 'ETS(A,Ad,A)' if seasonal else 'ETS(A,Ad,N)'
+    except Exception as e:
+        logger.warning(f"{key} 계열 예측 실패: {e}")
+        return key, None, None, None, None
+
+
+class IntakeForecaster:
+    """지역/동물 종류/보호소별 월별 유기동물 발생 건수 예측을 담당하는 클래스"""
+
+    # (그룹 컬럼, 그룹값, 월별 건수 해시, 예측 개월 수, 신뢰수준) -> 예측 결과
+    _cache = ResultCache(max_entries=4096)
+
+    # 이 개수 이상의 계열을 새로 적합해야 할 때만 프로세스 풀 사용
+    PARALLEL_THRESHOLD = 8
+
+    @staticmethod
+    def monthly_counts(df, group_column=None, date_column='happen_dt', complete_only=False):
+        """
+        월별 발생 건수 행렬 계산
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        group_column (str): 그룹 컬럼명 (None이면 전체 한 계열)
+        date_column (str): 날짜 컬럼명
+        complete_only (bool): 데이터가 월말 전에 끝나면 마지막 달(덜 모인 달)을 제외
+
+        Returns:
+        pandas.DataFrame: 월 시작일 인덱스 × 그룹 컬럼의 건수 (빈 달은 0)
+        """
+        valid = df[df[date_column].notna()]
+        if valid.empty:
+            return pd.DataFrame()
+
+        # 근사 모드 표본은 행 가중치(층 전체 행 수 / 표본 행 수)의 합으로 전체 건수를 추정
+        weights = valid['sample_weight'] if 'sample_weight' in valid.columns else pd.Series(1, index=valid.index)
+        months = pd.DatetimeIndex(valid[date_column]).to_period('M').to_timestamp()
+        if group_column is None:
+            counts = weights.groupby(months.to_numpy()).sum().to_frame('전체')
+        else:
+            counts = (weights.groupby([months.to_numpy(), valid[group_column].to_numpy()], observed=True)
+                      .sum().unstack(fill_value=0))
+            counts.columns = counts.columns.astype(str)
+
+        last_month = counts.index.max()
+        if complete_only:
+            last_day = valid[date_column].max().normalize()
+            if last_day < last_month + pd.offsets.MonthEnd(0):
+                last_month -= pd.offsets.MonthBegin(1)
+
+        full_range = pd.date_range(counts.index.min(), last_month, freq='MS')
+        return counts.reindex(full_range, fill_value=0).rename_axis('date')
+
+    @staticmethod
+    def forecast(df, group_column=None, horizon=12, max_groups=50, confidence=0.9, workers=None):
+        """
+        그룹별 월별 발생 건수를 일괄 예측 (변경된 계열만 다시 적합)
+
+        데이터가 월말 전에 끝나면 마지막 달은 건수가 덜 모여 추세를 끌어내리므로
+        학습에서 빼고 그 달부터 예측합니다.
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        group_column (str): 그룹 컬럼명 (None이면 전체)
+        horizon (int): 예측 개월 수
+        max_groups (int): 발생 건수 상위 몇 개 그룹까지 예측할지
+        confidence (float): 예측구간 신뢰수준
+        workers (int): 프로세스 풀 크기 (기본: CPU 수)
+
+        Returns:
+        pandas.DataFrame: group, date, kind(실측/예측), count, lower, upper, model 컬럼
+        """
+        counts = IntakeForecaster.monthly_counts(df, group_column, complete_only=True)
+        columns = ['group', 'date', 'kind', 'count', 'lower', 'upper', 'model']
+        if counts.empty or len(counts) < MIN_MONTHS:
+            return pd.DataFrame(columns=columns)
+
+        top_groups = counts.sum().sort_values(ascending=False).head(max_groups).index
+        counts = counts[top_groups]
+
+        # 집계가 바뀐 계열만 적합 대상으로 선정
+        results, tasks = {}, []
+        for group in counts.columns:
+            values = counts[group].to_numpy(dtype=np.int64)
+            digest = hashlib.sha1(values.tobytes() + str(counts.index[0]).encode()).hexdigest()
+            key = (group_column, group, digest, horizon, confidence)
+            cached = IntakeForecaster._cache.get(key)
+            if cached is not None:
+                results[group] = cached
+            else:
+                tasks.append((key, values, horizon, confidence))
+
+        if tasks:
+            logger.info(f"예측 모델 적합: {len(tasks)}개 계열 (캐시 사용 {len(results)}개)")
+            for key, mean, lower, upper, model in IntakeForecaster._run_tasks(tasks, workers):
+                if mean is not None:
+                    results[key[1]] = IntakeForecaster._cache.put(key, (mean, lower, upper, model))
+
+        future_index = pd.date_range(counts.index[-1] + pd.offsets.MonthBegin(1), periods=horizon, freq='MS')
+        frames = []
+        for group in counts.columns:
+            frames.append(pd.DataFrame({
+                'group': group, 'date': counts.index, 'kind': '실측',
+                'count': counts[group].to_numpy(dtype=float), 'lower': np.nan, 'upper': np.nan, 'model': None
+            }))
+            if group in results:
+                mean, lower, upper, model = results[group]
+                frames.append(pd.DataFrame({
+                    'group': group, 'date': future_index, 'kind': '예측',
+                    'count': mean, 'lower': lower, 'upper': upper, 'model': model
+                }))
+
+        return pd.concat(frames, ignore_index=True)[columns]
+
+    @staticmethod
+    def _run_tasks(tasks, workers=None):
+        """
+        적합 작업 실행 (작업이 많으면 프로세스 풀, 실패 시 순차 실행)
+
+        Streamlit 서버는 여러 스레드가 돌고 있어 fork로 만든 자식 프로세스가 잠금을 쥔 채로
+        멈출 수 있으므로 spawn으로 새 인터프리터를 띄웁니다.
+        """
+        if len(tasks) >= IntakeForecaster.PARALLEL_THRESHOLD:
+            workers = workers or min(len(tasks), os.cpu_count() or 1)
+            if workers > 1:
+                try:
+                    with ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=multiprocessing.get_context('spawn')) as executor:
+                        chunksize = max(1, len(tasks) // (workers * 4))
+                        return list(executor.map(_fit_series, tasks, chunksize=chunksize))
+                except Exception as e:
+                    logger.warning(f"프로세스 풀 예측 실패, 순차 실행으로 전환: {e}")
+        return [_fit_series(task) for task in tasks]
@@ -0,0 +1,203 @@
+import logging
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class LengthOfStayAnalyzer:
+    """보호 기간(입소~결과) 계산 및 Kaplan-Meier 생존 분석을 담당하는 클래스"""
+
+    # 결과일로 사용할 컬럼 후보 (앞에 있을수록 우선)
+    # 공공데이터에는 실제 처리일이 없으므로 없으면 공고 종료일을 대용으로 사용
+    END_DATE_CANDIDATES = ['process_dt', 'end_dt', 'notice_edt']
+
+    # 나이 구간 (왼쪽 포함: [0, 1), [1, 3), [3, 7), [7, 100))
+    AGE_BINS = [0, 1, 3, 7, 100]
+    AGE_LABELS = ['1세 미만', '1-3세', '3-7세', '7세 이상']
+
+    @staticmethod
+    def derive_durations(df, start_column='happen_dt', state_column='process_state', reference_date=None):
+        """
+        입소일과 결과일로 보호 기간(일)과 중도절단 여부를 벡터 연산으로 계산
+
+        보호중인 동물은 기준일(기본: 데이터의 가장 최근 날짜)에서 중도절단됩니다.
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        start_column (str): 입소일 컬럼명
+        state_column (str): 처리 상태 컬럼명
+        reference_date: 중도절단 기준일
+
+        Returns:
+        pandas.DataFrame: stay_days(Int32), stay_censored(bool) 컬럼이 추가된 데이터프레임
+        """
+        end_column = next((c for c in LengthOfStayAnalyzer.END_DATE_CANDIDATES if c in df.columns), None)
+        if start_column not in df.columns or end_column is None:
+            logger.warning("보호 기간 계산에 필요한 날짜 컬럼이 없습니다.")
+            return df
+
+        start = df[start_column]
+        end = df[end_column]
+        censored = (df[state_column] == '보호중').to_numpy() if state_column in df.columns else np.zeros(len(df), dtype=bool)
+
+        if reference_date is None:
+            reference_date = max(start.max(), end.max())
+        end = end.where(~censored, pd.Timestamp(reference_date))
+
+        days = (end - start).dt.days
+        days = days.where(days >= 0)
+
+        df['stay_days'] = days.astype('Int32')
+        df['stay_censored'] = censored
+        return df
+
+    @staticmethod
+    def assign_age_band(df, age_column='age', year_column='happen_year'):
+        """
+        나이 문자열("2020(년생)", "(60일미만)")에서 입소 당시 나이 구간(category) 계산
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        age_column (str): 나이 컬럼명
+        year_column (str): 입소 연도 컬럼명
+
+        Returns:
+        pandas.DataFrame: age_band 컬럼이 추가된 데이터프레임
+        """
+        if age_column not in df.columns or year_column not in df.columns:
+            return df
+
+        text = df[age_column].astype('string')
+        birth_year = pd.to_numeric(text.str.extract(r'(\d{4})')[0], errors='coerce')
+        age = df[year_column].astype('float') - birth_year
+
+        # 일/개월 단위 표기는 1세 미만으로 처리
+        is_infant = text.str.contains(r'일|개월', na=False).to_numpy(dtype=bool)
+        age = age.where(~is_infant, 0)
+
+        df['age_band'] = pd.cut(age, bins=LengthOfStayAnalyzer.AGE_BINS, labels=LengthOfStayAnalyzer.AGE_LABELS,
+                                right=False)
+        return df
+
+    @staticmethod
+    def event_flags(df, event_outcomes=None):
+        """
+        분석 대상 사건 여부 계산
+
+        Parameters:
+        df (pandas.DataFrame): stay_censored, outcome 컬럼이 있는 데이터프레임
+        event_outcomes (list): 사건으로 볼 결과 목록 (None이면 보호 종료 전체)
+
+        Returns:
+        numpy.ndarray: 사건 발생 여부 (그 외 결과는 해당 시점 중도절단)
+        """
+        events = ~df['stay_censored'].to_numpy(dtype=bool)
+        if event_outcomes is not None and 'outcome' in df.columns:
+            events &= df['outcome'].isin(event_outcomes).to_numpy(dtype=bool)
+        return events
+
+    @staticmethod
+    def kaplan_meier(durations, events, groups=None, confidence=0.95):
+        """
+        그룹별 Kaplan-Meier 생존 곡선을 정렬 배열 기반으로 일괄 계산 (O(n log n))
+
+        Parameters:
+        durations (array-like): 보호 기간(일), 결측은 제외
+        events (array-like): 사건 발생 여부 (False는 중도절단)
+        groups (array-like): 그룹 라벨 (None이면 전체 한 그룹)
+        confidence (float): 신뢰수준 (Greenwood 분산)
+
+        Returns:
+        pandas.DataFrame: group, time, n_at_risk, events, censored, survival, ci_low, ci_high 컬럼
+        """
+        durations = pd.Series(durations).reset_index(drop=True)
+        valid = durations.notna().to_numpy()
+        t = durations[valid].to_numpy(dtype=np.int64)
+        e = np.asarray(events, dtype=bool)[valid]
+
+        if groups is None:
+            codes = np.zeros(len(t), dtype=np.int64)
+            labels = np.array(['전체'], dtype=object)
+        else:
+            codes, labels = pd.factorize(pd.Series(groups).reset_index(drop=True)[valid], sort=True)
+            keep = codes >= 0
+            codes, t, e = codes[keep].astype(np.int64), t[keep], e[keep]
+
+        columns = ['group', 'time', 'n_at_risk', 'events', 'censored', 'survival', 'ci_low', 'ci_high']
+        if len(t) == 0:
+            return pd.DataFrame(columns=columns)
+
+        # (그룹, 기간) 순 정렬 후 같은 (그룹, 기간) 구간의 경계 찾기
+        order = np.lexsort((t, codes))
+        g_sorted, t_sorted, e_sorted = codes[order], t[order], e[order]
+        boundary = np.r_[True, (g_sorted[1:] != g_sorted[:-1]) | (t_sorted[1:] != t_sorted[:-1])]
+        starts = np.flatnonzero(boundary)
+
+        cell_group = g_sorted[starts]
+        cell_time = t_sorted[starts]
+        cell_total = np.diff(np.r_[starts, len(t_sorted)])
+        cell_events = np.add.reduceat(e_sorted.astype(np.int64), starts)
+
+        # 그룹 내 위험 집합 크기: 그룹 크기 - 이전 시점까지 빠져나간 수
+        group_start = np.r_[True, cell_group[1:] != cell_group[:-1]]
+        group_id = np.cumsum(group_start) - 1
+        exits_before = np.cumsum(cell_total) - cell_total
+        exits_before -= exits_before[group_start][group_id]
+        group_size = np.bincount(group_id, weights=cell_total).astype(np.int64)
+        n_at_risk = group_size[group_id] - exits_before
+
+        # 그룹별 누적곱을 로그 누적합으로 계산 (생존율 0 구간은 별도 추적)
+        hazard = cell_events / n_at_risk
+        factor = 1.0 - hazard
+        is_zero = factor <= 0
+        log_factor = np.log(np.where(is_zero, 1.0, factor))
+
+        def group_cumsum(values):
+            total = np.cumsum(values)
+            offset = (total - values)[group_start][group_id]
+            return total - offset
+
+        survival = np.exp(group_cumsum(log_factor)) * (group_cumsum(is_zero.astype(np.int64)) == 0)
+
+        # Greenwood 분산
+        with np.errstate(divide='ignore', invalid='ignore'):
+            term = np.where(
+                n_at_risk > cell_events,
+                cell_events / (n_at_risk * (n_at_risk - cell_events)),
+                0.0
+            )
+        se = survival * np.sqrt(group_cumsum(term))
+        z = stats.norm.ppf(0.5 + confidence / 2)
+
+        return pd.DataFrame({
+            'group': np.asarray(labels, dtype=object)[cell_group],
+            'time': cell_time,
+            'n_at_risk': n_at_risk,
+            'events': cell_events,
+            'censored': cell_total - cell_events,
+            'survival': survival,
+            'ci_low': np.clip(survival - z * se, 0, 1),
+            'ci_high': np.clip(survival + z * se, 0, 1),
+        }, columns=columns)
+
+    @staticmethod
+    def median_survival(curves):
+        """
+        그룹별 생존율이 처음 0.5 이하가 되는 시점 (중앙 보호 기간)
+
+        Parameters:
+        curves (pandas.DataFrame): kaplan_meier 결과
+
+        Returns:
+        pandas.DataFrame: group, median_days, n 컬럼
+        """
+        if curves.empty:
+            return pd.DataFrame(columns=['group', 'median_days', 'n'])
+
+        sizes = curves.groupby('group', sort=False)['n_at_risk'].max()
+        reached = curves[curves['survival'] <= 0.5].groupby('group', sort=False)['time'].min()
+        result = pd.DataFrame({'n': sizes})
+        result['median_days'] = reached.reindex(result.index)
+        return result.rename_axis('group').reset_index()[['group', 'median_days', 'n']]
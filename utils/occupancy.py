@@ -0,0 +1,130 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.utils import CacheUtils, ResultCache
+from utils.length_of_stay import LengthOfStayAnalyzer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class OccupancyAnalyzer:
+    """보호소별 일별 보호 두수(재원 수) 계산을 담당하는 클래스"""
+
+    # 데이터 지문별 일별 보호 두수 행렬 캐시
+    _cache = ResultCache(max_entries=4)
+
+    # 이보다 긴 보호 기간(보호중 제외)은 결과일 입력 오류(예: 2023 -> 2203)로 보고 제외
+    MAX_STAY_DAYS = 3 * 365
+
+    @staticmethod
+    def daily_occupancy(df, shelter_column='care_nm', start_column='happen_dt'):
+        """
+        입소일과 보호 기간으로 보호소별 일별 보호 두수 계산 (이벤트 스윕 방식)
+
+        입소일에 +1, 결과일 다음 날에 -1 이벤트를 쌓은 뒤 날짜 방향 누적합으로
+        재원 수를 구하므로 날짜별로 데이터를 다시 거르지 않습니다.
+        날짜 범위는 입소일 범위로 제한하고(그 뒤에 끝나는 보호는 마지막 날까지 재원으로 셈),
+        MAX_STAY_DAYS보다 긴 종료된 보호 기간은 제외합니다. 같은 데이터에 대한 결과는 캐시됩니다.
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임 (stay_days 컬럼이 없으면 계산)
+        shelter_column (str): 보호소 컬럼명
+        start_column (str): 입소일 컬럼명
+
+        Returns:
+        pandas.DataFrame: 날짜 인덱스 × 보호소 컬럼의 일별 보호 두수 (int32)
+        """
+        if shelter_column not in df.columns or start_column not in df.columns:
+            logger.warning("일별 보호 두수 계산에 필요한 컬럼이 없습니다.")
+            return pd.DataFrame()
+
+        if 'stay_days' not in df.columns:
+            columns = [c for c in df.columns if c in (shelter_column, start_column, 'process_state')
+                       or c in LengthOfStayAnalyzer.END_DATE_CANDIDATES]
+            df = LengthOfStayAnalyzer.derive_durations(df[columns].copy(), start_column=start_column)
+            if 'stay_days' not in df.columns:
+                return pd.DataFrame()
+
+        key = (shelter_column, start_column,
+               CacheUtils.fingerprint(df, [shelter_column, start_column, 'stay_days', 'stay_censored']))
+        cached = OccupancyAnalyzer._cache.get(key)
+        if cached is not None:
+            return cached
+
+        valid = (df[start_column].notna() & df['stay_days'].notna() & df[shelter_column].notna()).to_numpy()
+        censored = (df['stay_censored'].to_numpy(dtype=bool) if 'stay_censored' in df.columns
+                    else np.zeros(len(df), dtype=bool))
+        implausible = valid & ~censored & (df['stay_days'].fillna(0).to_numpy(dtype=np.int64) > OccupancyAnalyzer.MAX_STAY_DAYS)
+        if implausible.any():
+            logger.warning(f"보호 기간이 {OccupancyAnalyzer.MAX_STAY_DAYS}일을 넘는 기록 {int(implausible.sum())}건은 "
+                           "결과일 오류로 보고 일별 보호 두수에서 제외합니다.")
+            valid = valid & ~implausible
+
+        start = df.loc[valid, start_column]
+        if start.empty:
+            return pd.DataFrame()
+
+        codes, shelters = pd.factorize(df.loc[valid, shelter_column], sort=True)
+        first_day = start.min().normalize()
+        start_idx = ((start - first_day).dt.days).to_numpy(dtype=np.int64)
+        # 입소일 범위 밖의 날짜는 만들지 않음 (메모리는 보호소 수 × 입소일 범위로 제한)
+        n_days = int(start_idx.max()) + 1
+        end_idx = np.minimum(start_idx + df.loc[valid, 'stay_days'].to_numpy(dtype=np.int64) + 1, n_days)
+
+        # (보호소, 날짜) 평면 인덱스에 +1/-1 이벤트 누적 후 날짜 방향 누적합
+        width = n_days + 1
+        size = len(shelters) * width
+        events = (np.bincount(codes * width + start_idx, minlength=size)
+                  - np.bincount(codes * width + end_idx, minlength=size))
+        occupancy = np.cumsum(events.reshape(len(shelters), width), axis=1)[:, :n_days]
+
+        result = pd.DataFrame(
+            occupancy.T.astype(np.int32),
+            index=pd.date_range(first_day, periods=n_days, freq='D', name='date'),
+            columns=pd.Index(shelters.astype(str), name=shelter_column)
+        )
+        logger.info(f"일별 보호 두수 계산 완료: 보호소 {len(shelters)}곳, {n_days}일")
+        return OccupancyAnalyzer._cache.put(key, result)
+
+    @staticmethod
+    def shelter_series(occupancy, shelters, start=None, end=None):
+        """
+        일별 보호 두수 행렬에서 선택한 보호소와 기간만 긴 형태로 추출
+
+        Parameters:
+        occupancy (pandas.DataFrame): daily_occupancy 결과
+        shelters (list): 보호소 목록
+        start: 시작일 (포함)
+        end: 종료일 (포함)
+
+        Returns:
+        pandas.DataFrame: date, shelter, occupancy 컬럼
+        """
+        columns = [s for s in shelters if s in occupancy.columns]
+        lo = occupancy.index.searchsorted(pd.Timestamp(start), side='left') if start is not None else 0
+        hi = occupancy.index.searchsorted(pd.Timestamp(end), side='right') if end is not None else len(occupancy)
+        window = occupancy.iloc[lo:hi][columns]
+        return window.rename_axis(columns='shelter').stack().rename('occupancy').reset_index()
+
+    @staticmethod
+    def peak_occupancy(occupancy):
+        """
+        보호소별 최대 보호 두수와 발생일, 평균 보호 두수
+
+        Parameters:
+        occupancy (pandas.DataFrame): daily_occupancy 결과
+
+        Returns:
+        pandas.DataFrame: shelter, peak, peak_date, mean 컬럼 (최대 보호 두수 내림차순)
+        """
+        if occupancy.empty:
+            return pd.DataFrame(columns=['shelter', 'peak', 'peak_date', 'mean'])
+
+        values = occupancy.to_numpy()
+        peak_pos = values.argmax(axis=0)
+        return pd.DataFrame({
+            'shelter': occupancy.columns,
+            'peak': values[peak_pos, np.arange(values.shape[1])],
+            'peak_date': occupancy.index[peak_pos],
+            'mean': values.mean(axis=0),
+        }).sort_values('peak', ascending=False, ignore_index=True)
@@ -0,0 +1,183 @@
+import logging
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class OutcomeAnalyzer:
+    """보호 결과(입양, 반환, 사망 등) 분석을 담당하는 클래스"""
+
+    # 처리 상태 -> 결과 분류
+    OUTCOME_CATEGORIES = {
+        '보호중': '보호중',
+        '입양': '입양됨',
+        '반환': '반환됨',
+        '자연사': '사망',
+        '안락사': '사망',
+        '방사': '기타',
+        '기증': '기타',
+        '기타': '기타'
+    }
+    OUTCOME_ORDER = ['보호중', '입양됨', '반환됨', '사망', '기타']
+
+    # 체중 구간
+    WEIGHT_BINS = [0, 5, 10, 15, 20, 25, 30, 100]
+    WEIGHT_LABELS = ['0-5kg', '5-10kg', '10-15kg', '15-20kg', '20-25kg', '25-30kg', '30kg+']
+
+    @staticmethod
+    def assign_outcome(df, state_column='process_state'):
+        """
+        처리 상태 컬럼을 결과 분류(category)로 변환하여 outcome 컬럼 추가
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        state_column (str): 처리 상태 컬럼명
+
+        Returns:
+        pandas.DataFrame: outcome 컬럼이 추가된 데이터프레임
+        """
+        outcome = df[state_column].map(OutcomeAnalyzer.OUTCOME_CATEGORIES).fillna('기타')
+        df['outcome'] = pd.Categorical(outcome, categories=OutcomeAnalyzer.OUTCOME_ORDER)
+        return df
+
+    @staticmethod
+    def assign_weight_band(df, weight_column='weight'):
+        """
+        체중 컬럼을 구간(category)으로 나누어 weight_band 컬럼 추가
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        weight_column (str): 체중 컬럼명
+
+        Returns:
+        pandas.DataFrame: weight_band 컬럼이 추가된 데이터프레임
+        """
+        df['weight_band'] = pd.cut(
+            df[weight_column],
+            bins=OutcomeAnalyzer.WEIGHT_BINS,
+            labels=OutcomeAnalyzer.WEIGHT_LABELS
+        )
+        return df
+
+    @staticmethod
+    def contingency_tables(df, factors, conditions=None):
+        """
+        요인별 결과 분할표를 한 번의 다중 키 groupby로 계산
+
+        전체 행은 (요인들 × 결과) 결합 분포로 한 번만 집계하고,
+        요인별 분할표는 작은 결합 분포에서 주변합으로 구합니다.
+
+        Parameters:
+        df (pandas.DataFrame): outcome 컬럼이 있는 데이터프레임
+        factors (list): 분석할 요인 컬럼 목록
+        conditions (dict): 요인별 추가 조건 (예: {'weight_band': {'animal_type': '개'}})
+
+        Returns:
+        pandas.DataFrame: factor, level, outcome, count 컬럼의 긴 형태 분할표
+        """
+        factors = [f for f in factors if f in df.columns]
+        conditions = conditions or {}
+        if not factors or 'outcome' not in df.columns:
+            return pd.DataFrame(columns=['factor', 'level', 'outcome', 'count'])
+
+        # 조건에만 쓰이는 컬럼도 결합 분포에 포함
+        keys = list(dict.fromkeys(
+            factors + [col for cond in conditions.values() for col in cond if col in df.columns]
+        ))
+        joint = df.groupby(keys + ['outcome'], observed=True, dropna=False).size()
+
+        tables = []
+        for factor in factors:
+            part = joint
+            for col, value in conditions.get(factor, {}).items():
+                part = part[part.index.get_level_values(col) == value]
+
+            # 결합 분포는 다른 요인의 결측 행도 세도록 결측을 유지하므로, 이 요인/결과가 결측인 행은 여기서 제외
+            # (문자열로 바꾸면 'nan' 수준이 생기므로 astype(str) 전에 제거, 기존 crosstab과 같은 결과)
+            table = part.groupby(level=[factor, 'outcome'], observed=True, dropna=True).sum()
+            table = table[table.index.get_level_values(factor).notna()
+                          & table.index.get_level_values('outcome').notna()]
+            if table.empty:
+                continue
+            table = table.unstack(fill_value=0).stack()
+            table = table.rename_axis(['level', 'outcome']).reset_index(name='count')
+            table.insert(0, 'factor', factor)
+            table['level'] = table['level'].astype(str)
+            table['outcome'] = table['outcome'].astype(str)
+            tables.append(table)
+
+        if not tables:
+            return pd.DataFrame(columns=['factor', 'level', 'outcome', 'count'])
+        return pd.concat(tables, ignore_index=True)
+
+    @staticmethod
+    def outcome_rates(table, confidence=0.95):
+        """
+        요인 수준별 결과 비율과 Wilson 신뢰구간 계산 (전체 요인 일괄 계산)
+
+        Parameters:
+        table (pandas.DataFrame): contingency_tables 결과
+        confidence (float): 신뢰수준
+
+        Returns:
+        pandas.DataFrame: total, rate, ci_low, ci_high 컬럼이 추가된 분할표
+        """
+        result = table.copy()
+        result['total'] = result.groupby(['factor', 'level'])['count'].transform('sum')
+
+        z = stats.norm.ppf(0.5 + confidence / 2)
+        n = result['total'].to_numpy(dtype=float)
+        k = result['count'].to_numpy(dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = k / n
+            denom = 1 + z ** 2 / n
+            center = (p + z ** 2 / (2 * n)) / denom
+            margin = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+
+        result['rate'] = p
+        result['ci_low'] = np.clip(center - margin, 0, 1)
+        result['ci_high'] = np.clip(center + margin, 0, 1)
+        return result
+
+    @staticmethod
+    def chi_square_tests(table):
+        """
+        요인별 독립성 카이제곱 검정 (전체 요인 일괄 계산)
+
+        Parameters:
+        table (pandas.DataFrame): contingency_tables 결과
+
+        Returns:
+        pandas.DataFrame: factor, chi2, dof, p_value, cramers_v 컬럼의 검정 결과
+        """
+        if table.empty:
+            return pd.DataFrame(columns=['factor', 'chi2', 'dof', 'p_value', 'cramers_v'])
+
+        t = table[['factor', 'level', 'outcome', 'count']].copy()
+        row_total = t.groupby(['factor', 'level'])['count'].transform('sum')
+        col_total = t.groupby(['factor', 'outcome'])['count'].transform('sum')
+        grand_total = t.groupby('factor')['count'].transform('sum')
+
+        # 빈 행/열은 자유도에서 제외
+        t = t[(row_total > 0) & (col_total > 0)]
+        expected = (row_total * col_total / grand_total)[t.index]
+        t['contrib'] = (t['count'] - expected) ** 2 / expected
+
+        grouped = t.groupby('factor', sort=False)
+        result = pd.DataFrame({
+            'chi2': grouped['contrib'].sum(),
+            'n_levels': grouped['level'].nunique(),
+            'n_outcomes': grouped['outcome'].nunique(),
+            'n': grouped['count'].sum(),
+        })
+        result['dof'] = (result['n_levels'] - 1) * (result['n_outcomes'] - 1)
+        result['p_value'] = stats.chi2.sf(result['chi2'], result['dof'].clip(lower=1))
+        result.loc[result['dof'] == 0, 'p_value'] = np.nan
+
+        min_dim = (result[['n_levels', 'n_outcomes']].min(axis=1) - 1).clip(lower=1)
+        result['cramers_v'] = np.sqrt(result['chi2'] / (result['n'] * min_dim))
+
+        return result.reset_index()[['factor', 'chi2', 'dof', 'p_value', 'cramers_v']]
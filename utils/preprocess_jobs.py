@@ -0,0 +1,200 @@
+import io
+import uuid
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.data_loader import DataLoader
+from utils.data_processor import AnimalDataProcessor
+from utils.rule_set import RuleSet
+from utils.shared_dataset import SharedDataset
+from utils.stratified_sample import StratifiedSample
+from utils.sketches import DatasetSketch
+from utils.utils import ResultCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class PreprocessCancelled(Exception):
+    """전처리 작업이 취소되었을 때 발생하는 예외"""
+
+
+class PreprocessJob:
+    """업로드 파일 한 개의 백그라운드 전처리 작업 상태"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, file_name, digest):
+        """
+        초기화 함수
+
+        Parameters:
+        file_name (str): 업로드된 파일명
+        digest (str): 파일 내용과 전처리 설정의 해시
+        """
+        self.job_id = uuid.uuid4().hex[:12]
+        self.file_name = file_name
+        self.digest = digest
+        self.status = self.QUEUED
+        self.stage = '대기 중'
+        self.step = 0
+        self.total_steps = len(AnimalDataProcessor.PREPROCESS_STAGES) + 2
+        self.dataset_key = None
+        self.error = None
+        # 전처리는 끝났지만 예외로 건너뛴 처리 (처리명, 오류 메시지)
+        self.stage_errors = []
+        self._cancel_event = threading.Event()
+
+    @property
+    def progress(self):
+        """진행률 (0~1)"""
+        if self.status == self.DONE:
+            return 1.0
+        return min(self.step / self.total_steps, 1.0)
+
+    @property
+    def finished(self):
+        """작업 종료 여부 (완료/실패/취소)"""
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def cancel(self):
+        """작업 취소 요청 (진행 중인 단계가 끝난 뒤 중단)"""
+        self._cancel_event.set()
+        if self.status == self.QUEUED:
+            self.status = self.CANCELLED
+
+    def _advance(self, step, label):
+        """단계 진행 기록 (취소 요청이 있으면 중단)"""
+        if self._cancel_event.is_set():
+            raise PreprocessCancelled()
+        self.step = step
+        self.stage = label
+
+
+class PreprocessJobManager:
+    """업로드 파일 전처리를 백그라운드 스레드에서 실행하고 결과를 캐시하는 클래스"""
+
+    _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='preprocess')
+    _lock = threading.Lock()
+
+    # 작업 ID -> 작업, 내용 해시 -> 진행 중이거나 완료된 작업 ID
+    _jobs = {}
+    _jobs_by_digest = {}
+
+    # 내용 해시 -> (공유 데이터셋 키, 건너뛴 처리 목록) (같은 파일 재업로드 시 즉시 사용)
+    _results = ResultCache(max_entries=32)
+
+    # 보관할 종료된 작업 수
+    MAX_FINISHED_JOBS = 64
+
+    @staticmethod
+    def content_digest(data, string_storage=None, ml_fallback=False):
+        """
+        파일 내용과 전처리 설정(문자열 저장 방식, 보조 분류 사용 여부, 규칙 버전)으로 캐시 키 계산
+
+        Parameters:
+        data (bytes): 업로드된 파일 내용
+        string_storage (str): 문자열 저장 방식
+        ml_fallback (bool): 학습 모델 보조 분류 사용 여부
+
+        Returns:
+        str: 해시 문자열
+        """
+        digest = hashlib.sha1(data)
+        digest.update(f"|{string_storage}|{bool(ml_fallback)}|{RuleSet.current().version}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def submit(file_name, data, digest=None, string_storage=None, ml_fallback=False):
+        """
+        업로드 파일 전처리 작업 등록
+
+        같은 내용의 작업이 진행 중이면 그 작업을, 이미 처리한 파일이면 완료된 작업을 반환합니다.
+
+        Parameters:
+        file_name (str): 업로드된 파일명
+        data (bytes): 업로드된 파일 내용
+        digest (str): content_digest 결과 (None이면 계산)
+        string_storage (str): 문자열 저장 방식
+        ml_fallback (bool): 학습 모델 보조 분류 사용 여부
+
+        Returns:
+        PreprocessJob: 전처리 작업
+        """
+        digest = digest or PreprocessJobManager.content_digest(data, string_storage, ml_fallback)
+
+        with PreprocessJobManager._lock:
+            job = PreprocessJobManager._jobs.get(PreprocessJobManager._jobs_by_digest.get(digest))
+            if job is not None and job.status not in (PreprocessJob.FAILED, PreprocessJob.CANCELLED):
+                # 완료된 작업이라도 결과 데이터셋이 정리되었으면 다시 처리
+                if job.status != PreprocessJob.DONE or SharedDataset.open(job.dataset_key) is not None:
+                    return job
+
+            job = PreprocessJob(file_name, digest)
+            cached = PreprocessJobManager._results.get(digest)
+            if cached is not None and SharedDataset.open(cached[0]) is not None:
+                job.status, job.stage = PreprocessJob.DONE, '완료 (캐시)'
+                job.dataset_key, job.stage_errors = cached
+            else:
+                PreprocessJobManager._executor.submit(PreprocessJobManager._run, job, data, string_storage, ml_fallback)
+
+            PreprocessJobManager._jobs[job.job_id] = job
+            PreprocessJobManager._jobs_by_digest[digest] = job.job_id
+            PreprocessJobManager._prune()
+        return job
+
+    @staticmethod
+    def get(job_id):
+        """작업 ID로 작업 조회 (없으면 None)"""
+        return PreprocessJobManager._jobs.get(job_id)
+
+    @staticmethod
+    def _run(job, data, string_storage, ml_fallback=False):
+        """작업 스레드에서 파일 로드 → 전처리 → 공유 데이터셋 등록"""
+        if job.status == PreprocessJob.CANCELLED:
+            return
+        job.status = PreprocessJob.RUNNING
+        try:
+            job._advance(0, '파일 읽기')
+            buffer = io.BytesIO(data)
+            buffer.name = job.file_name
+            df = DataLoader.load_from_uploaded_file(buffer, string_storage=string_storage)
+            if df is None:
+                raise ValueError("데이터를 로드할 수 없습니다.")
+
+            processor = AnimalDataProcessor(df, string_storage=string_storage, ml_fallback=ml_fallback)
+            processed_df = processor.preprocess_data(
+                progress_callback=lambda step, total, label: job._advance(step + 1, label)
+            )
+
+            job._advance(job.total_steps - 1, '공유 데이터셋 저장')
+            job.dataset_key = SharedDataset.publish(processed_df)
+            # 큰 데이터셋은 근사 모드용 층화 표본과 상위 값/고유값 요약도 함께 준비
+            StratifiedSample.publish(job.dataset_key)
+            DatasetSketch.prepare(job.dataset_key)
+            job.stage_errors = list(processor.stage_errors)
+            PreprocessJobManager._results.put(job.digest, (job.dataset_key, job.stage_errors))
+            job.stage = '완료'
+            job.status = PreprocessJob.DONE
+            logger.info(f"업로드 전처리 작업 완료: {job.job_id} ({job.file_name})")
+        except PreprocessCancelled:
+            job.stage = '취소됨'
+            job.status = PreprocessJob.CANCELLED
+            logger.info(f"업로드 전처리 작업 취소: {job.job_id}")
+        except Exception as e:
+            job.error = str(e)
+            job.status = PreprocessJob.FAILED
+            logger.error(f"업로드 전처리 작업 실패: {job.job_id}: {e}")
+
+    @staticmethod
+    def _prune():
+        """오래된 종료 작업 정리 (호출 측에서 잠금 보유)"""
+        finished = [job_id for job_id, job in PreprocessJobManager._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - PreprocessJobManager.MAX_FINISHED_JOBS, 0)]:
+            job = PreprocessJobManager._jobs.pop(job_id)
+            if PreprocessJobManager._jobs_by_digest.get(job.digest) == job_id:
+                del PreprocessJobManager._jobs_by_digest[job.digest]
@@ -0,0 +1,154 @@
+import re
+import time
+import logging
+import threading
+from utils.utils import ResultCache
+from utils.shared_dataset import SharedDataset
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class QueryError(Exception):
+    """SQL 질의를 실행할 수 없을 때 발생하는 예외"""
+
+
+class QueryEngine:
+    """
+    공유 데이터셋(메모리 매핑된 Arrow 테이블)에 대한 내장 DuckDB SQL 질의를 담당하는 클래스
+
+    데이터는 `animals` 테이블로 노출되며 pandas로 옮기지 않고 Arrow 버퍼를 직접 스캔합니다.
+    """
+
+    TABLE_NAME = 'animals'
+
+    # 결과로 가져올 최대 행 수
+    MAX_ROWS = 10000
+
+    # 읽기 전용 질의만 허용
+    READ_ONLY_PATTERN = re.compile(r'^\s*(?:SELECT|WITH|DESCRIBE|SUMMARIZE|PIVOT|UNPIVOT|FROM)\b', re.IGNORECASE)
+    PARAMETER_PATTERN = re.compile(r'\$([A-Za-z_]\w*)')
+    # 문자열 리터럴('...', ''는 이스케이프), 따옴표 식별자("..."), 주석 (파라미터/구문 검사에서 제외)
+    NON_CODE_PATTERN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+    # 데이터셋 키 -> (DuckDB 연결, 등록할 Arrow 테이블), (데이터셋 키, 질의, 파라미터) -> 결과
+    # (연결이 테이블을 붙잡고 있으므로 공유 데이터셋처럼 최근에 쓴 것만 유지)
+    _connections = ResultCache(max_entries=SharedDataset.MAX_OPEN)
+    _lock = threading.Lock()
+    _cache = ResultCache(max_entries=64)
+
+    @staticmethod
+    def available():
+        """duckdb 설치 여부 확인"""
+        try:
+            import duckdb  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @staticmethod
+    def parameters(sql):
+        """
+        질의에 사용된 이름 있는 파라미터($name) 목록 (등장 순서, 중복 제거)
+
+        문자열 리터럴, 따옴표 식별자, 주석 안의 $name은 파라미터가 아닙니다.
+
+        Parameters:
+        sql (str): SQL 질의
+
+        Returns:
+        list: 파라미터 이름 목록
+        """
+        return list(dict.fromkeys(QueryEngine.PARAMETER_PATTERN.findall(QueryEngine._code_only(sql))))
+
+    @staticmethod
+    def execute(dataset_key, sql, params=None, max_rows=None):
+        """
+        공유 데이터셋에 읽기 전용 SQL 질의 실행 (같은 데이터셋/질의/파라미터 결과는 캐시)
+
+        Parameters:
+        dataset_key (str): 공유 데이터셋 키
+        sql (str): SQL 질의 (`animals` 테이블 사용, 파라미터는 $name)
+        params (dict): 파라미터 값
+        max_rows (int): 가져올 최대 행 수 (기본: MAX_ROWS)
+
+        Returns:
+        tuple: (결과 데이터프레임, 잘림 여부, 실행 시간(초), 캐시 사용 여부)
+        """
+        sql = sql.strip().rstrip(';').strip()
+        code = QueryEngine._code_only(sql)
+        if not QueryEngine.READ_ONLY_PATTERN.match(code):
+            raise QueryError("SELECT/WITH로 시작하는 조회 질의만 실행할 수 있습니다.")
+        if ';' in code:
+            raise QueryError("한 번에 하나의 질의만 실행할 수 있습니다.")
+
+        params = {name: (params or {}).get(name) for name in QueryEngine.parameters(sql)}
+        max_rows = max_rows or QueryEngine.MAX_ROWS
+        key = (dataset_key, sql, tuple(sorted(params.items())), max_rows)
+        cached = QueryEngine._cache.get(key)
+        if cached is not None:
+            result, truncated, elapsed = cached
+            return result, truncated, elapsed, True
+
+        cursor = QueryEngine._cursor(dataset_key)
+        try:
+            start = time.perf_counter()
+            # 한 행 더 가져와 잘림 여부 판단
+            limited = f"SELECT * FROM ({sql}) LIMIT {max_rows + 1}"
+            result = (cursor.execute(limited, params) if params else cursor.execute(limited)).df()
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            raise QueryError(str(e)) from e
+        finally:
+            cursor.close()
+
+        truncated = len(result) > max_rows
+        result = result.iloc[:max_rows]
+        logger.info(f"SQL 질의 실행 완료: {len(result)} 행, {elapsed:.3f}초")
+        QueryEngine._cache.put(key, (result, truncated, elapsed))
+        return result, truncated, elapsed, False
+
+    @staticmethod
+    def columns(dataset_key):
+        """
+        `animals` 테이블의 컬럼명과 타입
+
+        Returns:
+        pandas.DataFrame: column_name, column_type 컬럼
+        """
+        result, _, _, _ = QueryEngine.execute(dataset_key, f"DESCRIBE {QueryEngine.TABLE_NAME}")
+        return result[['column_name', 'column_type']]
+
+    @staticmethod
+    def _code_only(sql):
+        """문자열 리터럴, 따옴표 식별자, 주석을 공백으로 바꾼 질의 (구문 검사용)"""
+        return QueryEngine.NON_CODE_PATTERN.sub(' ', sql)
+
+    @staticmethod
+    def _cursor(dataset_key):
+        """데이터셋 키별 DuckDB 연결에서 `animals` 테이블이 등록된 커서 생성 (스레드별 사용)"""
+        entry = QueryEngine._connections.get(dataset_key)
+        if entry is None:
+            import duckdb
+
+            with QueryEngine._lock:
+                entry = QueryEngine._connections.get(dataset_key)
+                if entry is None:
+                    source = SharedDataset.table(dataset_key)
+                    if source is None:
+                        # pyarrow가 없으면 공유 데이터프레임을 그대로 등록
+                        source = SharedDataset.open(dataset_key)
+                        if source is None:
+                            raise QueryError("데이터셋을 찾을 수 없습니다.")
+                        source = source.reset_index(drop=True)
+
+                    # 질의에서 외부 파일을 읽거나 쓰지 못하도록 차단
+                    con = duckdb.connect(':memory:')
+                    con.execute("SET enable_external_access = false")
+                    con.execute("SET lock_configuration = true")
+                    entry = QueryEngine._connections.put(dataset_key, (con, source))
+
+        con, source = entry
+        # 등록한 테이블은 연결(커서)마다 따로 보이므로 커서에 다시 등록 (데이터 복사 없음)
+        cursor = con.cursor()
+        cursor.register(QueryEngine.TABLE_NAME, source)
+        return cursor
@@ -0,0 +1,310 @@
+"""
+대시보드 페이지의 차트를 필터(예: 시도)별 정적 HTML/PNG 보고서로 일괄 생성
+
+사용법:
+    python -m utils.report_snapshot [--file data/abandonment_public.csv | --dataset-key KEY]
+        [--by sido] [--values 서울특별시 경기도] [--pages main_dashboard time_pattern]
+        [--format html png] [--output reports] [--workers 8]
+"""
+import os
+import re
+import html
+import json
+import time
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from utils.chart_data import ChartData
+from utils.shared_dataset import SharedDataset, DEFAULT_CACHE_DIR
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 보고서에 넣는 페이지 (이름 -> (제목, 모듈, 페이지 함수)) - 메뉴 순서
+REPORT_PAGES = {
+    'main_dashboard': ('메인 대시보드', 'page_modules.main_dashboard', 'show_main_dashboard'),
+    'animal_traits': ('동물 특성 분석', 'page_modules.animal_traits', 'show_animal_traits'),
+    'location_analysis': ('지역 및 발견 장소 분석', 'page_modules.location_analysis', 'show_location_analysis'),
+    'time_pattern': ('시간 패턴 분석', 'page_modules.time_pattern', 'show_time_pattern'),
+    'survival_factors': ('생존 요인 분석', 'page_modules.survival_factors', 'show_survival_factors'),
+    'shelter_analysis': ('보호소 분석', 'page_modules.shelter_analysis', 'show_shelter_analysis'),
+}
+
+# 필터 없이 전체 데이터로 만드는 보고서의 필터 값
+ALL_VALUES = '전체'
+
+
+def _render_page(task):
+    """
+    필터 값 하나와 페이지 하나의 차트를 만들어 파일로 저장 (프로세스 풀 작업 단위)
+
+    같은 데이터셋/필터/페이지의 차트는 JSON으로 캐시해 다시 계산하지 않으며,
+    공유 데이터셋은 작업 프로세스마다 한 번만 메모리 매핑합니다.
+
+    Parameters:
+    task (dict): dataset_key, cache_dir, column, value, page, figure_cache, outputs, formats
+
+    Returns:
+    dict: value, page, figures, cached, seconds, error
+    """
+    import importlib
+    import plotly.io as pio
+
+    started = time.time()
+    result = {'value': task['value'], 'page': task['page'], 'figures': 0, 'cached': False, 'error': None}
+    try:
+        if os.path.exists(task['figure_cache']):
+            with open(task['figure_cache'], encoding='utf-8') as f:
+                figures = [pio.from_json(text) for text in json.load(f)]
+            result['cached'] = True
+        else:
+            df = _filtered_frame(task['dataset_key'], task['cache_dir'], task['column'], task['value'])
+            _, module, function = REPORT_PAGES[task['page']]
+            show_page = getattr(importlib.import_module(module), function)
+            with ChartData.capture() as figures:
+                show_page(df)
+            _write_atomic(task['figure_cache'], json.dumps([fig.to_json() for fig in figures]))
+
+        result['figures'] = len(figures)
+        if 'html' in task['formats']:
+            _write_atomic(task['outputs']['html'], _page_html(task, figures))
+        if 'png' in task['formats']:
+            for i, fig in enumerate(figures):
+                fig.write_image(task['outputs']['png'].format(index=i + 1), width=1200, height=600)
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.time() - started
+    return result
+
+
+# 작업 프로세스에서 마지막으로 만든 필터 결과 ((키, 컬럼, 값), 데이터프레임)
+_last_view = (None, None)
+
+
+def _filtered_frame(dataset_key, cache_dir, column, value):
+    """공유 데이터셋에서 필터 값에 해당하는 행 (같은 필터의 연속 작업은 재사용)"""
+    global _last_view
+    view_key = (dataset_key, column, value)
+    if _last_view[0] != view_key:
+        frame = SharedDataset.open(dataset_key, cache_dir)
+        if frame is None:
+            raise ValueError(f"공유 데이터셋을 찾을 수 없습니다: {dataset_key}")
+        mask = None if value == ALL_VALUES else (frame[column].astype(object) == value).to_numpy(dtype=bool)
+        _last_view = (view_key, SharedDataset.view(dataset_key, mask, cache_dir))
+    return _last_view[1]
+
+
+def _page_html(task, figures):
+    """차트 목록을 plotly.min.js를 공유하는 HTML 문서로 변환"""
+    title = f"{REPORT_PAGES[task['page']][0]} - {task['value']}"
+    body = ''.join(
+        f'<div class="chart">{fig.to_html(full_html=False, include_plotlyjs=False)}</div>' for fig in figures
+    ) or '<p>표시할 차트가 없습니다.</p>'
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+        f'<title>{html.escape(title)}</title><script src="plotly.min.js"></script></head>'
+        f'<body><h1>{html.escape(title)}</h1><p><a href="index.html">목록</a></p>{body}</body></html>'
+    )
+
+
+def _write_atomic(path, text):
+    """임시 파일에 쓴 뒤 교체 (동시에 읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _quiet_streamlit():
+    """작업 프로세스에서 Streamlit 런타임 없이 페이지를 실행할 때 나오는 경고 숨김"""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    config.set_option('logger.level', 'error')
+    set_log_level('error')
+
+
+class ReportSnapshot:
+    """
+    공유 데이터셋 하나로 페이지별 차트를 필터 값마다 정적 파일로 만드는 클래스
+
+    페이지 함수를 Streamlit 런타임 없이 실행해 ChartData.show로 그리는 차트를 모으므로
+    화면과 같은 차트가 나오며, 위젯은 기본값으로 동작합니다.
+    (필터 값, 페이지) 작업을 프로세스 풀에서 병렬로 실행하고, 같은 필터 값의 페이지는
+    한 작업 묶음으로 보내 필터 결과를 재사용합니다.
+    """
+
+    # 차트 캐시 형식 버전 (페이지 구성이 바뀌면 올려서 이전 캐시를 무효화)
+    CACHE_VERSION = 1
+
+    FORMATS = ['html', 'png']
+
+    def __init__(self, dataset_key, output_dir='reports', cache_dir=None):
+        """
+        초기화 함수
+
+        Parameters:
+        dataset_key (str): 보고서를 만들 공유 데이터셋 키
+        output_dir (str): 보고서 파일 저장 디렉토리
+        cache_dir (str): 공유 데이터셋/차트 캐시 디렉토리
+        """
+        self.dataset_key = dataset_key
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.figure_dir = os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'reports', dataset_key)
+        if SharedDataset.open(dataset_key, cache_dir) is None:
+            raise ValueError(f"공유 데이터셋을 찾을 수 없습니다: {dataset_key}")
+
+    @staticmethod
+    def png_available():
+        """PNG 저장에 필요한 kaleido 설치 여부"""
+        try:
+            import kaleido  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def filter_values(self, column='sido', values=None, include_all=True):
+        """
+        보고서를 만들 필터 값 목록 (기본: 컬럼의 모든 값, 건수 내림차순, '미상' 제외)
+
+        Parameters:
+        column (str): 필터 컬럼
+        values (list): 사용할 값 (None이면 전체)
+        include_all (bool): 필터 없는 전체 보고서 포함 여부
+
+        Returns:
+        list: 필터 값 목록
+        """
+        frame = SharedDataset.open(self.dataset_key, self.cache_dir)
+        if column not in frame.columns:
+            raise ValueError(f"데이터에 {column} 컬럼이 없습니다.")
+        if values is None:
+            counts = frame[column].astype(object).value_counts()
+            values = [value for value in counts.index if value != '미상']
+        return ([ALL_VALUES] if include_all else []) + list(values)
+
+    def tasks(self, column, values, pages, formats):
+        """(필터 값, 페이지) 작업 목록 생성"""
+        tasks = []
+        for value in values:
+            slug = re.sub(r'[^0-9A-Za-z가-힣_-]+', '_', str(value))
+            for page in pages:
+                digest = hashlib.sha1(
+                    json.dumps([self.CACHE_VERSION, column, str(value), page], ensure_ascii=False).encode('utf-8')
+                ).hexdigest()[:16]
+                base = os.path.join(self.output_dir, f"{slug}_{page}")
+                tasks.append({
+                    'dataset_key': self.dataset_key, 'cache_dir': self.cache_dir,
+                    'column': column, 'value': value, 'page': page, 'formats': formats,
+                    'figure_cache': os.path.join(self.figure_dir, f"{digest}.json"),
+                    'outputs': {'html': f"{base}.html", 'png': f"{base}_{{index:02d}}.png"},
+                })
+        return tasks
+
+    def generate(self, column='sido', values=None, pages=None, formats=('html',), include_all=True, workers=None):
+        """
+        필터 값 x 페이지 보고서 생성
+
+        Parameters:
+        column (str): 필터 컬럼 (기본: sido)
+        values (list): 필터 값 (None이면 컬럼의 모든 값)
+        pages (list): REPORT_PAGES 중 생성할 페이지 (None이면 전체)
+        formats (tuple): 'html', 'png' 중 생성할 형식
+        include_all (bool): 필터 없는 전체 보고서 포함 여부
+        workers (int): 작업 프로세스 수 (기본: CPU 수, 1이면 순차 실행)
+
+        Returns:
+        pandas.DataFrame: value, page, figures, cached, seconds, error 컬럼의 작업 결과
+        """
+        pages = list(pages or REPORT_PAGES)
+        unknown = [page for page in pages if page not in REPORT_PAGES]
+        if unknown:
+            raise ValueError(f"알 수 없는 페이지: {', '.join(unknown)}")
+        formats = [fmt for fmt in formats if fmt in self.FORMATS]
+        if 'png' in formats and not self.png_available():
+            logger.warning("kaleido가 설치되어 있지 않아 PNG는 만들지 않습니다.")
+            formats.remove('png')
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.figure_dir, exist_ok=True)
+        values = self.filter_values(column, values, include_all)
+        tasks = self.tasks(column, values, pages, formats)
+        if 'html' in formats:
+            self._write_plotlyjs()
+
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+        logger.info(f"보고서 생성 시작: 필터 {len(values)}개 x 페이지 {len(pages)}개, 작업 프로세스 {workers}개")
+        started = time.time()
+        if workers > 1:
+            # 같은 필터 값의 페이지가 한 프로세스로 가도록 페이지 수 단위로 묶어 보냄
+            with ProcessPoolExecutor(max_workers=workers, initializer=_quiet_streamlit) as executor:
+                results = list(executor.map(_render_page, tasks, chunksize=len(pages)))
+        else:
+            _quiet_streamlit()
+            results = [_render_page(task) for task in tasks]
+
+        results = pd.DataFrame(results, columns=['value', 'page', 'figures', 'cached', 'seconds', 'error'])
+        if 'html' in formats:
+            self._write_index(results, column)
+        failed = results['error'].notna().sum()
+        logger.info(f"보고서 생성 완료: {len(results)}개 작업 ({time.time() - started:.1f}초, "
+                    f"캐시 사용 {int(results['cached'].sum())}개, 실패 {failed}개) -> {self.output_dir}")
+        return results
+
+    def _write_plotlyjs(self):
+        """HTML 보고서가 함께 쓰는 plotly.min.js를 한 번만 저장"""
+        path = os.path.join(self.output_dir, 'plotly.min.js')
+        if not os.path.exists(path):
+            from plotly.offline import get_plotlyjs
+            _write_atomic(path, get_plotlyjs())
+
+    def _write_index(self, results, column):
+        """필터 값 x 페이지 링크 표 (index.html)"""
+        tasks = {(task['value'], task['page']): task for task in self.tasks(column, results['value'].unique(),
+                                                                           results['page'].unique(), ['html'])}
+        pages = list(results['page'].unique())
+        header = ''.join(f'<th>{html.escape(REPORT_PAGES[page][0])}</th>' for page in pages)
+        rows = []
+        for value, group in results.groupby('value', sort=False):
+            cells = []
+            for page in pages:
+                row = group[group['page'] == page]
+                if row.empty or pd.notna(row['error'].iloc[0]):
+                    cells.append('<td>실패</td>')
+                else:
+                    href = os.path.basename(tasks[(value, page)]['outputs']['html'])
+                    cells.append(f'<td><a href="{html.escape(href)}">차트 {int(row["figures"].iloc[0])}개</a></td>')
+            rows.append(f'<tr><th>{html.escape(str(value))}</th>{"".join(cells)}</tr>')
+        _write_atomic(os.path.join(self.output_dir, 'index.html'), (
+            '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>유기동물 데이터 보고서</title></head>'
+            f'<body><h1>유기동물 데이터 보고서</h1><p>데이터셋 {html.escape(self.dataset_key)}, 필터: {html.escape(column)}</p>'
+            f'<table border="1"><tr><th></th>{header}</tr>{"".join(rows)}</table></body></html>'
+        ))
+
+
+if __name__ == '__main__':
+    from utils.aggregate_api import publish_file
+
+    parser = argparse.ArgumentParser(description="대시보드 페이지 정적 보고서 일괄 생성")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--file', default=os.path.join('data', 'abandonment_public.csv'),
+                        help="전처리할 데이터 파일 (기본: data/abandonment_public.csv)")
+    source.add_argument('--dataset-key', help="이미 저장된 공유 데이터셋 키")
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--by', default='sido', help="필터 컬럼 (기본: sido)")
+    parser.add_argument('--values', nargs='+', default=None, help="필터 값 (기본: 컬럼의 모든 값)")
+    parser.add_argument('--no-all', action='store_true', help="필터 없는 전체 보고서 제외")
+    parser.add_argument('--pages', nargs='+', default=None, choices=list(REPORT_PAGES))
+    parser.add_argument('--format', nargs='+', default=['html'], choices=ReportSnapshot.FORMATS)
+    parser.add_argument('--output', default='reports')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    key = args.dataset_key or publish_file(args.file, args.cache_dir)
+    report = ReportSnapshot(key, args.output, args.cache_dir)
+    summary = report.generate(args.by, args.values, args.pages, args.format, not args.no_all, args.workers)
+    failed = summary[summary['error'].notna()]
+    if not failed.empty:
+        print(failed[['value', 'page', 'error']].to_string(index=False))
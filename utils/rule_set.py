@@ -0,0 +1,315 @@
+import os
+import re
+import json
+import logging
+import threading
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 외부 규칙 설정 파일 경로 (환경 변수로 변경 가능)
+DEFAULT_RULES_PATH = os.environ.get('ANIMAL_RULES_PATH', os.path.join('data', 'rules.json'))
+
+# 내장 기본 규칙 (외부 설정 파일이 없거나 일부 키가 빠진 경우 사용)
+DEFAULT_RULES = {
+    'version': 'builtin-1',
+
+    # 색상 및 패턴 키워드 통합 사전
+    'color_patterns': {
+        # 기본 색상
+        '검정': ['검정', '검정색', '검은색', '검', '흑색', '흑', '블랙'],
+        '흰색': ['흰색', '흰', '백색', '백', '하얀색', '아이보리', '크림색', '크림', '화이트'],
+        '갈색': ['갈색', '갈', '연갈색', '연갈', '황갈색', '황토색', '브라운', '밤갈색', '초콜릿색'],
+        '노랑': ['황색', '노랑', '노란색', '노랑색', '황', '금색', '옐로우', '누런색'],
+        '회색': ['회색', '회', '그레이', '그레이색'],
+
+        # 무늬/패턴
+        '고등어무늬': ['고등어', '고등어색', '고등어태비'],
+        '치즈무늬': ['치즈', '치즈색', '치즈태비'],
+        '턱시도무늬': ['턱시도'],
+        '태비무늬': ['태비'],
+        '호피무늬': ['호피']
+    },
+
+    # 색상 카테고리 정의
+    'color_types': {
+        '단색': ['검정', '흰색', '갈색', '노랑', '회색'],
+        '무늬': ['고등어무늬', '치즈무늬', '턱시도무늬', '태비무늬', '호피무늬']
+    },
+
+    # 색상 필터링: ~동, ~구, ~시, ~로 포함 되는 경우 미상으로 처리
+    'color_noise_pattern': r'(?:동|구|시|리|면|부근|길)',
+
+    # 장소 유형 매핑
+    'place_type_mapping': {
+        '공공기관': ['소방서', '구청', '시청', '경찰서', '주민센터', '학교', '대학', '도서관', '우체국', '공공기관', '사무소', '청사', '센터'],
+        '상업시설': ['마트', '시장', '상가', '쇼핑', '편의점', '백화점', '매장', '가게', '식당', '카페', '음식점', '마을회관', '슈퍼'],
+        '주거지역': ['아파트', '주택', '빌라', '마을', '차', '단지', '동네', '오피스텔', '다세대'],
+        '도로변': ['로', '길', '도로', '거리', '대로', '번길', '버스', '버스정류장', '교차로', '사거리', '고가', '다리', '철길', '지하도'],
+        '공원': ['공원', '산책로', '광장', '정원', '산', '숲', '강', '하천', '계곡', '저수지', '호수', '유원지', '놀이터'],
+        '농촌지역': ['농장', '논', '밭', '과수원', '농지', '축사', '목장', '양식장', '비닐하우스', '창고'],
+        '공사장': ['공사장', '건설', '공사', '폐가', '폐건물', '공터', '빈터', '유휴지'],
+        '교통시설': ['역', '지하철', '기차', '고속도로', '휴게소', '주차장', '정류소', '환승센터', '공항', '철도'],
+        '종교시설': ['교회', '성당', '사찰', '절', '묘지', '납골당', '종교'],
+    },
+
+    # 시설 특성 매핑
+    'facility_type_mapping': {
+        '소방서': ['소방서', '119', '구조대', '안전센터'],
+        '병원': ['병원', '의원', '보건소', '진료소', '의료', '약국', '동물병원', '의료원'],
+        '관공서': ['시청', '구청', '동사무소', '주민센터', '관공서', '군청', '행정', '관리사무소', '공단', '공사'],
+        '버스정류장': ['버스', '정류장', '버스정류장', '터미널', '승강장'],
+        '교육시설': ['학교', '유치원', '어린이집', '대학교', '학원', '도서관', '연구소', '교육', '훈련원', '대학'],
+        '복지시설': ['복지관', '경로당', '양로원', '보육원', '쉼터', '보호소', '재활원'],
+        '체육시설': ['체육관', '운동장', '구장', '경기장', '스포츠센터', '수영장', '헬스장', '골프장'],
+        '공원및녹지': ['공원', '놀이터', '광장', '정원', '산책로', '녹지', '휴식공간'],
+        '상업시설': ['상가', '시장', '마트', '슈퍼', '편의점', '매장', '백화점', '쇼핑', '상점'],
+        '식음료': ['식당', '카페', '음식점', '레스토랑', '주점', '호프', '분식'],
+        '주거시설': ['아파트', '주택', '빌라', '오피스텔', '다세대', '기숙사', '생활관'],
+        '산업시설': ['공장', '창고', '물류', '산업', '연구소', '단지'],
+        '철도시설': ['역', '기차역', '지하철역', '철도', '전철', '지하철', 'KTX', 'SRT', '광역철도'],
+        '터미널': ['터미널', '고속버스', '시외버스', '환승센터', '공항'],
+        '기타': [],
+    },
+
+    # 장소 유형 우선순위 정의
+    'priority_order': [
+        '공공기관', '상업시설', '교육시설', '병원', '종교시설', '복지시설',
+        '공원', '주거지역', '농촌지역', '도로변', '교통시설', '공사장'
+    ],
+
+    # 주소 시도 목록
+    'sido_names': [
+        '서울특별시', '부산광역시', '대구광역시', '인천광역시', '광주광역시', '대전광역시',
+        '울산광역시', '세종특별자치시', '경기도', '강원도', '충청북도', '충청남도',
+        '전라북도', '전라남도', '경상북도', '경상남도', '제주특별자치도'
+    ],
+
+    # 표준 품종명 -> 표기 변형 (띄어쓰기/기호/대소문자는 비교 시 무시,
+    # 품종명의 첫 글자부터 일치하고 단어 경계에서 끝나야 함 - 예: '진도 믹스'는 '진도'로 찾지만 '코카푸'는 '코카'로 찾지 않음)
+    'breed_aliases': {
+        # 개
+        '말티즈': ['말티즈', '말티스', '몰티즈', '마르티즈', 'maltese'],
+        '푸들': ['푸들', '토이푸들', '미니어처푸들', '미니푸들', '푸우들', 'poodle'],
+        '스탠다드 푸들': ['스탠다드푸들', '스탠더드푸들', 'standardpoodle'],
+        '포메라니안': ['포메라니안', '포메라이언', '포메리안', '포메', 'pomeranian'],
+        '시츄': ['시츄', '시추', '시쥬', '시즈', 'shihtzu'],
+        '치와와': ['치와와', '치아와', 'chihuahua'],
+        '요크셔테리어': ['요크셔테리어', '요크셔', '요크셔테리아', '요키', 'yorkshire'],
+        '닥스훈트': ['닥스훈트', '닥스훈드', '미니어처닥스훈트', '미니닥스훈트', '닥스', 'dachshund'],
+        '비숑 프리제': ['비숑프리제', '비숑프리즈', '비숑', 'bichon'],
+        '미니어처 핀셔': ['미니어처핀셔', '미니핀', '미니어쳐핀셔', '핀셔'],
+        '페키니즈': ['페키니즈', '페키니스', '페키', 'pekingese'],
+        '파피용': ['파피용', '빠삐용', '파피옹', 'papillon'],
+        '슈나우저': ['미니어처슈나우저', '미니슈나우저', '슈나우저', '슈나우져', 'schnauzer'],
+        '진도견': ['진도견', '진돗개', '진도개', '진도', 'jindo'],
+        '풍산견': ['풍산견', '풍산개', '풍산'],
+        '삽살개': ['삽살개', '삽살견', '삽살이', '삽살'],
+        '시바': ['시바견', '시바이누', '시바', 'shiba'],
+        '웰시 코기': ['웰시코기', '웰시코르기', '웰시', '코기', 'welshcorgi', 'corgi'],
+        '비글': ['비글', '비이글', 'beagle'],
+        '코카 스파니엘': ['코카스파니엘', '코카스패니얼', '코커스파니엘', '코커스패니얼', '코카'],
+        '스피츠': ['스피츠', '스피치', '재패니즈스피츠', 'spitz'],
+        '보더 콜리': ['보더콜리', '보더코리', '보더콜리에', 'bordercollie'],
+        '골든 리트리버': ['골든리트리버', '골든리트리바', '골든레트리버', '골든', 'goldenretriever'],
+        '래브라도 리트리버': ['래브라도리트리버', '라브라도리트리버', '래브라도', '라브라도', '리트리버', 'labrador'],
+        '시베리안 허스키': ['시베리안허스키', '시베리안허스키견', '허스키', 'husky'],
+        '알래스칸 말라뮤트': ['알래스칸말라뮤트', '알라스칸말라뮤트', '말라뮤트', '말라뮤트견', 'malamute'],
+        '저먼 셰퍼드': ['저먼셰퍼드', '저먼셰퍼드독', '셰퍼드', '세퍼트', '쉐퍼드', '세퍼드', 'shepherd'],
+        '도베르만': ['도베르만', '도베르만핀셔', 'doberman'],
+        '사모예드': ['사모예드', '사모예드견', 'samoyed'],
+        '그레이트 피레니즈': ['그레이트피레니즈', '그레이트피레네', '피레니즈'],
+        '로트와일러': ['로트와일러', '로트바일러', 'rottweiler'],
+        '도사견': ['도사견', '도사', '토사'],
+        # 고양이
+        '코리안숏헤어': ['코리안숏헤어', '코리안쇼트헤어', '코숏', '한국고양이', '도메스틱숏헤어', '도메스틱'],
+        '페르시안': ['페르시안', '페르시안친칠라', '페르시아', 'persian'],
+        '러시안 블루': ['러시안블루', '러시안블류', '러시안', 'russianblue'],
+        '샴': ['샴고양이', '샴', '시암', 'siamese'],
+        '터키시 앙고라': ['터키시앙고라', '터키쉬앙고라', '앙고라', 'angora'],
+        '스코티시 폴드': ['스코티시폴드', '스코티쉬폴드', '스코티시', 'scottishfold'],
+        '브리티시 숏헤어': ['브리티시숏헤어', '브리티쉬숏헤어', '브숏', 'britishshorthair'],
+        '아메리칸 숏헤어': ['아메리칸숏헤어', '아메리칸쇼트헤어', '아메숏', 'americanshorthair'],
+        '먼치킨': ['먼치킨', '먼치킨고양이', 'munchkin'],
+        '노르웨이 숲': ['노르웨이숲', '노르웨이지안포레스트', '노르웨이'],
+        '벵갈': ['벵갈', '뱅갈', 'bengal'],
+        '랙돌': ['랙돌', '래그돌', 'ragdoll'],
+    },
+
+    # 개 표준 품종명의 크기 구분
+    'breed_sizes': {
+        '소형': ['말티즈', '푸들', '포메라니안', '시츄', '치와와', '요크셔테리어', '닥스훈트', '비숑 프리제',
+                '미니어처 핀셔', '페키니즈', '파피용', '슈나우저'],
+        '중형': ['진도견', '시바', '웰시 코기', '비글', '코카 스파니엘', '스피츠', '보더 콜리', '삽살개'],
+        '대형': ['풍산견', '골든 리트리버', '래브라도 리트리버', '시베리안 허스키', '알래스칸 말라뮤트',
+                '저먼 셰퍼드', '도베르만', '사모예드', '그레이트 피레니즈', '로트와일러', '도사견', '스탠다드 푸들'],
+    },
+
+    # 다른 품종명의 일부이기도 한 표기 (품종명 전체가 이 표기일 때만 일치 - 예: '웰시 테리어', '플랫코티드 리트리버')
+    'breed_exact_aliases': ['리트리버', '웰시', '코카', '도메스틱', '러시안', '노르웨이', '골든', '핀셔', '스코티시', '앙고라'],
+
+    # 믹스(혼종)로 볼 키워드 (품종명 어디에 있어도 믹스로 분류)
+    'mixed_breed_keywords': ['믹스', '잡종', '혼종', '혼혈', '교잡', 'mix'],
+
+    # 동물 종류별 믹스 표준 품종명
+    'mixed_breed_names': {'개': '믹스견', '고양이': '믹스묘', '기타': '기타 믹스'},
+}
+
+
+class RuleSet:
+    """
+    분류 규칙(키워드 사전, 정규식, 우선순위)을 한 번만 컴파일해 보관하는 클래스
+
+    프로세스 전체에서 하나의 인스턴스를 공유하며, 외부 설정 파일이 바뀌면
+    서버 재시작 없이 다음 조회 시점에 새 인스턴스로 교체됩니다.
+    """
+
+    # 구조적 정규식 (설정과 무관하게 고정)
+    WEIGHT_RANGE_PATTERN = re.compile(r'(?P<low>\d+(?:\.\d+)?|\.\d+)(?:\s*[~\-]\s*(?P<high>\d+(?:\.\d+)?))?')
+    GRAM_UNIT_PATTERN = re.compile(r'(?<![kK])[gG]\b')
+    AGE_NOTE_PATTERN = re.compile(r'\([^)]*(?:일|개월|미만|이상)[^)]*\)')
+    BREED_BRACKET_PATTERN = re.compile(r'\](.*?)(?:$|\s*\()')
+    BREED_PREFIX_PATTERN = re.compile(r'(개|고양이|축종)\s+(.*?)(?:$|\s*\()')
+    PAREN_PATTERN = re.compile(r'\([^)]*\)')
+    COLOR_SPLIT_PATTERN = re.compile(r'[,/·\s]+')
+
+    _current = None
+    _source_path = None
+    _source_mtime = None
+    _lock = threading.Lock()
+
+    def __init__(self, config=None):
+        """
+        초기화 함수
+
+        Parameters:
+        config (dict): 규칙 설정 (없는 키는 DEFAULT_RULES 값 사용)
+        """
+        config = config or {}
+        rules = {key: config.get(key, value) for key, value in DEFAULT_RULES.items()}
+
+        self.version = str(rules['version'])
+        self.color_patterns = rules['color_patterns']
+        self.color_types = rules['color_types']
+        self.place_type_mapping = rules['place_type_mapping']
+        self.facility_type_mapping = rules['facility_type_mapping']
+        self.priority_order = rules['priority_order']
+        self.sido_names = rules['sido_names']
+        self.breed_aliases = rules['breed_aliases']
+        self.breed_sizes = rules['breed_sizes']
+        self.breed_exact_aliases = rules['breed_exact_aliases']
+        self.mixed_breed_keywords = rules['mixed_breed_keywords']
+        self.mixed_breed_names = rules['mixed_breed_names']
+
+        # 소문자 키워드 테이블 (색상 추출 시 매번 lower() 하지 않도록)
+        self.color_keywords = [
+            (color_name, tuple(keyword.lower() for keyword in keywords))
+            for color_name, keywords in self.color_patterns.items()
+        ]
+        self.basic_colors = frozenset(self.color_types.get('단색', []))
+        self.pattern_colors = frozenset(self.color_types.get('무늬', []))
+
+        self.place_keywords = [(name, tuple(keywords)) for name, keywords in self.place_type_mapping.items()]
+        self.facility_keywords = [(name, tuple(keywords)) for name, keywords in self.facility_type_mapping.items()]
+
+        # 비트마스크 라벨 순서 (비트 i = i번째 유형)
+        self.facility_names = list(self.facility_type_mapping.keys())
+
+        # 장소 유형별 우선순위 순위 배열 (PRIORITY_ORDER에 없는 유형은 반환 대상이 아님)
+        self.place_types = list(self.place_type_mapping.keys())
+        no_rank = len(self.priority_order)
+        self.priority_rank = np.array(
+            [self.priority_order.index(t) if t in self.priority_order else no_rank for t in self.place_types],
+            dtype=np.int16
+        )
+
+        # 비트마스크 컬럼명 -> 비트 순서대로의 라벨
+        self.mask_labels = {'place_mask': self.place_types, 'facility_mask': self.facility_names}
+
+        # 설정 기반 정규식
+        self.color_noise_pattern = re.compile(rules['color_noise_pattern'])
+        self.sido_pattern = re.compile('^(' + '|'.join(map(re.escape, self.sido_names)) + ')')
+
+    @classmethod
+    def load_from_file(cls, file_path):
+        """
+        JSON 설정 파일에서 규칙 로드
+
+        Parameters:
+        file_path (str): 규칙 설정 파일 경로
+
+        Returns:
+        RuleSet: 컴파일된 규칙 객체
+        """
+        with open(file_path, encoding='utf-8') as f:
+            config = json.load(f)
+        if 'version' not in config:
+            raise ValueError(f"규칙 파일에 version 항목이 없습니다: {file_path}")
+        return cls(config)
+
+    @classmethod
+    def current(cls, file_path=None):
+        """
+        공유 규칙 객체 반환 (설정 파일이 바뀌었으면 다시 로드)
+
+        Parameters:
+        file_path (str): 규칙 설정 파일 경로 (기본: DEFAULT_RULES_PATH)
+
+        Returns:
+        RuleSet: 현재 활성화된 규칙 객체
+        """
+        file_path = file_path or cls._source_path or DEFAULT_RULES_PATH
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            mtime = None
+
+        if cls._current is not None and file_path == cls._source_path and mtime == cls._source_mtime:
+            return cls._current
+
+        with cls._lock:
+            if cls._current is None or file_path != cls._source_path or mtime != cls._source_mtime:
+                cls._swap(file_path, mtime)
+        return cls._current
+
+    @classmethod
+    def reload(cls, file_path=None):
+        """
+        설정 파일을 강제로 다시 읽어 규칙 교체
+
+        Parameters:
+        file_path (str): 규칙 설정 파일 경로
+
+        Returns:
+        RuleSet: 새로 활성화된 규칙 객체
+        """
+        file_path = file_path or cls._source_path or DEFAULT_RULES_PATH
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            mtime = None
+
+        with cls._lock:
+            if mtime is None:
+                cls._current = None
+            cls._swap(file_path, mtime)
+        return cls._current
+
+    @classmethod
+    def _swap(cls, file_path, mtime):
+        """설정 파일에서 규칙을 읽어 공유 인스턴스 교체 (실패 시 기존 규칙 유지)"""
+        if mtime is None:
+            rule_set = cls._current if cls._current is not None and cls._source_mtime is None else cls()
+        else:
+            try:
+                rule_set = cls.load_from_file(file_path)
+            except Exception as e:
+                logger.error(f"규칙 파일 로드 중 오류 발생: {e}")
+                rule_set = cls._current or cls()
+
+        if cls._current is None or rule_set.version != cls._current.version:
+            logger.info(f"분류 규칙 활성화: version={rule_set.version}")
+        cls._current = rule_set
+        cls._source_path = file_path
+        cls._source_mtime = mtime
@@ -0,0 +1,260 @@
+import os
+import glob
+import time
+import logging
+import threading
+from collections import OrderedDict
+import pandas as pd
+from utils.utils import CacheUtils
+from utils.data_loader import DataLoader
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 공유 데이터셋 파일 저장 위치 (환경 변수로 변경 가능)
+DEFAULT_CACHE_DIR = os.environ.get('ANIMAL_CACHE_DIR', os.path.join('data', '.cache'))
+
+class SharedDataset:
+    """
+    전처리된 데이터셋을 Arrow IPC(Feather) 파일로 한 번 저장하고
+    모든 세션이 메모리 매핑으로 같은 데이터를 공유하도록 관리하는 클래스
+
+    세션에는 데이터셋 키와 세션별 필터 마스크만 보관합니다. 세션은 매 실행마다 retain으로 쓰는 키를 알리고,
+    열린 데이터셋과 파일은 살아 있는 세션이 쓰지 않는 것부터 정리합니다.
+    """
+
+    # 프로세스 안에서 열린 데이터셋 (키 -> 읽기 전용 데이터프레임 / 메모리 매핑된 Arrow 테이블, 최근 사용 순)
+    _frames = OrderedDict()
+    _tables = OrderedDict()
+    _lock = threading.Lock()
+
+    # 세션별로 쓰는 데이터셋 (세션 식별자 -> (데이터셋 키 집합, 마지막 실행 시각))
+    _leases = {}
+
+    # 보관할 데이터셋 파일 수 (근사 모드용 표본 데이터셋 포함)
+    MAX_FILES = 8
+
+    # 세션이 쓰지 않는 데이터셋을 열어 둘 최대 수
+    MAX_OPEN = 4
+
+    # 이 시간(초) 동안 다시 실행되지 않은 세션은 끝난 것으로 봄
+    LEASE_SECONDS = 30 * 60
+
+    @staticmethod
+    def publish(df, cache_dir=None):
+        """
+        전처리된 데이터프레임을 공유 데이터셋으로 등록
+
+        Parameters:
+        df (pandas.DataFrame): 전처리된 데이터프레임
+        cache_dir (str): 데이터셋 파일 저장 디렉토리
+
+        Returns:
+        str: 데이터셋 키 (내용이 같으면 같은 키)
+        """
+        key = CacheUtils.fingerprint(df)[:16]
+        if key in SharedDataset._frames:
+            return key
+
+        if not DataLoader.arrow_available():
+            # pyarrow가 없으면 파일 없이 프로세스 안에서만 한 벌을 공유
+            with SharedDataset._lock:
+                df.attrs['dataset_key'] = key
+                SharedDataset._frames[key] = df
+            SharedDataset._evict()
+            return key
+
+        cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        path = SharedDataset._path(key, cache_dir)
+        if not os.path.exists(path):
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            # 압축 없이 저장해야 메모리 매핑으로 바로 읽을 수 있음
+            df.reset_index(drop=True).to_feather(tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+            logger.info(f"공유 데이터셋 저장 완료: {path}")
+            SharedDataset._prune(cache_dir)
+
+        SharedDataset.open(key, cache_dir)
+        return key
+
+    @staticmethod
+    def open(key, cache_dir=None):
+        """
+        데이터셋 키로 공유 데이터프레임 열기 (프로세스당 한 번만 메모리 매핑)
+
+        Parameters:
+        key (str): publish가 반환한 데이터셋 키
+        cache_dir (str): 데이터셋 파일 저장 디렉토리
+
+        Returns:
+        pandas.DataFrame: 읽기 전용으로 다뤄야 하는 공유 데이터프레임 (없으면 None)
+        """
+        frame = SharedDataset._touch(SharedDataset._frames, key)
+        if frame is not None:
+            return frame
+
+        path = SharedDataset._path(key, cache_dir or DEFAULT_CACHE_DIR)
+        if not os.path.exists(path):
+            return None
+
+        # Arrow 버퍼는 파일을 가리키므로 문자열/숫자 컬럼은 복사 없이 공유됨
+        table = SharedDataset.table(key, cache_dir)
+        with SharedDataset._lock:
+            frame = SharedDataset._frames.get(key)
+            if frame is None:
+                frame = SharedDataset.to_frame(table)
+                # 페이지에서 데이터셋 단위 요약(스케치 등)을 찾을 수 있도록 키 기록
+                frame.attrs['dataset_key'] = key
+                SharedDataset._frames[key] = frame
+                logger.info(f"공유 데이터셋 열기 완료: {path}")
+        SharedDataset._evict()
+        return frame
+
+    @staticmethod
+    def table(key, cache_dir=None):
+        """
+        데이터셋 키에 해당하는 메모리 매핑된 Arrow 테이블 (SQL 엔진 등 Arrow 직접 사용용)
+
+        Parameters:
+        key (str): 데이터셋 키
+        cache_dir (str): 데이터셋 파일 저장 디렉토리
+
+        Returns:
+        pyarrow.Table: Arrow 테이블 (파일이 없으면 None)
+        """
+        table = SharedDataset._touch(SharedDataset._tables, key)
+        if table is not None:
+            return table
+
+        path = SharedDataset._path(key, cache_dir or DEFAULT_CACHE_DIR)
+        if not DataLoader.arrow_available() or not os.path.exists(path):
+            return None
+
+        import pyarrow as pa
+
+        with SharedDataset._lock:
+            table = SharedDataset._tables.get(key)
+            if table is None:
+                table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+                SharedDataset._tables[key] = table
+        SharedDataset._evict()
+        return table
+
+    @staticmethod
+    def to_frame(table):
+        """
+        Arrow 테이블을 전처리 결과와 같은 형태(발생일 인덱스)의 데이터프레임으로 변환
+
+        Parameters:
+        table (pyarrow.Table): Arrow 테이블
+
+        Returns:
+        pandas.DataFrame: 변환된 데이터프레임
+        """
+        frame = table.to_pandas(split_blocks=True)
+        if 'happen_dt' in frame.columns:
+            frame.index = pd.DatetimeIndex(frame['happen_dt'], name='happen_dt_index')
+        return frame
+
+    @staticmethod
+    def view(key, mask=None, cache_dir=None):
+        """
+        공유 데이터프레임에 세션별 필터 마스크를 적용한 결과 반환
+
+        Parameters:
+        key (str): 데이터셋 키
+        mask (numpy.ndarray): 세션별 행 선택 마스크 (None이면 전체)
+        cache_dir (str): 데이터셋 파일 저장 디렉토리
+
+        Returns:
+        pandas.DataFrame: 필터링된 데이터프레임 (데이터셋이 없으면 None)
+        """
+        frame = SharedDataset.open(key, cache_dir)
+        if frame is None or mask is None:
+            return frame
+        return frame[mask]
+
+    @staticmethod
+    def retain(owner, *keys):
+        """
+        세션이 지금 쓰는 데이터셋 키 기록 (매 실행마다 호출, 이전 기록은 덮어씀)
+
+        Parameters:
+        owner (str): 세션 식별자
+        keys (str): 세션이 쓰는 데이터셋 키 (None은 무시)
+        """
+        with SharedDataset._lock:
+            SharedDataset._leases[owner] = (frozenset(key for key in keys if key), time.monotonic())
+
+    @staticmethod
+    def live_keys():
+        """살아 있는 세션이 쓰는 데이터셋 키 집합 (끝난 세션의 기록은 지움)"""
+        now = time.monotonic()
+        with SharedDataset._lock:
+            for owner, (_, seen) in list(SharedDataset._leases.items()):
+                if now - seen > SharedDataset.LEASE_SECONDS:
+                    del SharedDataset._leases[owner]
+            return set().union(*(keys for keys, _ in SharedDataset._leases.values()))
+
+    @staticmethod
+    def close(key):
+        """열린 데이터셋 닫기 (파일은 유지하므로 다시 open할 수 있음)"""
+        with SharedDataset._lock:
+            SharedDataset._frames.pop(key, None)
+            SharedDataset._tables.pop(key, None)
+
+    @staticmethod
+    def discard(key, cache_dir=None):
+        """더 이상 쓰지 않는 데이터셋을 닫고 파일도 삭제 (살아 있는 세션이 쓰는 데이터셋은 유지)
+
+        Returns:
+        bool: 삭제 여부
+        """
+        if key in SharedDataset.live_keys():
+            return False
+        SharedDataset.close(key)
+        try:
+            os.remove(SharedDataset._path(key, cache_dir or DEFAULT_CACHE_DIR))
+        except OSError:
+            pass
+        return True
+
+    @staticmethod
+    def _touch(cache, key):
+        """열린 데이터셋을 가장 최근에 쓴 것으로 표시하고 반환 (없으면 None)"""
+        with SharedDataset._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    @staticmethod
+    def _evict():
+        """살아 있는 세션이 쓰지 않는 열린 데이터셋을 오래 쓰지 않은 순으로 닫아 MAX_OPEN개 이하로 유지"""
+        live = SharedDataset.live_keys()
+        with SharedDataset._lock:
+            for cache in (SharedDataset._frames, SharedDataset._tables):
+                idle = [key for key in cache if key not in live]
+                for key in idle[:max(len(idle) - SharedDataset.MAX_OPEN, 0)]:
+                    del cache[key]
+
+    @staticmethod
+    def _path(key, cache_dir):
+        """데이터셋 키에 해당하는 파일 경로"""
+        return os.path.join(cache_dir, f"dataset_{key}.arrow")
+
+    @staticmethod
+    def _prune(cache_dir):
+        """오래된 데이터셋 파일 정리 (최근 MAX_FILES개와 살아 있는 세션이 쓰는 파일은 유지)"""
+        files = sorted(glob.glob(os.path.join(cache_dir, 'dataset_*.arrow')), key=os.path.getmtime, reverse=True)
+        live = SharedDataset.live_keys()
+        for path in files[SharedDataset.MAX_FILES:]:
+            key = os.path.basename(path)[len('dataset_'):-len('.arrow')]
+            if key in live:
+                continue
+            SharedDataset.close(key)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,278 @@
+import os
+import re
+import logging
+import threading
+import unicodedata
+from collections import Counter
+import numpy as np
+import pandas as pd
+from utils.utils import LocationUtils, TextUtils
+from utils.rule_set import RuleSet
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 보호소 등록 정보 파일 (id, care_nm, care_addr, care_tel)
+DEFAULT_REGISTRY_PATH = os.path.join('data', 'animal_care_center.csv')
+
+class ShelterRegistry:
+    """
+    보호소 등록 정보(animal_care_center.csv)를 한 번 읽어 정규화 이름/n-gram 색인을 만들고
+    데이터의 보호소명(care_nm)을 등록 보호소 ID로 연결하는 클래스
+
+    띄어쓰기, 법인 표기, '유기동물보호소'/'동물보호센터' 같은 접미어가 달라도 같은 보호소로 찾으며,
+    이름이 같거나 비슷한 후보가 여럿이면 시도로 구분합니다. 고유 (보호소명, 시도) 조합마다
+    한 번만 찾고 결과를 기억합니다.
+    """
+
+    # 이름 비교 시 제거할 법인 표기
+    LEGAL_FORM_PATTERN = re.compile(r'\((?:사|재|주|유|사단법인|재단법인)\)|사단법인|재단법인|주식회사')
+    NON_WORD_PATTERN = re.compile(r'[^0-9a-z가-힣]')
+
+    # 핵심 이름을 만들 때 끝에서 제거할 일반 접미어 (유기동물보호소, 동물보호센터, 보호센타 등)
+    GENERIC_SUFFIX_PATTERN = re.compile(r'(?:유기)?(?:동물)?(?:보호)?(?:센터|센타|쎈터)$|(?:유기)?(?:동물)?보호소$|유기동물$')
+    # 동물병원 계열 접미어 (동물병원, 종합병원, 메디컬센터 등) - 떼어 낸 이름은 병원끼리만 비교
+    HOSPITAL_SUFFIX_PATTERN = re.compile(r'(?:종합)?(?:동물|가축)?(?:종합)?(?:병원|메디컬(?:센터)?)$')
+    ADMIN_SUFFIX_PATTERN = re.compile(r'(?<=..)(?:특별시|광역시|시|군|구)$')
+
+    # 새 행정구역 명칭 -> 규칙의 시도명
+    SIDO_ALIASES = {'강원특별자치도': '강원도', '전북특별자치도': '전라북도'}
+
+    # n-gram 유사도(Dice 계수) 최소값과 최소 공유 n-gram 수 (핵심 이름끼리만 비교)
+    NGRAM_SIZE = 2
+    MIN_SIMILARITY = 0.6
+    MIN_SHARED_GRAMS = 2
+
+    _current = None
+    _source_path = None
+    _source_mtime = None
+    _lock = threading.Lock()
+
+    def __init__(self, registry):
+        """
+        초기화 함수
+
+        Parameters:
+        registry (pandas.DataFrame): id, care_nm, care_addr (선택: care_tel) 컬럼을 가진 등록 정보
+        """
+        rules = RuleSet.current()
+        table = registry.drop_duplicates('id').reset_index(drop=True)
+        address = table['care_addr'].fillna('').astype(str).str.strip()
+        for alias, sido in self.SIDO_ALIASES.items():
+            address = address.str.replace(f'^{alias}', sido, regex=True)
+        sido_sigungu = address.map(lambda x: LocationUtils.extract_sido_sigungu(x, rules) if x else ('미상', '미상'))
+
+        self.table = pd.DataFrame({
+            'shelter_id': table['id'].astype('int64'),
+            'shelter_name': table['care_nm'].astype(str).str.strip(),
+            'shelter_addr': address,
+            'shelter_tel': table['care_tel'] if 'care_tel' in table.columns else None,
+            'sido': sido_sigungu.str[0],
+            'sigungu': sido_sigungu.str[1],
+        }).set_index('shelter_id', drop=False)
+
+        # 정규화 이름 -> ID 목록, 핵심 이름 -> ID 목록, 핵심 이름의 n-gram -> ID 목록
+        # (정규화 이름과 주소가 같은 중복 등록은 가장 작은 ID 하나만 색인)
+        self.by_name, self.by_core, self.by_gram = {}, {}, {}
+        self.cores = {}
+        seen = set()
+        for shelter_id, name, addr in self.table.sort_index()[['shelter_id', 'shelter_name', 'shelter_addr']].itertuples(index=False):
+            normalized = self.normalize(name)
+            if (normalized, self.normalize(addr)) in seen:
+                continue
+            seen.add((normalized, self.normalize(addr)))
+            self.by_name.setdefault(normalized, []).append(shelter_id)
+            core = self.core_name(normalized)
+            if core:
+                # 핵심 이름 색인은 시설 유형(보호소/병원)별로 나눔 (강남구동물보호센터 != 강남동물병원)
+                kind = self.facility_kind(normalized)
+                self.cores[shelter_id] = core
+                self.by_core.setdefault((kind, core), []).append(shelter_id)
+                for gram in self.ngrams(core):
+                    self.by_gram.setdefault((kind, gram), []).append(shelter_id)
+
+        # (보호소명, 시도) -> 등록 보호소 ID (없으면 None)
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def current(cls, file_path=None):
+        """
+        공유 등록 정보 객체 반환 (파일이 바뀌었으면 다시 로드, 파일이 없으면 None)
+
+        Parameters:
+        file_path (str): 등록 정보 파일 경로 (기본: data/animal_care_center.csv)
+
+        Returns:
+        ShelterRegistry: 현재 등록 정보 객체
+        """
+        file_path = file_path or DEFAULT_REGISTRY_PATH
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return None
+
+        if cls._current is not None and file_path == cls._source_path and mtime == cls._source_mtime:
+            return cls._current
+
+        with cls._lock:
+            if cls._current is None or file_path != cls._source_path or mtime != cls._source_mtime:
+                try:
+                    cls._current = cls(pd.read_csv(file_path, dtype={'care_tel': str}))
+                    cls._source_path, cls._source_mtime = file_path, mtime
+                    logger.info(f"보호소 등록 정보 로드 완료: {len(cls._current.table)}곳")
+                except Exception as e:
+                    logger.error(f"보호소 등록 정보 로드 중 오류 발생: {e}")
+        return cls._current
+
+    @staticmethod
+    def normalize(name):
+        """보호소명 정규화 (유니코드 정규화, 법인 표기/공백/기호 제거, 소문자)"""
+        if pd.isna(name):
+            return ''
+        text = unicodedata.normalize('NFKC', str(name)).lower()
+        text = ShelterRegistry.LEGAL_FORM_PATTERN.sub('', text)
+        return ShelterRegistry.NON_WORD_PATTERN.sub('', text)
+
+    @staticmethod
+    def core_name(normalized):
+        """정규화 이름에서 일반 접미어(보호소/병원 계열)와 행정구역 접미어를 뗀 핵심 이름 (예: 창원시유기동물보호소 -> 창원, 다나동물병원 -> 다나)"""
+        if ShelterRegistry.HOSPITAL_SUFFIX_PATTERN.search(normalized):
+            core = ShelterRegistry.HOSPITAL_SUFFIX_PATTERN.sub('', normalized)
+        else:
+            core = ShelterRegistry.GENERIC_SUFFIX_PATTERN.sub('', normalized)
+        return ShelterRegistry.ADMIN_SUFFIX_PATTERN.sub('', core)
+
+    @staticmethod
+    def facility_kind(normalized):
+        """정규화 이름의 시설 유형 ('병원' 또는 '보호소')"""
+        return '병원' if ShelterRegistry.HOSPITAL_SUFFIX_PATTERN.search(normalized) else '보호소'
+
+    @staticmethod
+    def ngrams(normalized):
+        """문자 n-gram 집합"""
+        size = ShelterRegistry.NGRAM_SIZE
+        if len(normalized) <= size:
+            return {normalized} if normalized else set()
+        return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+    def resolve(self, name, sido=None):
+        """
+        보호소명 하나를 등록 보호소 ID로 변환 (정확한 이름 -> 핵심 이름 -> n-gram 유사도 순서)
+
+        Parameters:
+        name (str): 데이터의 보호소명
+        sido (str): 보호소 주소의 시도 (알면 후보를 좁히는 데 사용)
+
+        Returns:
+        int: 등록 보호소 ID (찾지 못했거나 후보가 하나로 좁혀지지 않으면 None)
+        """
+        key = (name, sido)
+        if key in self._memo:
+            return self._memo[key]
+
+        normalized = self.normalize(name)
+        core = self.core_name(normalized)
+        shelter_id = None
+        if normalized:
+            kind = self.facility_kind(normalized)
+            for candidates in (self.by_name.get(normalized), self.by_core.get((kind, core))):
+                if candidates:
+                    shelter_id = self._pick(candidates, sido)
+                    if shelter_id is not None:
+                        break
+            if shelter_id is None and core:
+                shelter_id = self._pick_similar(core, kind, sido)
+
+        with self._memo_lock:
+            self._memo[key] = shelter_id
+        return shelter_id
+
+    def _pick(self, candidates, sido):
+        """후보 중 시도가 맞는 하나 선택 (시도를 모르면 후보가 하나일 때만)"""
+        if sido and sido != '미상':
+            candidates = [c for c in candidates if self.table.at[c, 'sido'] in (sido, '미상')]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def _pick_similar(self, core, kind, sido):
+        """
+        핵심 이름의 n-gram을 공유하는 후보 중 Dice 유사도가 가장 높은 하나 선택
+
+        일반 접미어(동물병원, 보호센터 등)는 핵심 이름에서 빠지므로 비교하지 않고 같은 시설 유형끼리만 비교하며,
+        공유 n-gram이 MIN_SHARED_GRAMS개 미만인 짧은 이름(예: 행복 / 행복한)은 유사 후보로 보지 않습니다.
+        """
+        grams = self.ngrams(core)
+        shared = Counter(c for gram in grams for c in self.by_gram.get((kind, gram), ()))
+        scores = {}
+        for candidate, count in shared.items():
+            if count < self.MIN_SHARED_GRAMS:
+                continue
+            score = 2 * count / (len(grams) + len(self.ngrams(self.cores[candidate])))
+            if score >= self.MIN_SIMILARITY:
+                scores[candidate] = score
+        if sido and sido != '미상':
+            scores = {c: s for c, s in scores.items() if self.table.at[c, 'sido'] in (sido, '미상')}
+        if not scores:
+            return None
+        best = max(scores.values())
+        top = [c for c, s in scores.items() if s == best]
+        return top[0] if len(top) == 1 else None
+
+    def match(self, names, sidos=None):
+        """
+        보호소명 컬럼 전체를 고유 (보호소명, 시도) 조합 단위로 한 번에 변환
+
+        Parameters:
+        names (pandas.Series): 보호소명 (care_nm)
+        sidos (pandas.Series): 시도 (없으면 이름만 사용)
+
+        Returns:
+        pandas.Series: 등록 보호소 ID (Int64, 찾지 못하면 결측)
+        """
+        if sidos is None:
+            sidos = pd.Series(None, index=names.index, dtype=object)
+        keys = pd.MultiIndex.from_arrays([names.astype(object), sidos.astype(object)])
+        codes, uniques = pd.factorize(keys)
+        resolved = np.array(
+            [self.resolve(name, sido) for name, sido in uniques] + [None], dtype=object
+        )
+        return pd.Series(resolved[codes], index=names.index).astype('Int64')
+
+    def attach(self, df, name_column='care_nm'):
+        """
+        데이터프레임에 등록 보호소 ID와 표준 보호소명/주소 컬럼 추가
+
+        찾지 못한 행의 shelter_name은 원래 보호소명을 그대로 사용하고,
+        주소에서 시도/시군구를 찾지 못한 행은 등록 주소의 시도/시군구로 채웁니다.
+
+        Parameters:
+        df (pandas.DataFrame): 보호소명(와 선택적으로 sido) 컬럼이 있는 데이터프레임
+        name_column (str): 보호소명 컬럼
+
+        Returns:
+        pandas.DataFrame: shelter_id, shelter_name, shelter_addr 컬럼이 추가된 데이터프레임
+        """
+        ids = self.match(df[name_column], df['sido'] if 'sido' in df.columns else None)
+        matched = ids.notna().to_numpy()
+        positions = self.table.index.get_indexer(ids.fillna(-1).astype('int64'))
+
+        def lookup(column):
+            values = self.table[column].to_numpy(dtype=object)[positions]
+            return np.where(matched, values, None)
+
+        df['shelter_id'] = ids.array
+        df['shelter_name'] = np.where(matched, lookup('shelter_name'), df[name_column].to_numpy(dtype=object))
+        df['shelter_addr'] = lookup('shelter_addr')
+
+        if 'sido' in df.columns:
+            fill = matched & (df['sido'].isna() | (df['sido'] == '미상')).to_numpy()
+            if fill.any():
+                for column in ('sido', 'sigungu'):
+                    if column in df.columns:
+                        df[column] = np.where(fill, lookup(column), df[column].to_numpy(dtype=object))
+                if 'region' in df.columns:
+                    df['region'] = TextUtils.map_unique(df['sido'], LocationUtils.categorize_region)
+
+        logger.info(f"보호소 등록 정보 연결: {int(matched.sum())}/{len(df)} 행, "
+                    f"고유 보호소명 {df[name_column].nunique()}개 중 {df.loc[matched, name_column].nunique()}개")
+        return df
@@ -0,0 +1,522 @@
+import os
+import json
+import zlib
+import base64
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.shared_dataset import SharedDataset, DEFAULT_CACHE_DIR
+from utils.utils import ResultCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _hash_values(values, hash_key):
+    """값 배열의 64비트 해시 (문자열로 통일해 파티션/프로세스가 달라도 같은 값)"""
+    values = np.asarray(pd.Index(values).astype(str), dtype=object)
+    return pd.util.hash_array(values, hash_key=hash_key, categorize=False)
+
+
+def _encode(array):
+    """NumPy 배열을 JSON에 넣을 압축 base64 문자열로 변환 (작은 파티션의 빈 칸은 거의 차지하지 않음)"""
+    return base64.b64encode(zlib.compress(np.ascontiguousarray(array).tobytes())).decode('ascii')
+
+
+def _decode(text, dtype, shape):
+    """_encode 결과를 NumPy 배열로 복원"""
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=dtype).reshape(shape).copy()
+
+
+class SpaceSaving:
+    """
+    상위 k개 값을 고정 크기 카운터로 추적하는 SpaceSaving 요약 (병합 가능)
+
+    빈도가 전체의 1/capacity보다 큰 값은 반드시 남으며, 각 값의 건수는
+    최대 error만큼 과대 추정됩니다.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        초기화 함수
+
+        Parameters:
+        capacity (int): 유지할 카운터 수
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+
+    def _floor(self):
+        """요약에 없는 값의 건수 상한 (카운터가 가득 찼을 때의 최소 건수)"""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def update_counts(self, counts):
+        """
+        청크의 정확한 값별 건수를 요약에 반영
+
+        Parameters:
+        counts (pandas.Series): 값 -> 건수 (value_counts 결과)
+        """
+        counts = counts[counts > 0].sort_values(ascending=False)
+        chunk = SpaceSaving(self.capacity)
+        chunk.total = int(counts.sum())
+        top = counts.iloc[:self.capacity]
+        chunk.counts = {str(value): int(count) for value, count in top.items()}
+        chunk.errors = dict.fromkeys(chunk.counts, 0)
+        # 잘린 값은 남은 카운터의 최소 건수 이하이므로 SpaceSaving 요약의 조건을 만족
+        self.merge(chunk)
+
+    def merge(self, other):
+        """
+        다른 요약과 병합 (한쪽에 없는 값은 그쪽의 최소 건수까지 있었을 수 있는 것으로 계산)
+
+        Parameters:
+        other (SpaceSaving): 병합할 요약
+        """
+        floor, other_floor = self._floor(), other._floor()
+        keys = set(self.counts) | set(other.counts)
+        counts = {k: self.counts.get(k, floor) + other.counts.get(k, other_floor) for k in keys}
+        errors = {k: self.errors.get(k, floor) + other.errors.get(k, other_floor) for k in keys}
+        if len(counts) > self.capacity:
+            keep = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+            counts = {k: counts[k] for k in keep}
+            errors = {k: errors[k] for k in keep}
+        self.counts, self.errors = counts, errors
+        self.total += other.total
+        return self
+
+    def top(self, k=10):
+        """
+        건수 상위 k개
+
+        Returns:
+        pandas.DataFrame: value, count(추정 건수), error(최대 과대 추정) 컬럼
+        """
+        keep = sorted(self.counts, key=self.counts.get, reverse=True)[:k]
+        return pd.DataFrame({
+            'value': keep,
+            'count': [self.counts[v] for v in keep],
+            'error': [self.errors[v] for v in keep],
+        })
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'total': self.total, 'counts': self.counts, 'errors': self.errors}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data['capacity'])
+        summary.total = data['total']
+        summary.counts = {k: int(v) for k, v in data['counts'].items()}
+        summary.errors = {k: int(v) for k, v in data['errors'].items()}
+        return summary
+
+
+class CountMinSketch:
+    """
+    값별 건수를 고정 크기 표로 추정하는 Count-Min 스케치 (병합 가능, 과대 추정만 발생)
+
+    SpaceSaving 후보의 건수를 더 좁히는 데 사용합니다.
+    """
+
+    def __init__(self, width=2048, depth=4):
+        """
+        초기화 함수
+
+        Parameters:
+        width (int): 행당 칸 수 (오차는 전체 건수의 약 e/width)
+        depth (int): 해시 행 수 (오차 확률은 약 e^-depth)
+        """
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, values):
+        """행별 해시 칸 위치"""
+        return [
+            (_hash_values(values, f"countminsketch{row:02d}") % np.uint64(self.width)).astype(np.int64)
+            for row in range(self.depth)
+        ]
+
+    def update_counts(self, counts):
+        """값별 건수 반영 (counts: 값 -> 건수)"""
+        counts = counts[counts > 0]
+        if counts.empty:
+            return
+        weights = counts.to_numpy(dtype=np.int64)
+        for row, columns in enumerate(self._columns(counts.index)):
+            np.add.at(self.table[row], columns, weights)
+
+    def estimate(self, values):
+        """값별 추정 건수 (실제 건수 이상)"""
+        if len(values) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.min([self.table[row][columns] for row, columns in enumerate(self._columns(values))], axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+        return self
+
+    def to_dict(self):
+        return {'width': self.width, 'depth': self.depth, 'table': _encode(self.table)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['width'], data['depth'])
+        sketch.table = _decode(data['table'], np.int64, (sketch.depth, sketch.width))
+        return sketch
+
+
+class HyperLogLog:
+    """
+    고유값 수를 2^precision개 레지스터로 추정하는 HyperLogLog (병합 가능)
+
+    표준 오차는 약 1.04 / sqrt(2^precision) 입니다.
+    """
+
+    def __init__(self, precision=12):
+        """
+        초기화 함수
+
+        Parameters:
+        precision (int): 레지스터 수의 log2 (4~16)
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        """값 배열 반영 (중복은 한 번만 세도록 고유값만 해시)"""
+        values = pd.unique(pd.Series(values).dropna())
+        if len(values) == 0:
+            return
+        hashes = _hash_values(values, 'hyperloglog00000')
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        # 남은 비트의 앞쪽 0 개수 + 1 (남은 비트가 모두 0이어도 범위를 넘지 않도록 끝 비트 보정)
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        rank = np.ones(len(rest), dtype=np.uint8)
+        for shift in (32, 16, 8, 4, 2, 1):
+            empty = (rest >> np.uint64(64 - shift)) == 0
+            rank += (empty * shift).astype(np.uint8)
+            rest = np.where(empty, rest << np.uint64(shift), rest)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        """고유값 수 추정치"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(float)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # 작은 범위는 빈 레지스터 비율로 보정 (linear counting)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def to_dict(self):
+        return {'precision': self.precision, 'registers': _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['precision'])
+        sketch.registers = _decode(data['registers'], np.uint8, (1 << sketch.precision,))
+        return sketch
+
+
+class DatasetSketch:
+    """
+    데이터셋 하나의 상위 값(품종/보호소)과 시도별 고유 보호소 수를 스케치로 요약하는 클래스
+
+    청크 단위로 만들고 파티션끼리 병합할 수 있으므로 카탈로그 파티션마다 저장해 두면
+    여러 파일을 합친 데이터의 상위 N개와 고유값 수를 전체 데이터를 다시 읽지 않고 구할 수 있습니다.
+    페이지는 top_k/distinct를 사용하며, 작은 데이터나 필터링된 데이터는 정확한 값을 계산합니다.
+    """
+
+    # 상위 값을 추적할 컬럼 -> 그룹별로도 추적할 기준 컬럼
+    TOP_K_COLUMNS = {'breed_canonical': 'animal_type', 'breed': 'animal_type', 'shelter_name': None, 'care_nm': None}
+    # 고유값 수를 추적할 컬럼 -> 그룹 기준 컬럼
+    DISTINCT_COLUMNS = {'shelter_name': 'sido', 'care_nm': 'sido'}
+
+    CAPACITY = 1024
+    PRECISION = 12
+    CHUNK_ROWS = 250000
+
+    # 이 행 수보다 작은 데이터는 정확한 값 계산
+    EXACT_MAX_ROWS = 1000000
+
+    FORMAT_VERSION = 1
+
+    # 데이터셋 키 -> DatasetSketch
+    _sketches = ResultCache(max_entries=16)
+    _building = set()
+    _lock = threading.Lock()
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sketch')
+
+    def __init__(self):
+        self.rows = 0
+        # (컬럼, 그룹 값 또는 None) -> (SpaceSaving, CountMinSketch)
+        self.top = {}
+        # (컬럼, 그룹 값) -> HyperLogLog
+        self.distinct = {}
+
+    def update(self, chunk):
+        """
+        청크 하나를 요약에 반영
+
+        Parameters:
+        chunk (pandas.DataFrame): 전처리된 데이터의 일부
+        """
+        self.rows += len(chunk)
+        for column, group in self.TOP_K_COLUMNS.items():
+            if column not in chunk.columns:
+                continue
+            self._update_top((column, None), chunk[column].value_counts(sort=False))
+            if group is not None and group in chunk.columns:
+                grouped = chunk.groupby(group, observed=True)[column].value_counts(sort=False)
+                for value, counts in grouped.groupby(level=0, observed=True):
+                    self._update_top((column, str(value)), counts.droplevel(0))
+
+        for column, group in self.DISTINCT_COLUMNS.items():
+            if column not in chunk.columns or group not in chunk.columns:
+                continue
+            pairs = chunk[[group, column]].dropna().drop_duplicates()
+            for value, part in pairs.groupby(group, observed=True)[column]:
+                key = (column, str(value))
+                self.distinct.setdefault(key, HyperLogLog(self.PRECISION)).update(part)
+        return self
+
+    def _update_top(self, key, counts):
+        if key not in self.top:
+            self.top[key] = (SpaceSaving(self.CAPACITY), CountMinSketch())
+        summary, sketch = self.top[key]
+        summary.update_counts(counts)
+        sketch.update_counts(counts)
+
+    def merge(self, other):
+        """
+        다른 요약과 병합 (파티션/청크 요약 합치기)
+
+        Parameters:
+        other (DatasetSketch): 병합할 요약
+        """
+        self.rows += other.rows
+        for key, (summary, sketch) in other.top.items():
+            if key in self.top:
+                self.top[key][0].merge(summary)
+                self.top[key][1].merge(sketch)
+            else:
+                self.top[key] = (SpaceSaving.from_dict(summary.to_dict()), CountMinSketch.from_dict(sketch.to_dict()))
+        for key, hll in other.distinct.items():
+            if key in self.distinct:
+                self.distinct[key].merge(hll)
+            else:
+                self.distinct[key] = HyperLogLog.from_dict(hll.to_dict())
+        return self
+
+    @classmethod
+    def build(cls, df, chunk_rows=None):
+        """
+        데이터프레임을 청크 단위로 읽으며 요약 생성
+
+        Parameters:
+        df (pandas.DataFrame): 전처리된 데이터프레임
+        chunk_rows (int): 청크 행 수
+
+        Returns:
+        DatasetSketch: 요약
+        """
+        chunk_rows = chunk_rows or cls.CHUNK_ROWS
+        sketch = cls()
+        for start in range(0, len(df), chunk_rows):
+            sketch.update(df.iloc[start:start + chunk_rows])
+        return sketch
+
+    def top_values(self, column, k=10, group=None):
+        """
+        스케치로 구한 상위 k개 값 (SpaceSaving 후보의 건수를 Count-Min 추정치로 좁힘)
+
+        Returns:
+        pandas.Series: 값 -> 추정 건수 (요약이 없으면 None)
+        """
+        entry = self.top.get((column, None if group is None else str(group)))
+        if entry is None:
+            return None
+        summary, sketch = entry
+        # 실제 상위 k개가 잘리지 않도록 후보를 넉넉히 뽑은 뒤 다시 정렬
+        candidates = summary.top(k * 4)
+        counts = np.minimum(candidates['count'].to_numpy(), sketch.estimate(candidates['value']))
+        return pd.Series(counts, index=pd.Index(candidates['value'], name=column), name='count') \
+            .sort_values(ascending=False, kind='stable').head(k)
+
+    def distinct_counts(self, column, group_column):
+        """
+        그룹별 고유값 수 추정치
+
+        Returns:
+        pandas.Series: 그룹 값 -> 추정 고유값 수 (요약이 없으면 None)
+        """
+        if self.DISTINCT_COLUMNS.get(column) != group_column:
+            return None
+        counts = {group: hll.count() for (name, group), hll in self.distinct.items() if name == column}
+        if not counts:
+            return None
+        return pd.Series(counts, name=column).rename_axis(group_column).sort_index()
+
+    def to_dict(self):
+        return {
+            'version': self.FORMAT_VERSION,
+            'rows': self.rows,
+            'top': [[column, group, summary.to_dict(), sketch.to_dict()]
+                    for (column, group), (summary, sketch) in self.top.items()],
+            'distinct': [[column, group, hll.to_dict()] for (column, group), hll in self.distinct.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls()
+        sketch.rows = data['rows']
+        for column, group, summary, cms in data['top']:
+            sketch.top[(column, group)] = (SpaceSaving.from_dict(summary), CountMinSketch.from_dict(cms))
+        for column, group, hll in data['distinct']:
+            sketch.distinct[(column, group)] = HyperLogLog.from_dict(hll)
+        return sketch
+
+    def save(self, path):
+        """JSON 파일로 원자적 저장"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """save로 저장한 요약 읽기 (없거나 형식이 다르면 None)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls.from_dict(data) if data.get('version') == cls.FORMAT_VERSION else None
+
+    @staticmethod
+    def path_for(dataset_key, cache_dir=None):
+        """공유 데이터셋 요약 파일 경로"""
+        return os.path.join(cache_dir or DEFAULT_CACHE_DIR, f"sketch_{dataset_key}.json")
+
+    @classmethod
+    def register(cls, dataset_key, sketch, cache_dir=None):
+        """이미 만든 요약(예: 카탈로그 파티션 요약의 병합)을 공유 데이터셋 요약으로 등록"""
+        sketch.save(cls.path_for(dataset_key, cache_dir))
+        return cls._sketches.put(dataset_key, sketch)
+
+    @classmethod
+    def for_dataset(cls, dataset_key, df=None, cache_dir=None, background=True):
+        """
+        공유 데이터셋의 요약 (메모리 -> 파일 순서로 찾고, 없으면 만듦)
+
+        Parameters:
+        dataset_key (str): 공유 데이터셋 키
+        df (pandas.DataFrame): 요약을 만들 데이터 (None이면 만들지 않음)
+        cache_dir (str): 요약 파일 저장 디렉토리
+        background (bool): True면 백그라운드에서 만들고 이번에는 None 반환
+
+        Returns:
+        DatasetSketch: 요약 (아직 없으면 None)
+        """
+        sketch = cls._sketches.get(dataset_key)
+        if sketch is not None:
+            return sketch
+        path = cls.path_for(dataset_key, cache_dir)
+        sketch = cls.load(path)
+        if sketch is not None:
+            return cls._sketches.put(dataset_key, sketch)
+        if df is None:
+            return None
+
+        def build():
+            try:
+                cls.register(dataset_key, cls.build(df), cache_dir)
+                logger.info(f"데이터셋 요약 생성 완료: {dataset_key} ({len(df):,}행)")
+            except Exception as e:
+                logger.error(f"데이터셋 요약 생성 중 오류 발생: {e}")
+            finally:
+                with cls._lock:
+                    cls._building.discard(dataset_key)
+
+        if not background:
+            build()
+            return cls._sketches.get(dataset_key)
+        with cls._lock:
+            if dataset_key in cls._building:
+                return None
+            cls._building.add(dataset_key)
+        cls._executor.submit(build)
+        return None
+
+    @classmethod
+    def prepare(cls, dataset_key, cache_dir=None):
+        """공유 데이터셋 등록 직후 호출 - 큰 데이터셋이면 요약을 미리 만듦 (호출한 스레드에서 실행)"""
+        df = SharedDataset.open(dataset_key, cache_dir)
+        if df is not None and len(df) >= cls.EXACT_MAX_ROWS:
+            cls.for_dataset(dataset_key, df, cache_dir, background=False)
+
+    @classmethod
+    def _for_frame(cls, df):
+        """페이지 데이터가 큰 공유 데이터셋 전체일 때만 그 요약 반환 (필터링된 데이터는 None)"""
+        dataset_key = df.attrs.get('dataset_key')
+        if dataset_key is None or len(df) < cls.EXACT_MAX_ROWS:
+            return None
+        sketch = cls.for_dataset(dataset_key, df)
+        return sketch if sketch is not None and sketch.rows == len(df) else None
+
+    @classmethod
+    def top_k(cls, df, column, k=10, where=None):
+        """
+        상위 k개 값과 건수 (큰 데이터는 스케치 추정치, 작거나 필터링된 데이터는 정확한 값)
+
+        Parameters:
+        df (pandas.DataFrame): 페이지 데이터
+        column (str): 대상 컬럼
+        k (int): 개수
+        where (tuple): (그룹 컬럼, 그룹 값) - 해당 그룹 안에서의 상위 값 (TOP_K_COLUMNS의 그룹만 스케치 사용)
+
+        Returns:
+        pandas.Series: 값 -> 건수 (건수 내림차순, 건수 0인 범주 제외)
+        """
+        sketch = cls._for_frame(df)
+        if sketch is not None and (where is None or cls.TOP_K_COLUMNS.get(column) == where[0]):
+            result = sketch.top_values(column, k, None if where is None else where[1])
+            if result is not None:
+                return result
+
+        if where is not None:
+            df = df[df[where[0]] == where[1]]
+        counts = df[column].value_counts()
+        return counts[counts > 0].head(k)
+
+    @classmethod
+    def distinct(cls, df, column, by):
+        """
+        그룹별 고유값 수 (큰 데이터는 HyperLogLog 추정치, 작거나 필터링된 데이터는 정확한 값)
+
+        Parameters:
+        df (pandas.DataFrame): 페이지 데이터
+        column (str): 고유값을 셀 컬럼
+        by (str): 그룹 컬럼
+
+        Returns:
+        pandas.Series: 그룹 값 -> 고유값 수
+        """
+        sketch = cls._for_frame(df)
+        if sketch is not None:
+            result = sketch.distinct_counts(column, by)
+            if result is not None:
+                return result
+        return df.groupby(by, observed=True)[column].nunique()
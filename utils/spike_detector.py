@@ -0,0 +1,244 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.utils import CacheUtils, ResultCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SpikeDetector:
+    """
+    지역(시군구) × 동물 종류별 일별 발생 건수에서 갑작스러운 급증(다두 사육 구조, 재난 등)을 찾는 클래스
+
+    모든 계열의 일별 건수를 (계열 × 날짜) 2차원 배열 하나로 만든 뒤, 직전 기간의 이동 사분위수(중앙값, IQR)와
+    계열별 요일 계수로 기대 건수를 구하고 로버스트 z 점수를 한 번에 계산합니다.
+    일별 건수는 작은 정수이므로 이동 분위수는 정렬 대신 '건수 <= k' 누적합을 k를 늘려 가며 구합니다.
+    """
+
+    # 계열을 나누는 컬럼 (시군구명은 시도마다 겹칠 수 있어 시도 포함)
+    GROUP_COLUMNS = ['sido', 'sigungu', 'animal_type']
+
+    # 기대 건수를 계산할 직전 기간(일)
+    WINDOW = 28
+
+    # 급증 판정 기준 (로버스트 z 점수, 최소 건수)
+    THRESHOLD = 4.0
+    MIN_COUNT = 5
+
+    # 요일 계수 추정 시 더하는 가상 건수 (건수가 적은 계열의 요일 계수가 튀지 않도록 1로 당김)
+    WEEKDAY_PRIOR = 10.0
+
+    # IQR -> 표준편차 환산 계수 (정규분포 기준)
+    IQR_TO_SIGMA = 1.349
+
+    # 포아송 분산 안정화(Anscombe) 변환의 상수
+    ANSCOMBE_SHIFT = 3 / 8
+
+    # 데이터 지문별 점수 행렬 캐시
+    _cache = ResultCache(max_entries=4)
+
+    @staticmethod
+    def daily_matrix(df, group_columns=None, date_column='happen_dt'):
+        """
+        계열별 일별 발생 건수 행렬 계산
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        group_columns (list): 계열을 나누는 컬럼 목록 (기본: GROUP_COLUMNS)
+        date_column (str): 날짜 컬럼명
+
+        Returns:
+        tuple: (계열 × 날짜 int32 건수 배열, 계열 라벨 데이터프레임, 날짜 인덱스) - 데이터가 없으면 None
+        """
+        group_columns = list(group_columns or SpikeDetector.GROUP_COLUMNS)
+        if date_column not in df.columns or any(c not in df.columns for c in group_columns):
+            logger.warning("급증 탐지에 필요한 컬럼이 없습니다.")
+            return None
+
+        days = df[date_column].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        valid = ~np.isnat(days)
+
+        # 컬럼별 코드를 혼합 기수로 합친 뒤 실제로 있는 조합만 계열 번호로 압축
+        combined = np.zeros(len(df), dtype=np.int64)
+        levels = []
+        for column in group_columns:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            valid &= codes >= 0
+            combined = combined * len(uniques) + codes
+            levels.append(uniques)
+        if not valid.any():
+            return None
+
+        series_codes, series_keys = pd.factorize(combined[valid], sort=True)
+        day_index = days[valid].astype(np.int64)
+        first_day = int(day_index.min())
+        day_index -= first_day
+        n_series, n_days = len(series_keys), int(day_index.max()) + 1
+
+        counts = np.bincount(series_codes * n_days + day_index, minlength=n_series * n_days)
+        counts = counts.reshape(n_series, n_days).astype(np.int32)
+
+        # 압축된 계열 번호 -> 컬럼별 라벨
+        labels, remainder = {}, np.asarray(series_keys, dtype=np.int64)
+        for column, uniques in zip(reversed(group_columns), reversed(levels)):
+            remainder, codes = np.divmod(remainder, len(uniques))
+            labels[column] = np.asarray(uniques, dtype=object)[codes]
+        series = pd.DataFrame({column: labels[column] for column in group_columns})
+
+        dates = pd.date_range(np.datetime64(first_day, 'D'), periods=n_days, freq='D', name='date')
+        return counts, series, dates
+
+    @staticmethod
+    def rolling_quantiles(counts, window, quantiles=(0.25, 0.5, 0.75)):
+        """
+        각 날짜 직전 window일(당일 제외)의 건수 분위수를 모든 계열에 대해 계산
+
+        건수가 k 이하인 날의 수를 누적합으로 세어, 필요한 개수 이상이 되는 가장 작은 k를 분위수로 씁니다.
+        아직 분위수가 정해지지 않은 계열만 다음 k로 넘기므로 반복 횟수는 가장 큰 분위수 값 정도입니다.
+
+        Parameters:
+        counts (numpy.ndarray): 계열 × 날짜 건수 배열 (0 이상의 정수)
+        window (int): 직전 기간(일)
+        quantiles (tuple): 구할 분위수 (오름차순)
+
+        Returns:
+        numpy.ndarray: 분위수 × 계열 × 날짜 float32 배열 (직전 기간이 부족한 앞쪽 날짜는 NaN)
+        """
+        n_series, n_days = counts.shape
+        result = np.full((len(quantiles), n_series, n_days), np.nan, dtype=np.float32)
+        if n_days <= window:
+            return result
+
+        # k가 분위수 q 이상이려면 창 안에서 k 이하인 날이 ceil(q * window)일 이상이어야 함
+        needed = np.maximum(np.ceil(np.asarray(quantiles) * window).astype(np.int32), 1)
+        rows = np.arange(n_series)
+        at_most = np.zeros((n_series, n_days + 1), dtype=np.int32)
+        k = 0
+        while rows.size:
+            sub = at_most[:len(rows)]
+            np.cumsum(counts[rows] <= k, axis=1, out=sub[:, 1:])
+            # 날짜 t의 창 [t - window, t) 안에서 k 이하인 날 수
+            in_window = sub[:, window:n_days] - sub[:, :n_days - window]
+            for i, need in enumerate(needed):
+                block = result[i, rows, window:]
+                block[np.isnan(block) & (in_window >= need)] = k
+                result[i, rows, window:] = block
+            rows = rows[np.isnan(result[-1, rows, window:]).any(axis=1)]
+            k += 1
+        return result
+
+    @staticmethod
+    def weekday_factors(counts, dates, prior=None):
+        """
+        계열별 요일 계수 (요일 평균 건수 / 전체 평균 건수, 건수가 적으면 1에 가깝게 축소)
+
+        Returns:
+        numpy.ndarray: 계열 × 7 float32 배열 (월요일=0)
+        """
+        prior = SpikeDetector.WEEKDAY_PRIOR if prior is None else prior
+        weekday = dates.dayofweek.to_numpy()
+        one_hot = np.zeros((len(dates), 7), dtype=np.float32)
+        one_hot[np.arange(len(dates)), weekday] = 1
+        totals = counts.astype(np.float32) @ one_hot
+        days_per_weekday = one_hot.sum(axis=0)
+        daily_mean = totals.sum(axis=1, keepdims=True) / len(dates)
+        expected = daily_mean * days_per_weekday
+        return (totals + prior) / (expected + prior)
+
+    @staticmethod
+    def score(df, group_columns=None, date_column='happen_dt', window=None):
+        """
+        모든 계열의 일별 기대 건수와 로버스트 z 점수를 한 번에 계산 (같은 데이터는 캐시)
+
+        기대 건수 = 직전 기간 중앙값 × 요일 계수,
+        z = 2(sqrt(건수 + 3/8) - sqrt(기대 건수 + 3/8)) / sqrt(과산포),
+        과산포 = max(1, (IQR / 1.349 × 요일 계수)^2 / max(기대 건수, 1))
+        (건수가 적은 계열도 포아송 잡음을 급증으로 보지 않도록 분산 안정화 변환 후 비교)
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        group_columns (list): 계열을 나누는 컬럼 목록 (기본: GROUP_COLUMNS)
+        date_column (str): 날짜 컬럼명
+        window (int): 직전 기간(일) (기본: WINDOW)
+
+        Returns:
+        dict: counts, expected, z (계열 × 날짜 배열), series (계열 라벨), dates (날짜 인덱스) - 데이터가 없으면 None
+        """
+        group_columns = list(group_columns or SpikeDetector.GROUP_COLUMNS)
+        window = window or SpikeDetector.WINDOW
+
+        key = (tuple(group_columns), date_column, window,
+               CacheUtils.fingerprint(df, group_columns + [date_column]))
+        cached = SpikeDetector._cache.get(key)
+        if cached is not None:
+            return cached
+
+        matrix = SpikeDetector.daily_matrix(df, group_columns, date_column)
+        if matrix is None:
+            return None
+        counts, series, dates = matrix
+
+        lower, median, upper = SpikeDetector.rolling_quantiles(counts, window)
+        factors = SpikeDetector.weekday_factors(counts, dates)[:, dates.dayofweek.to_numpy()]
+        expected = median * factors
+        sigma = (upper - lower) / SpikeDetector.IQR_TO_SIGMA * factors
+        dispersion = np.maximum(sigma ** 2 / np.maximum(expected, 1), 1)
+        shift = SpikeDetector.ANSCOMBE_SHIFT
+        z = 2 * (np.sqrt(counts + shift) - np.sqrt(expected + shift)) / np.sqrt(dispersion)
+
+        logger.info(f"급증 탐지 점수 계산 완료: 계열 {len(series)}개, {len(dates)}일")
+        return SpikeDetector._cache.put(key, {
+            'counts': counts, 'expected': expected, 'z': z, 'series': series, 'dates': dates,
+        })
+
+    @staticmethod
+    def detect(df, group_columns=None, date_column='happen_dt', window=None, threshold=None, min_count=None):
+        """
+        급증으로 판정된 (계열, 날짜) 목록
+
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        group_columns (list): 계열을 나누는 컬럼 목록 (기본: GROUP_COLUMNS)
+        date_column (str): 날짜 컬럼명
+        window (int): 직전 기간(일) (기본: WINDOW)
+        threshold (float): 로버스트 z 점수 기준 (기본: THRESHOLD)
+        min_count (int): 급증으로 볼 최소 일별 건수 (기본: MIN_COUNT)
+
+        Returns:
+        pandas.DataFrame: series_id, 계열 컬럼, date, count, expected, z_score 컬럼 (점수 내림차순)
+        """
+        group_columns = list(group_columns or SpikeDetector.GROUP_COLUMNS)
+        threshold = SpikeDetector.THRESHOLD if threshold is None else threshold
+        min_count = SpikeDetector.MIN_COUNT if min_count is None else min_count
+        columns = ['series_id'] + group_columns + ['date', 'count', 'expected', 'z_score']
+
+        scores = SpikeDetector.score(df, group_columns, date_column, window)
+        if scores is None:
+            return pd.DataFrame(columns=columns)
+
+        with np.errstate(invalid='ignore'):
+            flagged = (scores['z'] >= threshold) & (scores['counts'] >= min_count)
+        series_ids, day_ids = np.nonzero(flagged)
+
+        spikes = scores['series'].iloc[series_ids].reset_index(drop=True)
+        spikes.insert(0, 'series_id', series_ids)
+        spikes['date'] = scores['dates'][day_ids]
+        spikes['count'] = scores['counts'][series_ids, day_ids]
+        spikes['expected'] = scores['expected'][series_ids, day_ids].astype(float).round(1)
+        spikes['z_score'] = scores['z'][series_ids, day_ids].astype(float).round(1)
+        return spikes.sort_values(['z_score', 'count'], ascending=False, ignore_index=True)[columns]
+
+    @staticmethod
+    def series_frame(scores, series_id):
+        """
+        점수 결과에서 계열 하나의 일별 건수/기대 건수/점수 추출 (차트용)
+
+        Returns:
+        pandas.DataFrame: date, count, expected, z_score 컬럼
+        """
+        return pd.DataFrame({
+            'date': scores['dates'],
+            'count': scores['counts'][series_id],
+            'expected': scores['expected'][series_id],
+            'z_score': scores['z'][series_id],
+        })
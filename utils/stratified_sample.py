@@ -0,0 +1,305 @@
+import logging
+import threading
+from statistics import NormalDist
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.shared_dataset import SharedDataset
+from utils.utils import ResultCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class StratifiedSample:
+    """
+    큰 데이터셋의 시도 x 동물 종류 x 연도 층화 표본을 한 번 만들어 공유하고,
+    표본에서 전체 건수를 신뢰구간과 함께 추정하는 클래스 (근사 모드)
+
+    각 층은 전체 행 수에 비례해 뽑으므로(층마다 최소 MIN_PER_STRATUM행) 표본의 비율은
+    그대로 전체 비율의 근사값이 되고, 건수는 층별 가중치(N_h / n_h)로 키워 추정합니다.
+    근사 건수를 요청하면 같은 건수의 정확한 값을 백그라운드에서 계산해 두고,
+    준비되면 다음 실행부터 정확한 값을 사용합니다.
+    """
+
+    STRATA = ['sido', 'animal_type', 'happen_year']
+
+    # 표본 목표 행 수 (이 크기의 MIN_ROWS_FACTOR배 이상인 데이터셋에만 표본을 만듦)
+    TARGET_ROWS = 100000
+    MIN_ROWS_FACTOR = 3
+    MIN_PER_STRATUM = 3
+    SEED = 20240101
+
+    # 원본 데이터셋 키 -> 표본 데이터셋 키
+    _sample_keys = ResultCache(max_entries=16)
+    _lock = threading.Lock()
+
+    # 정확한 건수 백그라운드 계산 ((원본 키, 중복 제외, 기준, 주기) -> 건수)
+    _exact = ResultCache(max_entries=128)
+    _pending = set()
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='exact-counts')
+
+    @staticmethod
+    def eligible(df):
+        """표본을 만들 만큼 큰 데이터셋인지 여부"""
+        return df is not None and len(df) >= StratifiedSample.TARGET_ROWS * StratifiedSample.MIN_ROWS_FACTOR
+
+    @staticmethod
+    def build(df, target_rows=None, seed=None):
+        """
+        층화 표본 생성 (비례 배분, 층 안에서는 무작위 비복원 추출)
+
+        Parameters:
+        df (pandas.DataFrame): 전처리된 데이터프레임 (STRATA 컬럼 사용, 없는 컬럼은 층에서 제외)
+        target_rows (int): 표본 목표 행 수 (기본: TARGET_ROWS)
+        seed (int): 난수 시드 (같은 데이터에서 항상 같은 표본)
+
+        Returns:
+        pandas.DataFrame: 원래 순서를 유지한 표본 (sample_weight, stratum, stratum_size, stratum_sample 컬럼 추가)
+        """
+        target_rows = target_rows or StratifiedSample.TARGET_ROWS
+        columns = [column for column in StratifiedSample.STRATA if column in df.columns]
+        if columns:
+            codes, _ = pd.factorize(pd.MultiIndex.from_arrays([df[column].astype(object) for column in columns]))
+        else:
+            codes = np.zeros(len(df), dtype=np.int64)
+        codes = codes.astype(np.int64)
+
+        # 층별 전체 행 수와 표본 행 수 (비례 배분, 최소 MIN_PER_STRATUM행)
+        sizes = np.bincount(codes)
+        fraction = min(1.0, target_rows / max(len(df), 1))
+        quotas = np.minimum(sizes, np.maximum(np.rint(sizes * fraction), StratifiedSample.MIN_PER_STRATUM)).astype(np.int64)
+
+        # 층 안의 무작위 순위가 할당량보다 작은 행 선택
+        rng = np.random.default_rng(StratifiedSample.SEED if seed is None else seed)
+        order = np.lexsort((rng.random(len(df)), codes))
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        ranks = np.empty(len(df), dtype=np.int64)
+        ranks[order] = np.arange(len(df)) - starts[codes[order]]
+        positions = np.flatnonzero(ranks < quotas[codes])
+
+        sample = df.iloc[positions].copy()
+        sample_codes = codes[positions]
+        sample['stratum'] = sample_codes.astype(np.int32)
+        sample['stratum_size'] = sizes[sample_codes]
+        sample['stratum_sample'] = quotas[sample_codes]
+        sample['sample_weight'] = sizes[sample_codes] / quotas[sample_codes]
+        logger.info(f"층화 표본 생성: {len(df):,}행 -> {len(sample):,}행 (층 {len(sizes):,}개, 층 기준 {', '.join(columns)})")
+        return sample
+
+    @staticmethod
+    def publish(dataset_key, cache_dir=None):
+        """
+        공유 데이터셋의 층화 표본을 공유 데이터셋으로 등록 (원본마다 한 번)
+
+        Parameters:
+        dataset_key (str): 원본 공유 데이터셋 키
+        cache_dir (str): 데이터셋 파일 저장 디렉토리
+
+        Returns:
+        str: 표본 데이터셋 키 (표본이 필요 없을 만큼 작으면 None)
+        """
+        sample_key = StratifiedSample._sample_keys.get(dataset_key)
+        if sample_key is not None and SharedDataset.open(sample_key, cache_dir) is not None:
+            return sample_key
+
+        with StratifiedSample._lock:
+            sample_key = StratifiedSample._sample_keys.get(dataset_key)
+            if sample_key is not None and SharedDataset.open(sample_key, cache_dir) is not None:
+                return sample_key
+            df = SharedDataset.open(dataset_key, cache_dir)
+            if not StratifiedSample.eligible(df):
+                return None
+            sample_key = SharedDataset.publish(StratifiedSample.build(df), cache_dir)
+            return StratifiedSample._sample_keys.put(dataset_key, sample_key)
+
+    @staticmethod
+    def view(dataset_key, exclude_duplicates=False, cache_dir=None):
+        """
+        근사 모드에서 페이지에 넘길 표본 (정확한 건수 계산에 쓸 원본 정보를 attrs에 기록)
+
+        Parameters:
+        dataset_key (str): 원본 공유 데이터셋 키
+        exclude_duplicates (bool): 중복 의심 기록 제외 여부
+        cache_dir (str): 데이터셋 파일 저장 디렉토리
+
+        Returns:
+        pandas.DataFrame: 표본 데이터프레임 (표본이 없으면 None)
+        """
+        sample_key = StratifiedSample.publish(dataset_key, cache_dir)
+        if sample_key is None:
+            return None
+        sample = SharedDataset.open(sample_key, cache_dir)
+        mask = None
+        if exclude_duplicates and 'is_duplicate' in sample.columns:
+            mask = ~sample['is_duplicate'].to_numpy(dtype=bool)
+        # 공유 표본 자체의 attrs를 바꾸지 않도록 얕은 복사본에 기록
+        view = SharedDataset.view(sample_key, mask, cache_dir)
+        view = view.copy(deep=False) if mask is None else view
+        view.attrs['approximate_source'] = (dataset_key, bool(exclude_duplicates), len(view), cache_dir)
+        return view
+
+    @staticmethod
+    def is_sample(df):
+        """표본(근사 모드) 데이터프레임 여부"""
+        return 'sample_weight' in df.columns
+
+    @staticmethod
+    def counts(df, by, freq=None, confidence=0.95):
+        """
+        기준별 건수 (표본이면 전체 건수 추정치와 신뢰구간, 정확한 값이 준비됐으면 정확한 값)
+
+        Parameters:
+        df (pandas.DataFrame): 페이지에 넘어온 데이터프레임 (전체 또는 표본)
+        by (str or list): 기준 컬럼 (freq를 주면 날짜 인덱스 기준 구간 이름)
+        freq (str): 날짜 인덱스를 묶을 기간 단위 (예: 'M', 주면 by는 결과 컬럼 이름)
+        confidence (float): 신뢰수준
+
+        Returns:
+        pandas.DataFrame: 기준 컬럼과 count, lower, upper 컬럼 (정확한 값이면 lower = upper = count)
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if not StratifiedSample.is_sample(df):
+            return StratifiedSample._exact_counts(df, by, freq)
+
+        source = df.attrs.get('approximate_source')
+        # 페이지에서 다시 필터링한 표본은 원본 전체 결과로 바꿀 수 없으므로 추정치만 사용
+        if source is not None and source[2] == len(df):
+            dataset_key, exclude_duplicates, _, cache_dir = source
+            exact_key = (dataset_key, exclude_duplicates, tuple(by), freq)
+            exact = StratifiedSample._exact.get(exact_key)
+            if exact is not None:
+                return exact.copy()
+            StratifiedSample._submit_exact(exact_key, cache_dir)
+
+        return StratifiedSample.estimate(df, by, freq, confidence)
+
+    @staticmethod
+    def estimate(sample, by, freq=None, confidence=0.95):
+        """
+        층화 표본에서 기준별 전체 건수와 신뢰구간 추정
+
+        층별 비율 p = y_h / n_h 에 대해 추정치는 sum(N_h * p),
+        분산은 sum(N_h^2 * (1 - n_h / N_h) * p(1 - p) / (n_h - 1)) 입니다.
+
+        Parameters:
+        sample (pandas.DataFrame): build로 만든 표본 (필터링된 부분 표본도 가능)
+        by (list): 기준 컬럼
+        freq (str): 날짜 인덱스를 묶을 기간 단위
+        confidence (float): 신뢰수준
+
+        Returns:
+        pandas.DataFrame: 기준 컬럼과 count, lower, upper 컬럼
+        """
+        codes, result = StratifiedSample._group_codes(sample, by, freq)
+        strata = sample['stratum'].to_numpy(dtype=np.int64)
+        n_strata = int(strata.max()) + 1 if len(strata) else 0
+        valid = codes >= 0
+
+        # (기준 값, 층) 조합별 표본 건수 y와 층의 전체/표본 행 수
+        pairs, y = np.unique(codes[valid] * n_strata + strata[valid], return_counts=True)
+        size = np.zeros(n_strata)
+        n = np.ones(n_strata)
+        size[strata] = sample['stratum_size'].to_numpy(dtype=float)
+        n[strata] = sample['stratum_sample'].to_numpy(dtype=float)
+        group, stratum = pairs // max(n_strata, 1), pairs % max(n_strata, 1)
+        p = y / n[stratum]
+        variance = size[stratum] ** 2 * (1 - n[stratum] / size[stratum]) * p * (1 - p) / np.maximum(n[stratum] - 1, 1)
+
+        result['count'] = np.bincount(group, weights=size[stratum] * p, minlength=len(result))
+        result['variance'] = np.bincount(group, weights=variance, minlength=len(result))
+        margin = NormalDist().inv_cdf(0.5 + confidence / 2) * np.sqrt(result.pop('variance'))
+        result['lower'] = (result['count'] - margin).clip(lower=0)
+        result['upper'] = result['count'] + margin
+        return result
+
+    @staticmethod
+    def error_bars(counts):
+        """
+        plotly express 막대/선 그래프의 오차 막대 인자 (신뢰구간 폭이 없으면 빈 dict)
+
+        Parameters:
+        counts (pandas.DataFrame): counts 결과
+
+        Returns:
+        dict: error_y, error_y_minus 인자
+        """
+        if counts.empty or (counts['upper'] - counts['lower']).max() <= 0:
+            return {}
+        return {'error_y': counts['upper'] - counts['count'], 'error_y_minus': counts['count'] - counts['lower']}
+
+    @staticmethod
+    def pending():
+        """계산 중인 정확한 건수가 있는지 여부"""
+        return bool(StratifiedSample._pending)
+
+    @staticmethod
+    def _group_codes(df, by, freq):
+        """
+        기준 컬럼 조합을 정렬된 그룹 번호로 변환 (결측이 있는 행은 -1)
+
+        freq를 주면 건수가 0인 기간도 빠지지 않도록 처음부터 마지막 기간까지 모든 기간을 그룹으로 씁니다.
+
+        Returns:
+        tuple: (행별 그룹 번호 배열, 그룹별 기준 값 데이터프레임)
+        """
+        if freq is not None:
+            periods = df.index.to_period(freq)
+            valid = ~np.asarray(periods.isna())
+            if not valid.any():
+                return np.full(len(df), -1, dtype=np.int64), pd.DataFrame({by[0]: pd.DatetimeIndex([])})
+            # 기간 서수는 기간 단위로 1씩 증가하므로 첫 기간과의 차이가 곧 그룹 번호
+            ordinals = periods.asi8
+            codes = np.where(valid, ordinals - ordinals[valid].min(), -1).astype(np.int64)
+            full_range = pd.period_range(periods[valid].min(), periods[valid].max(), freq=freq)
+            return codes, pd.DataFrame({by[0]: full_range.to_timestamp()})
+
+        arrays = [df[column] for column in by]
+
+        codes = np.zeros(len(df), dtype=np.int64)
+        uniques = []
+        for values in arrays:
+            value_codes, value_uniques = pd.factorize(values, sort=True)
+            codes = np.where((codes < 0) | (value_codes < 0), -1, codes * len(value_uniques) + value_codes)
+            uniques.append(value_uniques)
+
+        groups, inverse = np.unique(codes[codes >= 0], return_inverse=True)
+        result = {}
+        # 합친 번호를 다시 컬럼별 번호로 분해 (마지막 컬럼이 가장 빠르게 변함)
+        remainder = groups
+        for column, value_uniques in reversed(list(zip(by, uniques))):
+            result[column] = np.asarray(value_uniques)[remainder % len(value_uniques)]
+            remainder = remainder // len(value_uniques)
+        codes[codes >= 0] = inverse
+        return codes, pd.DataFrame({column: result[column] for column in by})
+
+    @staticmethod
+    def _exact_counts(df, by, freq):
+        """전체 데이터의 정확한 건수 (lower = upper = count)"""
+        codes, result = StratifiedSample._group_codes(df, by, freq)
+        result['count'] = np.bincount(codes[codes >= 0], minlength=len(result)).astype(float)
+        result['lower'] = result['count']
+        result['upper'] = result['count']
+        return result
+
+    @staticmethod
+    def _submit_exact(exact_key, cache_dir):
+        """정확한 건수 계산을 백그라운드에 등록 (같은 요청은 한 번만)"""
+        with StratifiedSample._lock:
+            if exact_key in StratifiedSample._pending:
+                return
+            StratifiedSample._pending.add(exact_key)
+
+        def run():
+            try:
+                dataset_key, exclude_duplicates, by, freq = exact_key
+                df = SharedDataset.open(dataset_key, cache_dir)
+                if exclude_duplicates and 'is_duplicate' in df.columns:
+                    df = df[~df['is_duplicate'].to_numpy(dtype=bool)]
+                StratifiedSample._exact.put(exact_key, StratifiedSample._exact_counts(df, list(by), freq))
+            except Exception as e:
+                logger.error(f"정확한 건수 계산 중 오류 발생: {e}")
+            finally:
+                with StratifiedSample._lock:
+                    StratifiedSample._pending.discard(exact_key)
+
+        StratifiedSample._executor.submit(run)
@@ -1,7 +1,10 @@
-import re
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
+from utils.rule_set import RuleSet
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,18 +29,34 @@ class DateUtils:
         
         for col in date_columns:
             try:
-                df_copy[col] = pd.to_datetime(df_copy[col], format=format)
+                # 잘못된 값이 일부 있어도 컬럼 전체가 문자열로 남지 않도록 해당 값만 NaT 처리
+                converted = pd.to_datetime(df_copy[col], format=format, errors='coerce')
+                invalid = int((converted.isna() & df_copy[col].notna()).sum())
+                if invalid == df_copy[col].notna().sum() and invalid > 0:
+                    logger.warning(f"{col} 컬럼 날짜 변환 실패: 날짜 형식 값이 없음")
+                    continue
+                df_copy[col] = converted
+                if invalid:
+                    logger.warning(f"{col} 컬럼 날짜 변환 실패 {invalid}건 (NaT 처리)")
                 logger.info(f"날짜 컬럼 변환 완료: {col}")
             except Exception as e:
                 logger.warning(f"{col} 컬럼 날짜 변환 실패: {e}")
         
         return df_copy
     
+    # 계절 순서 및 월별 계절 코드: 봄(3-5), 여름(6-8), 가을(9-11), 겨울(12-2)
+    SEASONS = ['봄', '여름', '가을', '겨울']
+    MONTH_SEASON_CODES = np.array([3, 3, 0, 0, 0, 1, 1, 1, 2, 2, 2, 3], dtype=np.int8)
+    DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    
     @staticmethod
     def extract_time_components(df, date_column):
         """
         날짜 컬럼에서 연도, 월, 요일 등의 구성요소 추출
         
+        연도는 int16, 월/일/요일은 int8(결측이 있으면 Int16/Int8),
+        요일 이름과 계절은 category 타입으로 저장합니다.
+        
         Parameters:
         df (pandas.DataFrame): 처리할 데이터프레임
         date_column (str): 날짜 컬럼명
@@ -50,22 +69,28 @@ class DateUtils:
         if date_column in df_copy.columns:
             # 날짜 컬럼이 datetime 형식인지 확인
             if pd.api.types.is_datetime64_any_dtype(df_copy[date_column]):
+                prefix = date_column.replace("_dt", "")
+                dates = df_copy[date_column].dt
+                has_missing = df_copy[date_column].isna().any()
+                int16, int8 = ('Int16', 'Int8') if has_missing else ('int16', 'int8')
+                
                 # 연도, 월, 요일 추출
-                df_copy[f'{date_column.replace("_dt", "")}_year'] = df_copy[date_column].dt.year
-                df_copy[f'{date_column.replace("_dt", "")}_month'] = df_copy[date_column].dt.month
-                df_copy[f'{date_column.replace("_dt", "")}_day'] = df_copy[date_column].dt.day
-                df_copy[f'{date_column.replace("_dt", "")}_weekday'] = df_copy[date_column].dt.weekday
-                df_copy[f'{date_column.replace("_dt", "")}_dayofweek'] = df_copy[date_column].dt.day_name()
+                df_copy[f'{prefix}_year'] = dates.year.astype(int16)
+                df_copy[f'{prefix}_month'] = dates.month.astype(int8)
+                df_copy[f'{prefix}_day'] = dates.day.astype(int8)
+                df_copy[f'{prefix}_weekday'] = dates.weekday.astype(int8)
                 
-                # 계절 추출
-                month = df_copy[date_column].dt.month
-                # 계절 매핑: 봄(3-5), 여름(6-8), 가을(9-11), 겨울(12-2)
-                season_dict = {
-                    1: '겨울', 2: '겨울', 3: '봄', 4: '봄', 5: '봄',
-                    6: '여름', 7: '여름', 8: '여름', 9: '가을', 10: '가을',
-                    11: '가을', 12: '겨울'
-                }
-                df_copy[f'{date_column.replace("_dt", "")}_season'] = month.map(season_dict)
+                weekday_codes = dates.weekday.fillna(-1).to_numpy(dtype=np.int8)
+                df_copy[f'{prefix}_dayofweek'] = pd.Categorical.from_codes(
+                    weekday_codes, categories=DateUtils.DAY_NAMES
+                )
+                
+                # 계절 추출 (월 -> 계절 코드 배열 조회)
+                month_index = dates.month.fillna(0).to_numpy(dtype=np.int8) - 1
+                season_codes = np.where(month_index >= 0, DateUtils.MONTH_SEASON_CODES[month_index], -1)
+                df_copy[f'{prefix}_season'] = pd.Categorical.from_codes(
+                    season_codes, categories=DateUtils.SEASONS, ordered=True
+                )
                 
                 logger.info(f"{date_column} 컬럼에서 시간 구성요소 추출 완료")
             else:
@@ -74,10 +99,74 @@ class DateUtils:
             logger.warning(f"{date_column} 컬럼이 데이터프레임에 존재하지 않습니다.")
         
         return df_copy
+    
+    @staticmethod
+    def set_date_index(df, date_column='happen_dt'):
+        """
+        날짜 컬럼 기준으로 정렬된 DatetimeIndex 설정 (날짜 컬럼은 유지)
+        
+        Parameters:
+        df (pandas.DataFrame): 처리할 데이터프레임
+        date_column (str): 인덱스로 사용할 날짜 컬럼명
+        
+        Returns:
+        pandas.DataFrame: 날짜순으로 정렬되고 인덱스가 설정된 데이터프레임
+        """
+        if date_column not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+            logger.warning(f"{date_column} 컬럼으로 날짜 인덱스를 설정할 수 없습니다.")
+            return df
+        
+        # 결측 날짜는 뒤로 보내 앞부분이 단조 증가하도록 유지
+        df_sorted = df.sort_values(date_column, kind='stable', na_position='last')
+        df_sorted.index = pd.DatetimeIndex(df_sorted[date_column], name=f'{date_column}_index')
+        return df_sorted
+    
+    @staticmethod
+    def slice_date_range(df, start=None, end=None):
+        """
+        정렬된 DatetimeIndex에서 이진 탐색으로 날짜 구간 선택
+        
+        Parameters:
+        df (pandas.DataFrame): set_date_index로 인덱스가 설정된 데이터프레임
+        start: 시작일 (포함, None이면 처음부터)
+        end: 종료일 (포함, None이면 끝까지)
+        
+        Returns:
+        pandas.DataFrame: 구간에 해당하는 행
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            logger.warning("날짜 인덱스가 없어 구간 선택을 건너뜁니다.")
+            return df
+        
+        valid_index = df.index[:int(df.index.notna().sum())]
+        lo = valid_index.searchsorted(pd.Timestamp(start), side='left') if start is not None else 0
+        hi = valid_index.searchsorted(pd.Timestamp(end), side='right') if end is not None else len(valid_index)
+        return df.iloc[lo:hi]
 
 class TextUtils:
     """텍스트 처리 관련 유틸리티 함수 클래스"""
     
+    @staticmethod
+    def map_unique(series, func):
+        """
+        시리즈의 고유값에만 함수를 적용한 뒤 전체 행으로 확장
+        
+        반복되는 문자열이 많은 컬럼에서 행 단위 apply 대신 사용하며,
+        Arrow 기반 문자열도 고유값만 파이썬 문자열로 변환됩니다.
+        
+        Parameters:
+        series (pandas.Series): 대상 시리즈
+        func (callable): 값 하나를 받아 결과를 반환하는 함수 (결측값에는 np.nan 전달)
+        
+        Returns:
+        pandas.Series: 원래 인덱스를 유지한 결과 시리즈 (object 타입)
+        """
+        codes, uniques = pd.factorize(series)
+        mapped = np.empty(len(uniques) + 1, dtype=object)
+        mapped[:-1] = [func(value) for value in uniques]
+        mapped[-1] = func(np.nan)
+        return pd.Series(mapped[codes], index=series.index)
+    
     @staticmethod
     def extract_weight(weight_str):
         """
@@ -87,15 +176,38 @@ class TextUtils:
         weight_str: 무게를 포함한 문자열
         
         Returns:
-        float: 추출된 무게 값 (실패시 np.nan)
+        float: 추출된 무게 값 (kg 단위, 실패시 np.nan)
         """
         if pd.isna(weight_str):
             return np.nan
-        try:
-            weight = re.findall(r'([\d\.]+)', str(weight_str))
-            return float(weight[0]) if weight else np.nan
-        except:
-            return np.nan
+        return float(TextUtils.extract_weight_series(pd.Series([weight_str])).iloc[0])
+    
+    @staticmethod
+    def extract_weight_series(series):
+        """
+        무게 문자열 시리즈를 벡터 연산으로 kg 단위 숫자로 변환
+        
+        "(60일미만)" 같은 나이 표기는 제거하고, "3~4" 같은 범위는 중간값,
+        g 단위는 kg으로 환산합니다.
+        
+        Parameters:
+        series (pandas.Series): 무게를 포함한 문자열 시리즈
+        
+        Returns:
+        pandas.Series: float32 무게 시리즈 (실패시 NaN)
+        """
+        text = series.astype('string').str.replace(RuleSet.AGE_NOTE_PATTERN, '', regex=True)
+        parts = text.str.extract(RuleSet.WEIGHT_RANGE_PATTERN)
+        
+        low = pd.to_numeric(parts['low'], errors='coerce')
+        high = pd.to_numeric(parts['high'], errors='coerce')
+        weight = ((low + high) / 2).fillna(low)
+        
+        # g 단위 환산
+        is_gram = text.str.contains(RuleSet.GRAM_UNIT_PATTERN, na=False).to_numpy(dtype=bool)
+        weight = weight.where(~is_gram, weight / 1000)
+        
+        return weight.astype('float32')
     
     @staticmethod
     def extract_breed(value):
@@ -110,31 +222,43 @@ class TextUtils:
         """
         if pd.isna(value):
             return None
-        value_str = str(value)
+        breed = TextUtils.extract_breed_series(pd.Series([value])).iloc[0]
+        return None if pd.isna(breed) else breed
+    
+    @staticmethod
+    def extract_breed_series(series):
+        """
+        품종 정보 시리즈를 벡터 연산으로 추출
+        
+        Parameters:
+        series (pandas.Series): 품종 정보가 포함된 문자열 시리즈
+        
+        Returns:
+        pandas.Series: category 타입 품종 시리즈 (추출 실패시 NaN)
+        """
+        text = series.astype('string')
         
         # 대괄호 안의 내용을 제거하고 남은 부분을 품종으로 간주
-        match = re.search(r'\](.*?)($|\s*\()', value_str)
-        if match:
-            breed = match.group(1).strip()
-            return breed if breed else None
+        bracket = text.str.extract(RuleSet.BREED_BRACKET_PATTERN)[0]
+        bracket_breed = bracket.str.strip().replace('', pd.NA)
         
         # 대괄호가 없는 경우 다른 패턴 시도
-        match = re.search(r'(개|고양이|축종)\s+(.*?)($|\s*\()', value_str)
-        if match:
-            return match.group(2).strip()
+        prefix_breed = text.str.extract(RuleSet.BREED_PREFIX_PATTERN)[1].str.strip()
         
-        return None
+        breed = bracket_breed.where(bracket.notna(), prefix_breed)
+        return breed.astype(object).where(breed.notna(), np.nan).astype('category')
 
 class LocationUtils:
     """지역 관련 유틸리티 함수 클래스"""
     
     @staticmethod
-    def extract_sido_sigungu(address):
+    def extract_sido_sigungu(address, rules=None):
         """
         주소에서 시도와 시군구 부분만 추출하는 함수
         
         Args:
             address (str): 한국 주소
+            rules (RuleSet): 사용할 분류 규칙 (기본: 현재 공유 규칙)
             
         Returns:
             tuple: (시도, 시군구)
@@ -142,14 +266,13 @@ class LocationUtils:
         if pd.isna(address):
             return ('미상', '미상')
             
-        # 괄호 제거
-        clean_address = re.sub(r'\([^)]*\)', '', str(address)).strip()
+        rules = rules or RuleSet.current()
         
-        # 시도 패턴 (서울특별시, 경기도, 세종특별자치시 등)
-        sido_pattern = r'^(서울특별시|부산광역시|대구광역시|인천광역시|광주광역시|대전광역시|울산광역시|세종특별자치시|경기도|강원도|충청북도|충청남도|전라북도|전라남도|경상북도|경상남도|제주특별자치도)'
+        # 괄호 제거
+        clean_address = RuleSet.PAREN_PATTERN.sub('', str(address)).strip()
         
-        # 시도 추출
-        sido_match = re.match(sido_pattern, clean_address)
+        # 시도 추출 (서울특별시, 경기도, 세종특별자치시 등)
+        sido_match = rules.sido_pattern.match(clean_address)
         sido = sido_match.group(1) if sido_match else '미상'
         
         if sido_match:
@@ -186,10 +309,15 @@ class LocationUtils:
             return df_copy
         
         # 시도와 시군구 추출하여 새 컬럼 추가
-        df_copy[['sido', 'sigungu']] = df_copy[address_column].apply(lambda x: pd.Series(LocationUtils.extract_sido_sigungu(x)))
+        rules = RuleSet.current()
+        sido_sigungu = TextUtils.map_unique(
+            df_copy[address_column], lambda x: LocationUtils.extract_sido_sigungu(x, rules)
+        )
+        df_copy['sido'] = sido_sigungu.str[0]
+        df_copy['sigungu'] = sido_sigungu.str[1]
         
         # 권역 분류 추가
-        df_copy['region'] = df_copy['sido'].apply(LocationUtils.categorize_region)
+        df_copy['region'] = TextUtils.map_unique(df_copy['sido'], LocationUtils.categorize_region)
         
         logger.info(f"{address_column} 컬럼에서 지역정보 추출 완료")
         return df_copy
@@ -222,4 +350,215 @@ class LocationUtils:
         elif sido in others:
             return '강원/제주'
         else:
-            return '기타'
\ No newline at end of file
+            return '기타'
+
+class BitmaskUtils:
+    """여러 라벨 일치 결과를 정수 비트마스크(라벨 하나당 비트 하나)로 다루는 유틸리티 클래스"""
+    
+    # 비트마스크 컬럼별 라벨 순서를 기록하는 데이터프레임 attrs 키 (Arrow 파일에도 함께 저장됨)
+    LABELS_ATTR = 'mask_labels'
+    
+    @staticmethod
+    def record_labels(df, column, labels):
+        """비트마스크 컬럼을 만들 때 쓴 라벨 순서를 데이터와 함께 기록"""
+        df.attrs[BitmaskUtils.LABELS_ATTR] = {**df.attrs.get(BitmaskUtils.LABELS_ATTR, {}), column: list(labels)}
+    
+    @staticmethod
+    def labels_of(df, column, default=None):
+        """
+        데이터와 함께 기록된 비트마스크 라벨 순서
+        
+        Parameters:
+        df (pandas.DataFrame): 비트마스크 컬럼이 있는 데이터프레임
+        column (str): 비트마스크 컬럼명
+        default (list): 기록이 없을 때(이전 버전에서 만든 데이터) 쓸 라벨
+        
+        Returns:
+        list: 비트 순서대로의 라벨
+        """
+        labels = df.attrs.get(BitmaskUtils.LABELS_ATTR, {}).get(column)
+        return list(labels) if labels is not None else default
+    
+    @staticmethod
+    def remap(masks, labels, target):
+        """
+        비트마스크를 다른 라벨 순서의 비트마스크로 변환 (고유값 단위)
+        
+        Parameters:
+        masks (pandas.Series): 비트마스크 컬럼
+        labels (list): masks의 비트 순서대로의 라벨
+        target (list): 변환할 라벨 순서 (labels의 라벨을 모두 포함)
+        
+        Returns:
+        pandas.Series: target 순서의 비트마스크 (결측은 0)
+        """
+        positions = [target.index(label) for label in labels]
+        def convert(mask):
+            if pd.isna(mask):
+                return 0
+            mask = int(mask)
+            return sum(1 << position for bit, position in enumerate(positions) if mask >> bit & 1)
+        return TextUtils.map_unique(masks, convert).astype(BitmaskUtils.dtype_for(len(target)))
+    
+    @staticmethod
+    def dtype_for(n_labels):
+        """라벨 수에 맞는 부호 없는 정수 타입"""
+        for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+            if n_labels <= np.iinfo(dtype).bits:
+                return dtype
+        raise ValueError(f"비트마스크로 표현할 수 있는 라벨 수(64)를 넘었습니다: {n_labels}")
+    
+    @staticmethod
+    def bits_of(selected, labels):
+        """
+        라벨 목록에 해당하는 비트 합
+        
+        Parameters:
+        selected (list): 선택한 라벨
+        labels (list): 비트 순서대로의 전체 라벨
+        
+        Returns:
+        int: 비트마스크 값
+        """
+        return sum(1 << labels.index(label) for label in selected if label in labels)
+    
+    @staticmethod
+    def _unique_bits(masks, n_labels):
+        """고유 마스크값과 빈도, 고유값별 비트 행렬(고유값 수 × 라벨 수)"""
+        values = pd.Series(masks).dropna().to_numpy(dtype=np.uint64)
+        uniques, freq = np.unique(values, return_counts=True)
+        bits = ((uniques[:, None] >> np.arange(n_labels, dtype=np.uint64)) & np.uint64(1)).astype(np.int64)
+        return uniques, freq, bits
+    
+    @staticmethod
+    def counts(masks, labels):
+        """
+        라벨별 일치 건수 (고유 마스크값 단위로 계산)
+        
+        Parameters:
+        masks (pandas.Series): 비트마스크 컬럼
+        labels (list): 비트 순서대로의 라벨
+        
+        Returns:
+        pandas.Series: 라벨 -> 건수 (내림차순)
+        """
+        _, freq, bits = BitmaskUtils._unique_bits(masks, len(labels))
+        return pd.Series(freq @ bits, index=labels, dtype=np.int64).sort_values(ascending=False)
+    
+    @staticmethod
+    def co_occurrence(masks, labels):
+        """
+        라벨 쌍별 동시 일치 건수 행렬 (대각선은 라벨별 건수)
+        
+        Parameters:
+        masks (pandas.Series): 비트마스크 컬럼
+        labels (list): 비트 순서대로의 라벨
+        
+        Returns:
+        pandas.DataFrame: 라벨 × 라벨 건수
+        """
+        _, freq, bits = BitmaskUtils._unique_bits(masks, len(labels))
+        matrix = bits.T @ (bits * freq[:, None])
+        return pd.DataFrame(matrix, index=labels, columns=labels)
+    
+    @staticmethod
+    def contains(masks, selected, labels, match_all=False):
+        """
+        선택한 라벨 중 하나(또는 전부)와 일치하는 행 마스크
+        
+        Parameters:
+        masks (pandas.Series): 비트마스크 컬럼
+        selected (list): 선택한 라벨
+        labels (list): 비트 순서대로의 라벨
+        match_all (bool): True면 선택한 라벨 모두와 일치해야 함
+        
+        Returns:
+        numpy.ndarray: 행 선택 마스크
+        """
+        wanted = np.uint64(BitmaskUtils.bits_of(selected, labels))
+        values = pd.Series(masks).fillna(0).to_numpy(dtype=np.uint64)
+        return (values & wanted) == wanted if match_all else (values & wanted) != 0
+    
+    @staticmethod
+    def decode(masks, labels, sep=', '):
+        """
+        비트마스크를 표시용 라벨 문자열로 변환 (고유값 단위)
+        
+        Parameters:
+        masks (pandas.Series): 비트마스크 컬럼
+        labels (list): 비트 순서대로의 라벨
+        sep (str): 라벨 구분자
+        
+        Returns:
+        pandas.Series: 라벨 문자열 시리즈
+        """
+        def to_text(mask):
+            if pd.isna(mask):
+                return np.nan
+            mask = int(mask)
+            return sep.join(label for bit, label in enumerate(labels) if mask >> bit & 1)
+        return TextUtils.map_unique(masks, to_text)
+
+class CacheUtils:
+    """집계 결과 캐싱 관련 유틸리티 함수 클래스"""
+    
+    @staticmethod
+    def fingerprint(df, columns=None):
+        """
+        데이터프레임 내용의 지문(해시) 계산
+        
+        Parameters:
+        df (pandas.DataFrame): 대상 데이터프레임
+        columns (list): 지문에 포함할 컬럼 목록 (기본: 전체)
+        
+        Returns:
+        str: 내용이 같으면 같은 값을 갖는 16진수 문자열
+        """
+        columns = [c for c in (columns or df.columns) if c in df.columns]
+        digest = hashlib.sha1(f"{len(df)}|{'|'.join(map(str, columns))}".encode())
+        if columns and len(df):
+            hashed = pd.util.hash_pandas_object(df[columns], index=False)
+            digest.update(hashed.to_numpy().tobytes())
+        return digest.hexdigest()
+
+
+class ResultCache:
+    """크기 제한이 있는 스레드 안전 결과 캐시 (가장 오래 쓰지 않은 항목부터 제거)"""
+    
+    def __init__(self, max_entries=8):
+        """
+        초기화 함수
+        
+        Parameters:
+        max_entries (int): 보관할 최대 항목 수
+        """
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """캐시된 값 조회 (없으면 default 반환)"""
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+    
+    def put(self, key, value):
+        """값 저장 후 반환"""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
+    
+    def values(self):
+        """캐시된 값 목록 (순서: 오래 쓰지 않은 것부터)"""
+        with self._lock:
+            return list(self._items.values())
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._items.clear()